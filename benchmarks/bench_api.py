@@ -0,0 +1,97 @@
+# ============================================================================
+# CAREERCOMPASS PRO - JSON API vs HTML BENCHMARK
+# Bytes on the wire (raw and gzip) and server CPU per request for the HTML
+# routes against their /api/v1 counterparts, with and without a fields=
+# projection. Server CPU is process time spent inside main.app, so the httpx
+# client's own work is not counted.
+#
+#   python benchmarks/bench_api.py [--requests 300]
+# ============================================================================
+
+import argparse
+import asyncio
+import gzip
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+import main  # noqa: E402
+
+FORM = {'skills': 'python, sql, machine learning, pandas, git', 'cgpa': '8.2', 'career_goal': 'Data Science'}
+BODY = {'skills': FORM['skills'], 'cgpa': 8.2, 'career_goal': FORM['career_goal']}
+
+
+class ServerCpu:
+    """ASGI wrapper adding the process CPU time of every app call to ``samples``."""
+
+    def __init__(self, app):
+        self.app = app
+        self.samples = []
+
+    async def __call__(self, scope, receive, send):
+        started = time.process_time()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.samples.append(time.process_time() - started)
+
+
+def scenarios(domain_key: str):
+    return [
+        ('analyze  html', lambda c: c.post('/analyze', data=FORM)),
+        ('analyze  v1', lambda c: c.post('/api/v1/analyze', json=BODY)),
+        ('analyze  v1 -domain_info,-skill_course_map',
+         lambda c: c.post('/api/v1/analyze', json=BODY, params={'fields': '-domain_info,-skill_course_map'})),
+        ('analyze  v1 fields=adjusted_match,missing_skills',
+         lambda c: c.post('/api/v1/analyze', json=BODY, params={'fields': 'adjusted_match,missing_skills'})),
+        ('domain   html', lambda c: c.get(f'/domain/{domain_key}')),
+        ('domains  v1 (all)', lambda c: c.get('/api/v1/domains')),
+        ('courses  html', lambda c: c.get('/courses', params={'skill': 'python'})),
+        ('courses  v1 limit=200', lambda c: c.get('/api/v1/courses', params={'skill': 'python', 'limit': 200})),
+        ('courses  v1 limit=200 fields=id,title,url',
+         lambda c: c.get('/api/v1/courses', params={'skill': 'python', 'limit': 200, 'fields': 'id,title,url'})),
+    ]
+
+
+async def bench(args):
+    server = ServerCpu(main.app)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=server), base_url='http://bench') as client:
+        resp = await client.post('/signup', data={'username': f'api_{os.getpid()}', 'email': 'b@example.com',
+                                                  'password': 'bench-password', 'full_name': 'Bench'})
+        resp.raise_for_status()
+        client.cookies.set('access_token', resp.cookies['access_token'])
+        print(f"{'scenario':<50} {'bytes':>9} {'gzip':>8} {'cpu/req':>10} {'p50':>9}")
+        for name, make in scenarios(next(iter(main.CAREER_DOMAINS_MAP))):
+            for _ in range(10):
+                (await make(client)).raise_for_status()
+            server.samples.clear()
+            latencies = []
+            for _ in range(args.requests):
+                started = time.perf_counter()
+                resp = await make(client)
+                latencies.append((time.perf_counter() - started) * 1000)
+                resp.raise_for_status()
+            body = resp.content
+            print(f"{name:<50} {len(body):>9} {len(gzip.compress(body)):>8} "
+                  f"{statistics.mean(server.samples) * 1e3:>7.3f} ms {statistics.median(latencies):>6.2f} ms")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Bytes on the wire and server CPU: HTML routes vs /api/v1")
+    parser.add_argument('--requests', type=int, default=300, help="requests per scenario")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    asyncio.run(bench(args))
+
+
+if __name__ == '__main__':
+    main_cli()
@@ -0,0 +1,109 @@
+# ============================================================================
+# CAREERCOMPASS PRO - COURSE CATALOG MEMORY / LOAD-TIME BENCHMARK
+# Compares the columnar CourseCatalog against one dict per row.
+#
+#   python benchmarks/bench_catalog.py                 # 10k, 100k rows
+#   python benchmarks/bench_catalog.py --rows 1000000
+# ============================================================================
+
+import argparse
+import csv
+import io
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+import main  # noqa: E402
+
+
+def synthetic_lines(rows: int):
+    """Yield CSV lines for ``rows`` courses by cycling the real Coursera export."""
+    with open(main.config.COURSERA_CATALOG_CSV, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        source = list(reader)
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(header)
+    yield buf.getvalue()
+    title_col = header.index('Title')
+    for i in range(rows):
+        row = list(source[i % len(source)])
+        row[0] = str(i)
+        row[title_col] = f"{row[title_col]} #{i}"
+        buf.seek(0)
+        buf.truncate()
+        writer.writerow(row)
+        # hand csv.reader physical lines, as a file object would
+        yield from buf.getvalue().splitlines(keepends=True)
+
+
+def load_dicts(lines):
+    """Baseline: the per-dict representation COURSES_DATABASE uses."""
+    courses = []
+    reader = csv.DictReader(lines)
+    for row in reader:
+        try:
+            rating = float(row.get('Ratings') or 0)
+        except ValueError:
+            rating = 0.0
+        courses.append({
+            'platform': 'coursera',
+            'title': row['Title'].strip(),
+            'instructor': row['Organization'].strip(),
+            'price': 0,
+            'rating': rating,
+            'duration': row['Duration'].strip(),
+            'students': row['course_students_enrolled'].strip(),
+            'skills': [s.strip().lower() for s in row['Skills'].split(',') if s.strip()],
+            'url': row['course_url'].strip(),
+            'level': row['Difficulty'].strip(),
+            'type': row['Type'].strip(),
+            'description': row['course_description'].strip(),
+            'review_count': main._parse_count(row['Review Count']),
+        })
+    return courses
+
+
+def measure(label, rows, build):
+    # time without tracing, then retained/peak bytes under tracemalloc
+    started = time.perf_counter()
+    result = build(synthetic_lines(rows))
+    elapsed = time.perf_counter() - started
+    del result
+    tracemalloc.start()
+    result = build(synthetic_lines(rows))
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<10} {rows:>9,} rows  load {elapsed:7.2f}s  "
+          f"retained {retained / 1e6:9.1f} MB  peak {peak / 1e6:9.1f} MB  "
+          f"({retained / rows:7.0f} B/row)")
+    return result
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Course catalog memory and load-time benchmark")
+    parser.add_argument('--rows', type=int, nargs='*', default=[10000, 100000])
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        def columnar(lines):
+            catalog = main.CourseCatalog()
+            main.load_coursera_rows(catalog, lines)
+            return catalog
+        catalog = measure('columnar', rows, columnar)
+        report = catalog.memory_report()
+        print(f"{'':<10} column bytes {report['total_bytes'] / 1e6:.1f} MB, "
+              f"{report['distinct_skills']} distinct skills")
+        del catalog
+        measure('dicts', rows, load_dicts)
+
+
+if __name__ == '__main__':
+    main_cli()
@@ -0,0 +1,135 @@
+# ============================================================================
+# CAREERCOMPASS PRO - /analyze INPUT PARSING BENCHMARK
+# Multipart /analyze: the previous parse sequence (FastAPI Form params, then
+# request.json()/request.form() fallbacks and a second pass for the career
+# goal) against the single-pass request_input() dependency, plus the full
+# route end to end.
+#
+#   python benchmarks/bench_input.py [--iterations 2000] [--padding-kb 0 64]
+# ============================================================================
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import httpx
+from starlette.requests import Request
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+import main  # noqa: E402
+
+FIELDS = {'skills_input': 'python, sql, machine learning, pandas', 'score': '8.4', 'careerGoal': 'Data Science'}
+
+
+def multipart_body(padding_kb: int):
+    """Encode FIELDS (plus an optional attachment) the way a browser would."""
+    files = {'notes': ('notes.txt', b'x' * (padding_kb * 1024), 'text/plain')} if padding_kb else None
+    req = httpx.Request('POST', 'http://bench/analyze', data=FIELDS, files=files or {'_': ('', b'')})
+    return req.read(), req.headers['content-type']
+
+
+def make_request(body: bytes, content_type: str) -> Request:
+    sent = [False]
+
+    async def receive():
+        if sent[0]:
+            return {'type': 'http.disconnect'}
+        sent[0] = True
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    scope = {'type': 'http', 'method': 'POST', 'path': '/analyze', 'query_string': b'',
+             'headers': [(b'content-type', content_type.encode()), (b'content-length', str(len(body)).encode())]}
+    return Request(scope, receive)
+
+
+async def legacy_parse(request: Request):
+    """The input handling analyze_career and extract_career_goal_from_request did before."""
+    form = await request.form()  # FastAPI's own Form(...) parameter parsing
+    skills, cgpa, career_goal = form.get('skills'), form.get('cgpa'), form.get('career_goal')
+    if not skills:
+        form = await request.form()
+        skills = form.get('skills') or form.get('user_skills') or form.get('skills_input')
+    if cgpa is None:
+        form = await request.form()
+        cgpa = form.get('cgpa') or form.get('score') or form.get('cgpa_input')
+    goal = career_goal
+    if not goal:
+        for key in ('career_goal', 'domain', 'career', 'selected_domain', 'domain_key'):
+            if request.query_params.get(key):
+                goal = request.query_params.get(key)
+                break
+    if not goal:
+        form = await request.form()
+        for key in ('career_goal', 'career', 'domain', 'career_domain', 'selected_domain', 'careerGoal',
+                    'career_goal_input', 'domain_key'):
+            if form.get(key):
+                goal = form.get(key)
+                break
+    return skills, cgpa, goal
+
+
+async def single_pass(request: Request):
+    inp = await main.request_input(request)
+    return inp.first(main.SKILLS_INPUT_KEYS), inp.first(main.CGPA_INPUT_KEYS), inp.career_goal()
+
+
+async def time_parser(parser, body, content_type, iterations):
+    for _ in range(50):
+        await parser(make_request(body, content_type))
+    samples = []
+    for _ in range(iterations):
+        request = make_request(body, content_type)
+        started = time.perf_counter()
+        result = await parser(request)
+        samples.append((time.perf_counter() - started) * 1e6)
+    samples.sort()
+    return result, statistics.median(samples), samples[int(len(samples) * 0.99)]
+
+
+async def time_route(body, content_type, iterations):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url='http://bench') as client:
+        resp = await client.post('/signup', data={'username': f'input_{os.getpid()}_{len(body)}', 'email': 'b@e.com',
+                                                  'password': 'bench-password', 'full_name': 'Bench'})
+        resp.raise_for_status()
+        client.cookies.set('access_token', resp.cookies['access_token'])
+        samples = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            resp = await client.post('/analyze', content=body, headers={'content-type': content_type})
+            samples.append((time.perf_counter() - started) * 1e3)
+            resp.raise_for_status()
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99)]
+
+
+async def bench(args):
+    for padding in args.padding_kb:
+        body, content_type = multipart_body(padding)
+        old, old_p50, old_p99 = await time_parser(legacy_parse, body, content_type, args.iterations)
+        new, new_p50, new_p99 = await time_parser(single_pass, body, content_type, args.iterations)
+        assert old == new, (old, new)
+        route_p50, route_p99 = await time_route(body, content_type, max(50, args.iterations // 10))
+        print(f"multipart {len(body):>7} B  parse: before p50 {old_p50:7.1f} us p99 {old_p99:7.1f} us | "
+              f"after p50 {new_p50:7.1f} us p99 {new_p99:7.1f} us | /analyze p50 {route_p50:6.2f} ms p99 {route_p99:6.2f} ms")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Multipart /analyze input parsing, before and after")
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--padding-kb', type=int, nargs='*', default=[0, 64],
+                        help="size of an extra file part, to show per-byte parsing cost")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    asyncio.run(bench(args))
+
+
+if __name__ == '__main__':
+    main_cli()
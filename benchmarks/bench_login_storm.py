@@ -0,0 +1,92 @@
+# ============================================================================
+# CAREERCOMPASS PRO - LOGIN STORM BENCHMARK
+# /dashboard latency while many clients log in at once, with KDF work on the
+# PasswordHasher pool versus inline on the event loop.
+#
+#   python benchmarks/bench_login_storm.py [--seconds 5] [--logins 32] [--modes idle pool inline]
+# ============================================================================
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+import main  # noqa: E402
+
+main.logger.setLevel(logging.ERROR)
+
+PASSWORD = 'storm-password'
+
+
+async def signup(client, username):
+    resp = await client.post('/signup', data={'username': username, 'email': f'{username}@example.com',
+                                              'password': PASSWORD, 'full_name': username})
+    resp.raise_for_status()
+    return resp.cookies
+
+
+async def storm(transport, deadline, counts):
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+        while time.perf_counter() < deadline:
+            resp = await client.post('/login', data={'username': 'storm', 'password': PASSWORD})
+            counts[resp.status_code] = counts.get(resp.status_code, 0) + 1
+
+
+async def probe(transport, cookies, deadline):
+    samples = []
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench', cookies=cookies) as client:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            resp = await client.get('/dashboard')
+            samples.append((time.perf_counter() - started) * 1000)
+            resp.raise_for_status()
+            await asyncio.sleep(0.005)
+    return samples
+
+
+async def run(mode, seconds, logins, transport, cookies):
+    main.PASSWORDS = main.PasswordHasher(0 if mode == 'inline' else main.config.HASH_WORKERS,
+                                         main.config.HASH_MAX_PENDING)
+    deadline = time.perf_counter() + seconds
+    counts = {}
+    stormers = [storm(transport, deadline, counts) for _ in range(logins if mode != 'idle' else 0)]
+    samples, *_ = await asyncio.gather(probe(transport, cookies, deadline), *stormers)
+    samples.sort()
+    print(f"{mode:<7} dashboard p50 {statistics.median(samples):7.2f} ms  "
+          f"p99 {samples[int(len(samples) * 0.99)]:8.2f} ms  max {samples[-1]:8.2f} ms  "
+          f"({len(samples)} probes)  logins {counts}")
+
+
+async def bench(args):
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+        cookies = await signup(client, 'probe')
+        await signup(client, 'storm')
+    print(f"KDF {main.config.PASSWORD_KDF}, {main.config.HASH_WORKERS} workers, "
+          f"{args.logins} concurrent login clients, {args.seconds}s per mode")
+    for mode in args.modes:
+        await run(mode, args.seconds, args.logins, transport, cookies)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="/dashboard latency during a login storm")
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--logins', type=int, default=32)
+    parser.add_argument('--modes', nargs='*', default=['idle', 'pool', 'inline'],
+                        choices=['idle', 'pool', 'inline'])
+    args = parser.parse_args()
+    asyncio.run(bench(args))
+
+
+if __name__ == '__main__':
+    main_cli()
@@ -0,0 +1,247 @@
+# ============================================================================
+# CAREERCOMPASS PRO - IN-PROCESS ROUTE BENCHMARK SUITE
+# Drives main.app through httpx's ASGI transport (no sockets) for every
+# user-facing route, optionally on synthetic catalogs / domain maps, and
+# keeps JSON baselines so main.py regressions show up as diffs.
+#
+#   python benchmarks/bench_routes.py                                  # real data, print only
+#   python benchmarks/bench_routes.py --save                           # refresh baselines
+#   python benchmarks/bench_routes.py --compare                        # diff against baselines
+#   python benchmarks/bench_routes.py --courses 1000 10000 100000 --domains 9 100 500
+#   python benchmarks/bench_routes.py --only analyze_form domain_page --requests 500
+# ============================================================================
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+import main  # noqa: E402
+
+BASELINE_DIR = ROOT / 'benchmarks' / 'baselines'
+PASSWORD = 'bench-password'
+ALLOC_SAMPLES = 20
+
+
+# ---------------------------------------------------------------------------
+# synthetic data
+# ---------------------------------------------------------------------------
+
+def skill_vocabulary():
+    """Every skill the real catalog and domain map know, for realistic synthetic rows."""
+    vocab = {main.CATALOG.skills.values[i] for i in range(len(main.CATALOG.skills))}
+    for domain in main.CAREER_DOMAINS_MAP.values():
+        vocab.update(s.lower() for s in domain.get('skills', []))
+    return sorted(v for v in vocab if v)
+
+
+def synthetic_catalog(rows: int, vocab, seed: int = 11):
+    rng = random.Random(seed)
+    catalog = main.CourseCatalog()
+    platforms = ['coursera', 'udemy', 'edx', 'youtube', 'nptel']
+    levels = ['Beginner', 'Intermediate', 'Advanced']
+    for i in range(rows):
+        skills = rng.sample(vocab, rng.randint(2, 6))
+        catalog.add(
+            title=f"{skills[0].title()} course {i}",
+            platform=rng.choice(platforms),
+            instructor=f"Instructor {i % 997}",
+            price=rng.choice([0, 0, 499, 1299, 3499]),
+            rating=round(rng.uniform(3.0, 5.0), 1),
+            duration=f"{rng.randint(2, 40)} hours",
+            students=rng.randint(100, 2_000_000),
+            skills=skills,
+            url=f"https://example.com/course/{i}",
+            level=rng.choice(levels),
+            course_type='Course',
+            description=f"Learn {', '.join(skills)}",
+            review_count=rng.randint(0, 50000),
+        )
+    return catalog
+
+
+def synthetic_domains(count: int, vocab, seed: int = 13):
+    """The real domains first, padded with generated ones that have the same fields."""
+    rng = random.Random(seed)
+    domains = dict(list(main.CAREER_DOMAINS_MAP.items())[:count])
+    template = next(iter(main.CAREER_DOMAINS_MAP.values()))
+    for i in range(len(domains), count):
+        domains[f'synthetic_{i}'] = dict(
+            template,
+            name=f"Synthetic Domain {i}",
+            description=f"Generated domain {i}",
+            skills=rng.sample(vocab, 10),
+            growth=rng.randint(5, 90),
+            avg_job_openings=rng.randint(10, 500),
+        )
+    return domains
+
+
+# ---------------------------------------------------------------------------
+# scenarios: name -> coroutine factory taking (client, i)
+# ---------------------------------------------------------------------------
+
+def scenarios(domain_key: str, domain_name: str, skill: str):
+    form = {'skills': 'python, sql, machine learning, pandas, git', 'cgpa': '8.2', 'career_goal': domain_name}
+    return {
+        'login': lambda c, i: c.post('/login', data={'username': 'bench', 'password': PASSWORD}),
+        'signup': lambda c, i: c.post('/signup', data={'username': f'bench_{i}_{time.monotonic_ns()}',
+                                                      'email': 'b@example.com', 'password': PASSWORD,
+                                                      'full_name': 'Bench'}),
+        'dashboard': lambda c, i: c.get('/dashboard'),
+        'analyze_form': lambda c, i: c.post('/analyze', data=form),
+        'analyze_json': lambda c, i: c.post('/analyze', json=form),
+        'courses': lambda c, i: c.get('/courses'),
+        'courses_domain': lambda c, i: c.get('/courses', params={'career_goal': domain_name}),
+        'courses_skill': lambda c, i: c.get('/courses', params={'skill': skill}),
+        'domain_page': lambda c, i: c.get(f'/domain/{domain_key}'),
+        'course_comparison': lambda c, i: c.get('/course_comparision', params={'skill': skill}),
+    }
+
+
+def percentile(sorted_samples, q):
+    return sorted_samples[min(len(sorted_samples) - 1, int(len(sorted_samples) * q))]
+
+
+async def measure(client, make, requests, concurrency):
+    # warm caches/JIT-ish paths first
+    for i in range(min(5, requests)):
+        (await make(client, i)).raise_for_status()
+
+    latencies = []
+    for i in range(requests):
+        started = time.perf_counter()
+        resp = await make(client, i)
+        latencies.append((time.perf_counter() - started) * 1000)
+        resp.raise_for_status()
+    latencies.sort()
+
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with gate:
+            (await make(client, i)).raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    throughput = requests / (time.perf_counter() - started)
+
+    # peak bytes allocated while serving one request (tracing slows requests, so sampled separately)
+    tracemalloc.start()
+    peaks = []
+    for i in range(ALLOC_SAMPLES):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        (await make(client, i)).raise_for_status()
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+
+    return {
+        'requests': requests,
+        'throughput_rps': round(throughput, 1),
+        'p50_ms': round(percentile(latencies, 0.50), 3),
+        'p95_ms': round(percentile(latencies, 0.95), 3),
+        'p99_ms': round(percentile(latencies, 0.99), 3),
+        'alloc_peak_kb': round(statistics.median(peaks) / 1024, 1),
+    }
+
+
+async def run_config(args, label):
+    domain_key = next(iter(main.CAREER_DOMAINS_MAP))
+    domain_name = main.CAREER_DOMAINS_MAP[domain_key]['name']
+    skill = 'python'
+    transport = httpx.ASGITransport(app=main.app)
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+        resp = await client.post('/signup', data={'username': 'bench', 'email': 'b@example.com',
+                                                  'password': PASSWORD, 'full_name': 'Bench'})
+        if resp.status_code == 400:  # already registered by an earlier configuration
+            resp = await client.post('/login', data={'username': 'bench', 'password': PASSWORD})
+        resp.raise_for_status()
+        client.cookies.set('access_token', resp.cookies['access_token'])
+        for name, make in scenarios(domain_key, domain_name, skill).items():
+            if args.only and name not in args.only:
+                continue
+            requests = max(10, args.requests // 10) if name in ('login', 'signup') else args.requests
+            results[name] = await measure(client, make, requests, args.concurrency)
+            r = results[name]
+            print(f"  {name:<18} {r['throughput_rps']:>9.1f} req/s  p50 {r['p50_ms']:8.2f}  "
+                  f"p95 {r['p95_ms']:8.2f}  p99 {r['p99_ms']:8.2f} ms  peak {r['alloc_peak_kb']:9.1f} KB/req")
+    return results
+
+
+def compare(label, results, threshold):
+    path = BASELINE_DIR / f'{label}.json'
+    if not path.exists():
+        print(f"  (no baseline {path.relative_to(ROOT)})")
+        return 0
+    baseline = json.loads(path.read_text(encoding='utf-8'))['results']
+    regressions = 0
+    for name, r in results.items():
+        b = baseline.get(name)
+        if not b:
+            continue
+        for metric, worse_if_higher in (('p50_ms', True), ('p99_ms', True), ('throughput_rps', False),
+                                        ('alloc_peak_kb', True)):
+            change = (r[metric] - b[metric]) / b[metric] * 100 if b[metric] else 0.0
+            if (change if worse_if_higher else -change) > threshold:
+                regressions += 1
+                print(f"  REGRESSION {name}.{metric}: {b[metric]} -> {r[metric]} ({change:+.1f}%)")
+    return regressions
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="In-process benchmark of every user-facing route")
+    parser.add_argument('--courses', type=int, nargs='*', default=[0],
+                        help="synthetic catalog sizes; 0 = the real catalog")
+    parser.add_argument('--domains', type=int, nargs='*', default=[0],
+                        help="synthetic domain counts; 0 = the real domain map")
+    parser.add_argument('--requests', type=int, default=200, help="requests per scenario")
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--only', nargs='*', help="run only these scenarios")
+    parser.add_argument('--save', action='store_true', help="write results as the new baselines")
+    parser.add_argument('--compare', action='store_true', help="diff against stored baselines")
+    parser.add_argument('--threshold', type=float, default=25.0, help="regression threshold in percent")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    real_catalog, real_domains = main.CATALOG, main.CAREER_DOMAINS_MAP
+    vocab = skill_vocabulary()
+    regressions = 0
+    for courses in args.courses:
+        for domains in args.domains:
+            label = f"courses-{courses or 'real'}_domains-{domains or 'real'}"
+            started = time.perf_counter()
+            main.reload_data(catalog=synthetic_catalog(courses, vocab) if courses else real_catalog,
+                             domains=synthetic_domains(domains, vocab) if domains else real_domains)
+            print(f"{label}: {len(main.CATALOG)} courses, {len(main.CAREER_DOMAINS_MAP)} domains "
+                  f"(setup {time.perf_counter() - started:.1f}s)")
+            results = asyncio.run(run_config(args, label))
+            if args.compare:
+                regressions += compare(label, results, args.threshold)
+            if args.save:
+                BASELINE_DIR.mkdir(parents=True, exist_ok=True)
+                (BASELINE_DIR / f'{label}.json').write_text(json.dumps({
+                    'label': label, 'courses': len(main.CATALOG), 'domains': len(main.CAREER_DOMAINS_MAP),
+                    'requests': args.requests, 'concurrency': args.concurrency,
+                    'python': sys.version.split()[0], 'results': results,
+                }, indent=2, sort_keys=True) + '\n', encoding='utf-8')
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main_cli()
@@ -0,0 +1,131 @@
+# ============================================================================
+# CAREERCOMPASS PRO - BM25 COURSE SEARCH BENCHMARK
+# Build time, posting memory, query latency and add/remove cost of the BM25
+# course index, on the real catalog (curated rows + the Coursera CSV) and on
+# synthetic catalogs with Zipf-distributed description text. The old
+# substring scan (CourseIndex.ids_matching_text, memo bypassed) is timed
+# on the real catalog for reference.
+#
+#   python benchmarks/bench_search.py [--rows 0 1000000] [--queries 200]
+# ============================================================================
+
+import argparse
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+import main  # noqa: E402
+
+QUERIES = ['python', 'machine learning', 'data analysis with python', 'google cloud', 'deep learning tensorflow',
+           'project management', 'excel', 'cyber security network', 'web development javascript react',
+           'statistics for data science', 'financial markets', 'sql databases']
+ORGS = ['Google', 'IBM', 'Meta', 'Microsoft', 'Amazon Web Services', 'Stanford University', 'DeepLearning.AI',
+        'University of Michigan', 'Duke University', 'Johns Hopkins University', 'Yale University', 'Udemy']
+COURSE_WORDS = ['introduction', 'fundamentals', 'advanced', 'professional', 'certificate', 'specialization',
+                'essentials', 'bootcamp', 'masterclass', 'applied', 'practical', 'complete', 'guide', 'for',
+                'beginners', 'with', 'and', 'the']
+
+
+def synthetic_docs(rows: int, vocab, seed: int = 17):
+    """Field dicts shaped like course_text_fields(): skill-word titles, real orgs, Zipf descriptions."""
+    rng = random.Random(seed)
+    words = [f"w{i}" for i in range(20000)] + [w for skill in vocab for w in skill.split()]
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    rng.shuffle(weights)
+    cum = list(_cumulative(weights))
+    for _ in range(rows):
+        skills = rng.sample(vocab, rng.randint(3, 8))
+        yield {
+            'title': ' '.join([skills[0]] + rng.sample(COURSE_WORDS, rng.randint(1, 3))),
+            'skills': ', '.join(skills),
+            'organization': rng.choice(ORGS),
+            'description': ' '.join(rng.choices(words, cum_weights=cum, k=rng.randint(20, 60))),
+        }
+
+
+def _cumulative(weights):
+    total = 0.0
+    for w in weights:
+        total += w
+        yield total
+
+
+def time_queries(search, queries, repeat):
+    samples = []
+    for _ in range(repeat):
+        for q in queries:
+            started = time.perf_counter()
+            search(q)
+            samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99)]
+
+
+def bench_index(label, docs, queries, repeat):
+    index = main.BM25Index(main.COURSE_TEXT_WEIGHTS)
+    kept = []
+    build = 0.0  # index time only; generating synthetic text is not counted
+    for doc_id, fields in enumerate(docs):
+        started = time.perf_counter()
+        index.add(doc_id, fields)
+        build += time.perf_counter() - started
+        if doc_id % 1000 == 0:
+            kept.append((doc_id, fields))
+    stats = index.stats()
+    print(f"{label}: {stats['docs']} docs, {stats['terms']} terms, {stats['postings']} postings; "
+          f"build {build:.1f}s ({build / stats['docs'] * 1e6:.0f} us/doc), {stats['bytes'] / 1048576:.1f} MB")
+    index.search('warm up')
+    p50, p99 = time_queries(lambda q: index.search(q, k=10), queries, repeat)
+    print(f"  top-10 query        p50 {p50:8.3f} ms  p99 {p99:8.3f} ms")
+    p50, p99 = time_queries(lambda q: index.search(q, k=None), queries, max(1, repeat // 4))
+    print(f"  all matches ranked  p50 {p50:8.3f} ms  p99 {p99:8.3f} ms")
+
+    # incremental update: remove and re-add sampled documents, then pay the lazy norm refresh once
+    started = time.perf_counter()
+    for doc_id, fields in kept:
+        index.remove(doc_id, fields)
+    for doc_id, fields in kept:
+        index.add(doc_id, fields)
+    per_update = (time.perf_counter() - started) / (2 * len(kept)) * 1e6
+    started = time.perf_counter()
+    index.search(queries[0])
+    refresh = (time.perf_counter() - started) * 1000
+    print(f"  add/remove          {per_update:8.1f} us/doc ({len(kept)} docs each way), "
+          f"first query after {refresh:.1f} ms")
+    return index
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="BM25 course search: build, memory, query latency, updates")
+    parser.add_argument('--rows', type=int, nargs='*', default=[0, 1000000],
+                        help="synthetic catalog sizes; 0 = the real catalog")
+    parser.add_argument('--queries', type=int, default=200, help="timed queries per size")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    vocab = sorted({s for cid in range(len(main.CATALOG)) for s in main.CATALOG.skill_names(cid)})
+    repeat = max(1, args.queries // len(QUERIES))
+    for rows in args.rows:
+        if rows:
+            bench_index(f"synthetic {rows}", synthetic_docs(rows, vocab), QUERIES, repeat)
+            continue
+        catalog = main.CATALOG
+        bench_index(f"real catalog ({len(catalog)} rows)",
+                    (main.course_text_fields(catalog, cid) for cid in range(len(catalog))), QUERIES, repeat)
+        index = main.COURSE_INDEX
+        index.MEMO_SIZE = 0  # time the scan itself, not the memo
+        p50, p99 = time_queries(lambda q: index._union(
+            [ids for ks, ids in index.skill_postings.items() if q in ks] + [index._title_ids(q)]), QUERIES, repeat)
+        print(f"  substring scan      p50 {p50:8.3f} ms  p99 {p99:8.3f} ms  (old matching, unranked)")
+
+
+if __name__ == '__main__':
+    main_cli()
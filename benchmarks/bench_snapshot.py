@@ -0,0 +1,120 @@
+# ============================================================================
+# CAREERCOMPASS PRO - CATALOG SNAPSHOT MEMORY BENCHMARK
+# Starts N worker-like processes (import main, then touch every course, the
+# text index and the skill index, as serving traffic would) that either parse
+# the catalog sources or map the snapshot, and reads each one's RSS, PSS and
+# private bytes from /proc/self/smaps_rollup while all N are alive. PSS
+# splits shared pages between the processes mapping them, so the PSS sum is
+# the memory the N workers actually cost together. Linux only.
+#
+#   python benchmarks/bench_snapshot.py                              # real catalog, 1/4/16 workers
+#   python benchmarks/bench_snapshot.py --rows 100000 --workers 1 4
+# ============================================================================
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+QUERIES = ('python', 'machine learning', 'data analysis with sql', 'cloud security')
+
+
+def child():
+    """One worker: load, touch, report when the parent asks, exit."""
+    started = time.perf_counter()
+    import main
+    startup = time.perf_counter() - started
+    catalog = main.CATALOG
+    for cid in range(len(catalog)):
+        catalog.course(cid)
+    for q in QUERIES:
+        main.COURSE_TEXT.search(q)
+        main.COURSE_INDEX.ids_matching_text(q)
+    print('ready', flush=True)
+    sys.stdin.readline()  # every worker is up: measure now
+    rollup = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                rollup[parts[0].rstrip(':')] = int(parts[1])
+    print(json.dumps({
+        'startup_s': startup,
+        'mapped': catalog.snapshot is not None,
+        'rss_kb': rollup['Rss'],
+        'pss_kb': rollup['Pss'],
+        'private_kb': rollup['Private_Clean'] + rollup['Private_Dirty'],
+    }), flush=True)
+
+
+def write_synthetic_csv(path: Path, rows: int) -> None:
+    from bench_catalog import synthetic_lines
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        for line in synthetic_lines(rows):
+            f.write(line)
+
+
+def run_workers(n: int, env) -> list:
+    procs = [subprocess.Popen([sys.executable, __file__, '--child'], env=env, text=True,
+                              stdin=subprocess.PIPE, stdout=subprocess.PIPE) for _ in range(n)]
+    for p in procs:
+        line = p.stdout.readline()
+        if line.strip() != 'ready':
+            raise SystemExit(f"worker failed to start: {line!r}")
+    for p in procs:
+        p.stdin.write('\n')
+        p.stdin.flush()
+    results = [json.loads(p.stdout.readline()) for p in procs]
+    for p in procs:
+        p.wait()
+    return results
+
+
+def bench(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, LOG_DIR=str(Path(tmp) / 'logs'), LOG_LEVEL='WARNING',
+                   CATALOG_SNAPSHOT=str(Path(tmp) / 'catalog.snap'))
+        label = 'real catalog'
+        if args.rows:
+            csv_path = Path(tmp) / 'courses.csv'
+            write_synthetic_csv(csv_path, args.rows)
+            env['COURSERA_CATALOG_CSV'] = str(csv_path)
+            label = f'{args.rows} synthetic rows'
+        subprocess.run([sys.executable, str(ROOT / 'tools' / 'build_catalog_snapshot.py'),
+                        '--output', env['CATALOG_SNAPSHOT']], env=env, check=True, stdout=subprocess.DEVNULL)
+        print(f"{label}, snapshot {Path(env['CATALOG_SNAPSHOT']).stat().st_size / 1e6:.1f} MB")
+        for mode in ('parse', 'snapshot'):
+            mode_env = dict(env, CATALOG_SNAPSHOT='') if mode == 'parse' else env
+            for n in args.workers:
+                results = run_workers(n, mode_env)
+                assert all(r['mapped'] == (mode == 'snapshot') for r in results)
+                print(f"  {mode:<8} {n:>2} workers  startup p50 {statistics.median(r['startup_s'] for r in results):5.2f}s  "
+                      f"RSS/worker {statistics.mean(r['rss_kb'] for r in results) / 1024:6.1f} MB  "
+                      f"private/worker {statistics.mean(r['private_kb'] for r in results) / 1024:6.1f} MB  "
+                      f"PSS total {sum(r['pss_kb'] for r in results) / 1024:7.1f} MB")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Per-worker memory with the catalog parsed vs mapped")
+    parser.add_argument('--workers', type=int, nargs='*', default=[1, 4, 16])
+    parser.add_argument('--rows', type=int, default=0,
+                        help="synthetic Coursera rows (cycled from the real export); 0 = the real catalog")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child()
+    else:
+        bench(args)
+
+
+if __name__ == '__main__':
+    main_cli()
@@ -0,0 +1,94 @@
+# ============================================================================
+# CAREERCOMPASS PRO - STORAGE BACKEND THROUGHPUT BENCHMARK
+# Drives /signup, /login and /analyze in-process (httpx ASGI transport) with
+# N concurrent clients, once per storage backend.
+#
+#   python benchmarks/bench_storage.py [--users 200] [--concurrency 32] [--backends memory sqlite]
+# ============================================================================
+
+import argparse
+import asyncio
+import importlib
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+import main  # noqa: E402
+
+ANALYZE_FORM = {'skills': 'python, sql, machine learning, pandas', 'cgpa': '8.1',
+                'career_goal': 'Data Science'}
+
+
+def load_app(backend: str, db_path: str):
+    """Re-import main with the storage backend selected through the environment."""
+    os.environ['CAREERCOMPASS_STORAGE'] = backend
+    os.environ['CAREERCOMPASS_DB'] = db_path
+    module = importlib.reload(main)
+    module.logger.setLevel(logging.WARNING)
+    return module
+
+
+async def user_session(client, i, latencies):
+    form = {'username': f'bench{i}', 'email': f'bench{i}@example.com',
+            'password': 'benchpass', 'full_name': f'Bench {i}'}
+    for step, path, data in (('signup', '/signup', form),
+                             ('login', '/login', {'username': form['username'], 'password': 'benchpass'}),
+                             ('analyze', '/analyze', ANALYZE_FORM)):
+        started = time.perf_counter()
+        resp = await client.post(path, data=data)
+        latencies[step].append((time.perf_counter() - started) * 1000)
+        if resp.status_code >= 400:
+            raise RuntimeError(f"{path} -> {resp.status_code}: {resp.text[:200]}")
+        for name, value in resp.cookies.items():
+            client.cookies.set(name, value)
+
+
+async def run(module, users: int, concurrency: int):
+    latencies = {'signup': [], 'login': [], 'analyze': []}
+    transport = httpx.ASGITransport(app=module.app)
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with gate:
+            async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+                await user_session(client, i, latencies)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(users)))
+    elapsed = time.perf_counter() - started
+    await module.storage.close()
+    return elapsed, latencies
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Signup/login/analyze throughput per storage backend")
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--backends', nargs='*', default=['memory', 'sqlite'])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in args.backends:
+            module = load_app(backend, os.path.join(tmp, f'{backend}.db'))
+            elapsed, latencies = asyncio.run(run(module, args.users, args.concurrency))
+            requests = sum(len(v) for v in latencies.values())
+            print(f"{backend:<7} {requests} requests in {elapsed:.2f}s ({requests / elapsed:,.0f} req/s)  "
+                  f"stats={module.storage.stats()}")
+            for step, samples in latencies.items():
+                samples.sort()
+                print(f"  {step:<8} p50 {statistics.median(samples):7.1f} ms  "
+                      f"p99 {samples[int(len(samples) * 0.99)]:7.1f} ms")
+
+
+if __name__ == '__main__':
+    main_cli()
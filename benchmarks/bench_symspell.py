@@ -0,0 +1,112 @@
+# ============================================================================
+# CAREERCOMPASS PRO - TYPO LOOKUP LATENCY BENCHMARK
+# SymSpellIndex lookup latency vs vocabulary size, against a linear scan.
+# Vocabulary: Coursera skills, then title/description words, up to each size.
+#
+#   python benchmarks/bench_symspell.py [--sizes 100 1000 5000 20000] [--queries 2000]
+# ============================================================================
+
+import argparse
+import csv
+import os
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+import main  # noqa: E402
+
+
+def coursera_vocabulary():
+    skills, words = [], []
+    seen = set()
+    with open(main.config.COURSERA_CATALOG_CSV, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            for skill in row['Skills'].split(','):
+                skill = skill.strip().lower()
+                if skill and skill not in seen:
+                    seen.add(skill)
+                    skills.append(skill)
+            for word in re.findall(r'[a-z]{4,}', (row['Title'] + ' ' + row['course_description']).lower()):
+                if word not in seen:
+                    seen.add(word)
+                    words.append(word)
+    return skills + words
+
+
+def misspell(word, rng):
+    chars = list(word)
+    for _ in range(rng.randint(1, 2)):
+        op = rng.choice('dist')
+        i = rng.randrange(len(chars))
+        if op == 'd' and len(chars) > 3:
+            del chars[i]
+        elif op == 'i':
+            chars.insert(i, rng.choice('abcdefghijklmnopqrstuvwxyz'))
+        elif op == 's':
+            chars[i] = rng.choice('abcdefghijklmnopqrstuvwxyz')
+        elif i + 1 < len(chars):
+            chars[i], chars[i + 1] = chars[i + 1], chars[i]
+    return ''.join(chars)
+
+
+def timed(fn, queries):
+    samples = []
+    for q in queries:
+        started = time.perf_counter()
+        fn(q)
+        samples.append((time.perf_counter() - started) * 1e6)
+    samples.sort()
+    return statistics.mean(samples), samples[len(samples) // 2], samples[int(len(samples) * 0.99)]
+
+
+def linear_scan(vocab):
+    def lookup(word):
+        best = None
+        for term in vocab:
+            d = main.edit_distance(word, term, 2)
+            if d <= 2 and (best is None or d < best[1]):
+                best = (term, d)
+        return best
+    return lookup
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="SymSpell lookup latency vs vocabulary size")
+    parser.add_argument('--sizes', type=int, nargs='*', default=[100, 1000, 5000, 20000])
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--linear-max', type=int, default=5000,
+                        help="skip the linear-scan baseline above this vocabulary size")
+    args = parser.parse_args()
+
+    vocab = coursera_vocabulary()
+    print(f"Coursera vocabulary: {len(vocab)} distinct skills/words")
+    rng = random.Random(42)
+    print(f"{'size':>7} {'build s':>8} {'deletes':>9} | {'symspell mean/p50/p99 us':>26} | "
+          f"{'linear mean/p50/p99 us':>24}")
+    for size in args.sizes:
+        terms = vocab[:size]
+        started = time.perf_counter()
+        index = main.SymSpellIndex(max_distance=2)
+        for term in terms:
+            index.add(term)
+        build = time.perf_counter() - started
+        queries = [misspell(rng.choice(terms), rng) for _ in range(args.queries)]
+        sym = timed(lambda q: index.lookup(q), queries)
+        if len(terms) <= args.linear_max:
+            lin = timed(linear_scan(terms), queries[:200])
+            lin_text = f"{lin[0]:8.0f} {lin[1]:7.0f} {lin[2]:7.0f}"
+        else:
+            lin_text = f"{'(skipped)':>24}"
+        print(f"{len(terms):>7} {build:8.2f} {len(index.deletes):>9} | "
+              f"{sym[0]:8.1f} {sym[1]:8.1f} {sym[2]:8.1f} | {lin_text}")
+
+
+if __name__ == '__main__':
+    main_cli()
@@ -0,0 +1,101 @@
+# ============================================================================
+# CAREERCOMPASS PRO - TOP-K COURSE RANKING BENCHMARK
+# top_courses_for_skill() and the domain page's top 8: the previous
+# score-everything-and-sort code against the precomputed ranked lists, on the
+# real catalog and synthetic ones, plus the lazy rebuild after a weight change.
+# Results are checked for equality on every call.
+#
+#   python benchmarks/bench_topk.py [--courses 0 100000] [--calls 2000]
+# ============================================================================
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+import main  # noqa: E402
+from bench_routes import skill_vocabulary, synthetic_catalog  # noqa: E402
+
+
+def sorted_top_for_skill(skill_name: str, top_n: int):
+    """The previous top_courses_for_skill selection."""
+    catalog = main.CATALOG
+    matches = []
+    for cid in main.COURSE_INDEX.ids_related_to_skill(skill_name):
+        matches.append((catalog.rating_of(cid) * 20 - (catalog.price[cid] / 100.0), cid))
+    matches.sort(key=lambda x: x[0], reverse=True)
+    return [cid for _, cid in matches[:top_n]]
+
+
+def sorted_top_for_domain(skills, k: int):
+    """The previous build_domain_view selection."""
+    catalog = main.CATALOG
+    ids = list(main.COURSE_INDEX.ids_with_any_skill(skills))
+    ids.sort(key=lambda cid: (-catalog.rating[cid], catalog.price[cid]))
+    return ids[:k]
+
+
+def per_call_us(fn, args_list, calls):
+    samples = []
+    for i in range(calls):
+        args = args_list[i % len(args_list)]
+        started = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - started) * 1e6)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99)]
+
+
+def bench(label, skills, calls):
+    domains = [d.get('skills', []) for d in main.CAREER_DOMAINS_MAP.values()]
+    skill_args = [(s, 3) for s in skills]
+    domain_args = [(d, 8) for d in domains]
+    for s, n in skill_args:  # warm the index memo and every ranked list; check equality while at it
+        assert main.SKILL_RANKING.for_skill(s, n) == sorted_top_for_skill(s, n), s
+    for d, k in domain_args:
+        assert main.DOMAIN_RANKING.for_skills(d, k) == sorted_top_for_domain(d, k)
+
+    print(f"{label}: {len(main.CATALOG)} courses, {len(skills)} skills, {len(domains)} domains")
+    for name, old, new, args in (('skill top-3', sorted_top_for_skill, main.SKILL_RANKING.for_skill, skill_args),
+                                 ('domain top-8', sorted_top_for_domain, main.DOMAIN_RANKING.for_skills, domain_args)):
+        old_p50, old_p99 = per_call_us(old, args, calls)
+        new_p50, new_p99 = per_call_us(new, args, calls)
+        print(f"  {name:<13} sort p50 {old_p50:9.1f} us p99 {old_p99:9.1f} us | "
+              f"ranked p50 {new_p50:7.1f} us p99 {new_p99:7.1f} us  ({old_p50 / new_p50:5.1f}x)")
+
+    # a weight change drops the lists; the first calls pay for the rebuild
+    started = time.perf_counter()
+    main.SKILL_RANKING.set_ranking(main.score_ranking(rating_weight=25.0))
+    for s, n in skill_args:
+        main.SKILL_RANKING.for_skill(s, n)
+    print(f"  weight change: {len(skill_args)} skill lists rebuilt lazily in "
+          f"{(time.perf_counter() - started) * 1000:.1f} ms")
+    main.SKILL_RANKING.set_ranking(main.score_ranking())
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Top-k course ranking: full sort vs precomputed ranked lists")
+    parser.add_argument('--courses', type=int, nargs='*', default=[0, 100000],
+                        help="synthetic catalog sizes; 0 = the real catalog")
+    parser.add_argument('--calls', type=int, default=2000)
+    parser.add_argument('--skills', type=int, default=200, help="distinct skills queried")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    real_catalog = main.CATALOG
+    vocab = skill_vocabulary()
+    skills = vocab[::max(1, len(vocab) // args.skills)][:args.skills]
+    for courses in args.courses:
+        main.reload_data(catalog=synthetic_catalog(courses, vocab) if courses else real_catalog)
+        bench(f"courses-{courses or 'real'}", skills, args.calls)
+
+
+if __name__ == '__main__':
+    main_cli()
@@ -4,38 +4,129 @@
 # Built for Performance & Scalability
 # ============================================================================
 
-from fastapi import FastAPI, Request, Form, HTTPException, status, Response
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
+from fastapi import FastAPI, Request, Form, HTTPException, status, Response, Depends
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse, RedirectResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from markupsafe import escape
 from fastapi.middleware.cors import CORSMiddleware
 import logging
+import logging.handlers
+import atexit
 import hashlib
+import hmac
+import base64
 import uuid
 from datetime import datetime, timedelta
+from collections import Counter, OrderedDict
 from pathlib import Path
 import jwt
 from typing import Optional, Dict, Any, List
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 import json
+import io
 import os
 import re
+import sys
+import csv
+import time
+import functools
+import bisect
+import heapq
+import itertools
+import asyncio
+import queue
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import mmap
+import struct
+from array import array
 import html
-from urllib.parse import quote_plus
+from urllib.parse import quote_plus, urlencode
 from math import ceil
+import numpy as np
+
+try:
+    import orjson  # optional: /api/v1 falls back to the stdlib encoder without it
+except ImportError:
+    orjson = None
 
 # ============================================================================
 # LOGGING SETUP
 # ============================================================================
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('careercompass.log'),
-        logging.StreamHandler()
-    ]
-)
+LOG_TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+class JsonLogFormatter(logging.Formatter):
+    """One JSON object per line (LOG_FORMAT=json)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops (and counts) records when the queue is full.
+
+    Request handlers only pay for formatting the message and a put_nowait;
+    file writes and rotation happen on the QueueListener thread.
+    """
+
+    def __init__(self, log_queue: 'queue.Queue'):
+        super().__init__(log_queue)
+        self.enqueued = 0
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+            self.enqueued += 1
+        except queue.Full:
+            self.dropped += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {'enqueued': self.enqueued, 'dropped': self.dropped, 'queued': self.queue.qsize(),
+                'max_queue': self.queue.maxsize}
+
+
+def setup_logging(cfg) -> DroppingQueueHandler:
+    """Route the root logger through a bounded queue to a rotating file + console."""
+    log_dir = Path(cfg.LOG_DIR)
+    log_dir.mkdir(exist_ok=True)
+    path = log_dir / cfg.LOG_FILE.format(pid=os.getpid())
+    if cfg.LOG_ROTATE_WHEN:
+        file_handler = logging.handlers.TimedRotatingFileHandler(
+            path, when=cfg.LOG_ROTATE_WHEN, backupCount=cfg.LOG_BACKUP_COUNT, encoding='utf-8')
+    else:
+        file_handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=cfg.LOG_MAX_BYTES, backupCount=cfg.LOG_BACKUP_COUNT, encoding='utf-8')
+    formatter = JsonLogFormatter() if cfg.LOG_FORMAT == 'json' else logging.Formatter(LOG_TEXT_FORMAT)
+    file_handler.setFormatter(formatter)
+    console = logging.StreamHandler()
+    console.setFormatter(formatter)
+
+    handler = DroppingQueueHandler(queue.Queue(maxsize=cfg.LOG_QUEUE_SIZE))
+    listener = logging.handlers.QueueListener(handler.queue, file_handler, console, respect_handler_level=True)
+    root = logging.getLogger()
+    for old in root.handlers[:]:
+        root.removeHandler(old)
+    root.addHandler(handler)
+    root.setLevel(cfg.LOG_LEVEL)
+    listener.start()
+    atexit.register(listener.stop)  # drains the queue
+    return handler
+
+
 logger = logging.getLogger(__name__)
 
 # ============================================================================
@@ -50,8 +141,158 @@ class Config:
     APP_NAME = "CareerCompass Pro"
     APP_VERSION = "10.0.0"
     ENVIRONMENT = "production"
+    COURSERA_CATALOG_CSV = os.getenv("COURSERA_CATALOG_CSV", "data/archive (79)/coursera_course_dataset_v3.csv")
+    LOAD_COURSERA_CATALOG = os.getenv("LOAD_COURSERA_CATALOG", "1") != "0"
+    JOB_DEMAND_SNAPSHOT = os.getenv("JOB_DEMAND_SNAPSHOT", "data/job_demand.bin")
+    CATALOG_SNAPSHOT = os.getenv("CATALOG_SNAPSHOT", "data/catalog.snap")  # empty: always parse the sources
+    MIN_GROWTH_MONTHS = 6  # shorter posting windows are too noisy to replace 'growth'
+    SKILL_CACHE_SIZE = 50000  # raw skill token -> canonical id memo
+    STORAGE_BACKEND = os.getenv("CAREERCOMPASS_STORAGE", "memory")  # memory | sqlite
+    SQLITE_PATH = os.getenv("CAREERCOMPASS_DB", "data/careercompass.db")
+    SQLITE_POOL_SIZE = 4
+    ANALYSIS_BATCH_SIZE = 64
+    ANALYSIS_FLUSH_MS = 50
+    ANALYSIS_MAX_ENTRIES = int(os.getenv("ANALYSIS_MAX_ENTRIES", "20000"))
+    ANALYSIS_MAX_BYTES = int(os.getenv("ANALYSIS_MAX_BYTES", str(64 * 1024 * 1024)))
+    ANALYSIS_TTL_SECONDS = int(os.getenv("ANALYSIS_TTL_SECONDS", str(24 * 3600)))
+    ANALYSIS_SPILL_DIR = os.getenv("ANALYSIS_SPILL_DIR", "")  # empty: evicted analyses are dropped
+    ANALYSIS_CACHE_SIZE = int(os.getenv("ANALYSIS_CACHE_SIZE", "4096"))  # 0 disables the /analyze result cache
+    PASSWORD_KDF = os.getenv("PASSWORD_KDF", "scrypt")  # scrypt | pbkdf2_sha256
+    SCRYPT_N = int(os.getenv("SCRYPT_N", str(2 ** 14)))
+    SCRYPT_R = int(os.getenv("SCRYPT_R", "8"))
+    SCRYPT_P = int(os.getenv("SCRYPT_P", "1"))
+    PBKDF2_ITERATIONS = int(os.getenv("PBKDF2_ITERATIONS", "600000"))
+    HASH_WORKERS = int(os.getenv("HASH_WORKERS", str(min(4, os.cpu_count() or 1))))  # 0: hash inline
+    HASH_MAX_PENDING = int(os.getenv("HASH_MAX_PENDING", "64"))  # queued + running KDF jobs before 503
+    TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))  # 0 disables the verified-token cache
+    REVOCATION_POLL_SECONDS = float(os.getenv("REVOCATION_POLL_SECONDS", "1"))  # logout lag across workers
+    LOG_DIR = os.getenv("LOG_DIR", "logs")
+    LOG_FILE = os.getenv("LOG_FILE", "careercompass.log")  # "{pid}" gives each worker process its own file
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "text")  # text | json
+    LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+    LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+    LOG_ROTATE_WHEN = os.getenv("LOG_ROTATE_WHEN", "")  # e.g. "midnight": rotate by time instead of size
+    LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))  # records beyond this are dropped
+    COURSES_PAGE_SIZE = int(os.getenv("COURSES_PAGE_SIZE", "60"))  # cards per /courses page
 
 config = Config()
+LOG_HANDLER = setup_logging(config)
+
+# ============================================================================
+# METRICS (Prometheus text exposition, no client library)
+# ============================================================================
+
+# seconds; fine at the low end where cached routes live
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# stats() keys that only ever grow; exported as counters, everything else as gauges
+COUNTER_STAT_KEYS = {
+    'hits', 'misses', 'memo_hits', 'memo_misses', 'coalesced', 'invalidations', 'expired', 'invalidated',
+    'revoked_hits', 'evicted_lru', 'evicted_ttl', 'spilled_total', 'spill_hits', 'enqueued', 'dropped',
+    'hashed', 'verified', 'rehashed', 'rejected_busy', 'rebuilds', 'batches_written',
+}
+
+
+def _label_text(names: tuple, values: tuple) -> str:
+    return ','.join('{}="{}"'.format(n, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+                    for n, v in zip(names, values))
+
+
+class Histogram:
+    """Fixed-bucket histogram per label set; observe() is a bisect and three adds."""
+
+    def __init__(self, name: str, help_text: str, label_names: tuple, buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series: Dict[tuple, list] = {}  # labels -> [per-bucket counts..., +Inf count, sum]
+
+    def observe(self, labels: tuple, value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def expose(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self._series.items()):
+            base = _label_text(self.label_names, labels)
+            cumulative = 0
+            for bound, n in zip(self.buckets + ('+Inf',), series):
+                cumulative += n
+                lines.append(f'{self.name}_bucket{{{base},le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{base}}} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{{{base}}} {cumulative}")
+        return lines
+
+
+REQUEST_LATENCY = Histogram('careercompass_request_duration_seconds', 'HTTP request latency by route template.',
+                            ('route', 'method', 'status'))
+STAGE_LATENCY = Histogram('careercompass_analyze_stage_seconds', 'Time spent in each /analyze stage.', ('stage',))
+IN_FLIGHT = {'requests': 0}
+
+
+class StageClock:
+    """Lap timer: mark(stage) records the time since the previous mark into STAGE_LATENCY."""
+
+    __slots__ = ('last',)
+
+    def __init__(self):
+        self.last = time.perf_counter()
+
+    def mark(self, stage: str) -> None:
+        now = time.perf_counter()
+        STAGE_LATENCY.observe((stage,), now - self.last)
+        self.last = now
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware timing each HTTP request (including streamed bodies)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+        started = time.perf_counter()
+        status_code = [500]
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                status_code[0] = message['status']
+            await send(message)
+
+        IN_FLIGHT['requests'] += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT['requests'] -= 1
+            # the router stores the matched route on the shared scope; label by its template
+            route = scope.get('route')
+            route_path = getattr(route, 'path', None) or ('/static' if scope['path'].startswith('/static/') else 'unmatched')
+            REQUEST_LATENCY.observe((route_path, scope['method'], status_code[0]), time.perf_counter() - started)
+
+
+def expose_stats(component: str, stats: Dict[str, Any], lines: List[str]) -> None:
+    """Flatten a component's stats() dict into counter/gauge samples."""
+    for key, value in stats.items():
+        if isinstance(value, dict):
+            expose_stats(f"{component}_{key}", value, lines)
+            continue
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        name = f"careercompass_{component}_{key}"
+        if key in COUNTER_STAT_KEYS:
+            lines.append(f"# TYPE {name}_total counter")
+            lines.append(f"{name}_total {value}")
+        else:
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value}")
+
 
 # ============================================================================
 # FASTAPI APP SETUP
@@ -65,6 +306,8 @@ app = FastAPI(
     redoc_url="/api/redoc"
 )
 
+app.add_middleware(MetricsMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -77,7 +320,6 @@ app.add_middleware(
 # Create necessary directories
 Path("static").mkdir(exist_ok=True)
 Path("templates").mkdir(exist_ok=True)
-Path("logs").mkdir(exist_ok=True)
 
 # Mount static files
 try:
@@ -90,11 +332,432 @@ except Exception as e:
 templates = Jinja2Templates(directory="templates")
 
 # ============================================================================
-# IN-MEMORY DATABASE (Can be replaced with real DB)
+# STORAGE (in-memory by default, SQLite for persistence)
 # ============================================================================
 
+class AnalysisStore:
+    """Bounded LRU store for analysis results with a TTL and a byte budget.
+
+    Entries are sized by their JSON encoding. Inserting past ``max_entries`` or
+    ``max_bytes`` evicts least-recently-used entries; with a ``spill_dir`` they
+    are written there as JSON and loaded back (and promoted) on the next read.
+    Entries older than ``ttl`` seconds are dropped wherever they live. Spill
+    files are written, read and deleted on one background thread, in the
+    order requested, so the event loop never waits on the disk.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float, spill_dir: str = ''):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        if self.spill_dir:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+        self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix='analysis-spill') if self.spill_dir else None
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()  # id -> (record, size, stored_at)
+        self._spilled: 'OrderedDict[str, float]' = OrderedDict()  # id -> stored_at
+        self.bytes = 0
+        self.hits = self.misses = self.spill_hits = 0
+        self.evicted_lru = self.evicted_ttl = self.spilled_total = 0
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return now - stored_at > self.ttl
+
+    def _spill_path(self, analysis_id: str) -> Path:
+        return self.spill_dir / f"{analysis_id}.json"
+
+    def _write_spill(self, analysis_id: str, record: Dict[str, Any], stored_at: float) -> None:
+        try:
+            self._spill_path(analysis_id).write_text(
+                json.dumps({'stored_at': stored_at, 'record': record}, default=str), encoding='utf-8')
+        except OSError as e:
+            logger.warning(f"Could not spill analysis {analysis_id}: {e}")  # get() will count a miss
+
+    def _read_spill(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(self._spill_path(analysis_id).read_text(encoding='utf-8'))['record']
+        except (OSError, ValueError):
+            return None
+
+    def _unlink_spill(self, analysis_id: str) -> None:
+        try:
+            self._spill_path(analysis_id).unlink()
+        except OSError:
+            pass
+
+    def _drop_spilled(self, analysis_id: str) -> None:
+        self._spilled.pop(analysis_id, None)
+        self._io.submit(self._unlink_spill, analysis_id)
+
+    def _sweep(self, now: float) -> None:
+        # both maps are close to age order, so expired entries collect at the front
+        while self._entries:
+            analysis_id, (_, size, stored_at) = next(iter(self._entries.items()))
+            if not self._expired(stored_at, now):
+                break
+            del self._entries[analysis_id]
+            self.bytes -= size
+            self.evicted_ttl += 1
+        while self._spilled:
+            analysis_id, stored_at = next(iter(self._spilled.items()))
+            if not self._expired(stored_at, now):
+                break
+            self._drop_spilled(analysis_id)
+            self.evicted_ttl += 1
+
+    def _evict(self) -> None:
+        while self._entries and (len(self._entries) > self.max_entries or self.bytes > self.max_bytes):
+            analysis_id, (record, size, stored_at) = self._entries.popitem(last=False)
+            self.bytes -= size
+            self.evicted_lru += 1
+            if self.spill_dir:
+                self._spilled[analysis_id] = stored_at
+                self.spilled_total += 1
+                self._io.submit(self._write_spill, analysis_id, record, stored_at)
+
+    def put(self, analysis_id: str, record: Dict[str, Any], stored_at: Optional[float] = None) -> None:
+        now = time.time()
+        stored_at = now if stored_at is None else stored_at
+        self._sweep(now)
+        old = self._entries.pop(analysis_id, None)
+        if old:
+            self.bytes -= old[1]
+        if analysis_id in self._spilled:
+            self._drop_spilled(analysis_id)
+        size = len(json.dumps(record, default=str))
+        self._entries[analysis_id] = (record, size, stored_at)
+        self.bytes += size
+        self._evict()
+
+    async def get(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        entry = self._entries.get(analysis_id)
+        if entry is not None:
+            if not self._expired(entry[2], now):
+                self._entries.move_to_end(analysis_id)
+                self.hits += 1
+                return entry[0]
+            del self._entries[analysis_id]
+            self.bytes -= entry[1]
+            self.evicted_ttl += 1
+        elif analysis_id in self._spilled:
+            stored_at = self._spilled[analysis_id]
+            if not self._expired(stored_at, now):
+                record = await asyncio.get_running_loop().run_in_executor(self._io, self._read_spill, analysis_id)
+                entry = self._entries.get(analysis_id)
+                if entry is not None:  # another get() promoted it while the file was read
+                    self.hits += 1
+                    return entry[0]
+                self._drop_spilled(analysis_id)
+                if record is not None:
+                    self.spill_hits += 1
+                    self.put(analysis_id, record, stored_at)
+                    return record
+            else:
+                self._drop_spilled(analysis_id)
+                self.evicted_ttl += 1
+        self.misses += 1
+        return None
+
+    def __setitem__(self, analysis_id: str, record: Dict[str, Any]) -> None:
+        self.put(analysis_id, record)
+
+    def __contains__(self, analysis_id: str) -> bool:
+        return analysis_id in self._entries or analysis_id in self._spilled
+
+    def __len__(self) -> int:
+        return len(self._entries) + len(self._spilled)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'entries': len(self._entries), 'bytes': self.bytes, 'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes, 'ttl_seconds': self.ttl, 'spilled': len(self._spilled),
+            'hits': self.hits, 'misses': self.misses, 'spill_hits': self.spill_hits,
+            'evicted_lru': self.evicted_lru, 'evicted_ttl': self.evicted_ttl, 'spilled_total': self.spilled_total,
+        }
+
+
 users_db: Dict[str, Dict[str, Any]] = {}
-user_analyses: Dict[str, Dict[str, Any]] = {}
+user_analyses = AnalysisStore(config.ANALYSIS_MAX_ENTRIES, config.ANALYSIS_MAX_BYTES,
+                              config.ANALYSIS_TTL_SECONDS, config.ANALYSIS_SPILL_DIR)
+
+
+class MemoryStorage:
+    """Default backend: the module-level users_db dict and user_analyses store."""
+
+    name = 'memory'
+    shared = False  # visible to this process only
+
+    def __init__(self, users: Dict[str, Dict[str, Any]], analyses: AnalysisStore):
+        self.users = users
+        self.analyses = analyses
+
+    async def get_user(self, username: str) -> Optional[Dict[str, Any]]:
+        return self.users.get(username)
+
+    async def create_user(self, user: Dict[str, Any]) -> bool:
+        """Insert a new user; False if the username is taken."""
+        if user['username'] in self.users:
+            return False
+        self.users[user['username']] = user
+        return True
+
+    async def update_user(self, username: str, fields: Dict[str, Any]) -> None:
+        if username in self.users:
+            self.users[username].update(fields)
+
+    async def save_analysis(self, analysis_id: str, record: Dict[str, Any]) -> None:
+        self.analyses[analysis_id] = record
+
+    async def get_analysis(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        return await self.analyses.get(analysis_id)
+
+    async def revoke_token(self, digest: bytes, exp: float) -> None:
+        pass  # TOKEN_CACHE already holds the revocation for the only process
+
+    async def revocations_since(self, cursor: int) -> tuple:
+        return [], cursor
+
+    async def close(self) -> None:
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {'backend': self.name, 'users': len(self.users), 'analyses': self.analyses.stats()}
+
+
+class SQLiteStorage:
+    """SQLite backend in WAL mode.
+
+    Blocking sqlite3 calls run on a small thread pool, each borrowing a
+    connection from a fixed pool, so the event loop never waits on disk.
+    Statements are constant SQL strings, which sqlite3 keeps compiled in each
+    connection's statement cache. Analyses are written behind: a writer
+    thread commits them in batches, and reads check the pending batch first,
+    so other worker processes see a new analysis within one flush interval.
+    Token revocations are written through for sync_revocations() to pick up.
+    """
+
+    name = 'sqlite'
+    shared = True  # every worker process opening the same file sees the same state
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS users ("
+        " username TEXT PRIMARY KEY, email TEXT, full_name TEXT,"
+        " hashed_password TEXT NOT NULL, joined_date TEXT)",
+        "CREATE TABLE IF NOT EXISTS analyses ("
+        " analysis_id TEXT PRIMARY KEY, username TEXT NOT NULL, created_at TEXT NOT NULL, payload TEXT NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS idx_analyses_user ON analyses (username, created_at)",
+        "CREATE TABLE IF NOT EXISTS revoked_tokens ("
+        " id INTEGER PRIMARY KEY AUTOINCREMENT, digest BLOB NOT NULL, exp REAL NOT NULL)",
+    )
+    SQL_GET_USER = "SELECT username, email, full_name, hashed_password, joined_date FROM users WHERE username = ?"
+    SQL_INSERT_USER = ("INSERT INTO users (username, email, full_name, hashed_password, joined_date)"
+                       " VALUES (?, ?, ?, ?, ?)")
+    SQL_INSERT_ANALYSIS = ("INSERT OR REPLACE INTO analyses (analysis_id, username, created_at, payload)"
+                           " VALUES (?, ?, ?, ?)")
+    SQL_GET_ANALYSIS = "SELECT payload FROM analyses WHERE analysis_id = ?"
+    SQL_INSERT_REVOCATION = "INSERT INTO revoked_tokens (digest, exp) VALUES (?, ?)"
+    SQL_PRUNE_REVOCATIONS = "DELETE FROM revoked_tokens WHERE exp <= ?"
+    SQL_REVOCATIONS_SINCE = "SELECT id, digest, exp FROM revoked_tokens WHERE id > ? ORDER BY id"
+    USER_COLUMNS = ('username', 'email', 'full_name', 'hashed_password', 'joined_date')
+    UPDATABLE_USER_COLUMNS = ('email', 'full_name', 'hashed_password')
+    CLOSE_RETRIES = 3  # attempts left for a failing batch once close() is waiting on the writer
+
+    def __init__(self, path: str, pool_size: int = 4, batch_size: int = 64, flush_interval: float = 0.05):
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._pool: 'queue.Queue[sqlite3.Connection]' = queue.Queue()
+        for _ in range(pool_size):
+            self._pool.put(self._connect())
+        with self._connection() as conn:
+            for ddl in self.SCHEMA:
+                conn.execute(ddl)
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='sqlite')
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._pending_lock = threading.Lock()
+        self._writes: 'queue.Queue' = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name='sqlite-writer', daemon=True)
+        self.batches_written = 0
+        self.write_failures = 0
+        self._writer.start()
+
+    def _connect(self) -> 'sqlite3.Connection':
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False,
+                               isolation_level=None, cached_statements=64)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    # -- users -------------------------------------------------------------
+
+    def _get_user(self, username: str) -> Optional[Dict[str, Any]]:
+        with self._connection() as conn:
+            row = conn.execute(self.SQL_GET_USER, (username,)).fetchone()
+        return dict(zip(self.USER_COLUMNS, row)) if row else None
+
+    def _create_user(self, user: Dict[str, Any]) -> bool:
+        try:
+            with self._connection() as conn:
+                conn.execute(self.SQL_INSERT_USER, tuple(user.get(c) for c in self.USER_COLUMNS))
+            return True
+        except sqlite3.IntegrityError:
+            return False
+
+    def _update_user(self, username: str, fields: Dict[str, Any]) -> None:
+        columns = [c for c in self.UPDATABLE_USER_COLUMNS if c in fields]
+        if not columns:
+            return
+        sql = f"UPDATE users SET {', '.join(c + ' = ?' for c in columns)} WHERE username = ?"
+        with self._connection() as conn:
+            conn.execute(sql, tuple(fields[c] for c in columns) + (username,))
+
+    async def get_user(self, username: str) -> Optional[Dict[str, Any]]:
+        return await self._run(self._get_user, username)
+
+    async def create_user(self, user: Dict[str, Any]) -> bool:
+        return await self._run(self._create_user, user)
+
+    async def update_user(self, username: str, fields: Dict[str, Any]) -> None:
+        await self._run(self._update_user, username, fields)
+
+    # -- analyses (write-behind) -------------------------------------------
+
+    def _next_batch(self, rows: List[tuple]) -> tuple:
+        """Top ``rows`` up from the write queue: (rows, stop) where stop means close() was called."""
+        if not rows:
+            rows = [self._writes.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(rows) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                rows.append(self._writes.get(timeout=timeout))
+            except queue.Empty:
+                break
+        stop = None in rows
+        return [row for row in rows if row is not None], stop
+
+    def _write_batch(self, conn: 'sqlite3.Connection', rows: List[tuple]) -> bool:
+        try:
+            conn.execute("BEGIN")
+            conn.executemany(self.SQL_INSERT_ANALYSIS, rows)
+            conn.execute("COMMIT")
+        except Exception as e:
+            logger.error(f"SQLite analysis batch failed ({len(rows)} rows), will retry: {e}")
+            try:
+                conn.execute("ROLLBACK")
+            except Exception:
+                pass  # BEGIN failed, or SQLite already rolled the transaction back
+            return False
+        self.batches_written += 1
+        return True
+
+    def _write_loop(self) -> None:
+        conn = self._connect()
+        rows: List[tuple] = []  # a failed batch stays here, and in _pending, until it commits
+        stop, failures = False, 0
+        while True:
+            if not stop:
+                rows, stop = self._next_batch(rows)
+            if not rows:
+                break
+            if self._write_batch(conn, rows):
+                with self._pending_lock:
+                    for row in rows:
+                        self._pending.pop(row[0], None)
+                rows, failures = [], 0
+                continue
+            failures += 1
+            self.write_failures += 1
+            if stop and failures >= self.CLOSE_RETRIES:
+                logger.error(f"SQLite writer closing with {len(rows)} unwritten analyses")
+                break
+            time.sleep(min(self.flush_interval * 2 ** failures, 5.0))
+        conn.close()
+
+    async def save_analysis(self, analysis_id: str, record: Dict[str, Any]) -> None:
+        with self._pending_lock:
+            self._pending[analysis_id] = record
+        self._writes.put((analysis_id, record.get('user', ''), record.get('timestamp', ''),
+                          json.dumps(record, default=str)))
+
+    def _get_analysis(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        with self._connection() as conn:
+            row = conn.execute(self.SQL_GET_ANALYSIS, (analysis_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    async def get_analysis(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        with self._pending_lock:
+            pending = self._pending.get(analysis_id)
+        if pending is not None:
+            return pending
+        return await self._run(self._get_analysis, analysis_id)
+
+    # -- token revocations (write-through) ---------------------------------
+
+    def _revoke_token(self, digest: bytes, exp: float) -> None:
+        with self._connection() as conn:
+            conn.execute(self.SQL_PRUNE_REVOCATIONS, (time.time(),))
+            conn.execute(self.SQL_INSERT_REVOCATION, (digest, exp))
+
+    def _revocations_since(self, cursor: int) -> tuple:
+        with self._connection() as conn:
+            rows = conn.execute(self.SQL_REVOCATIONS_SINCE, (cursor,)).fetchall()
+        return [(bytes(digest), exp) for _, digest, exp in rows], rows[-1][0] if rows else cursor
+
+    async def revoke_token(self, digest: bytes, exp: float) -> None:
+        await self._run(self._revoke_token, digest, exp)
+
+    async def revocations_since(self, cursor: int) -> tuple:
+        """([(digest, exp), ...], new cursor) for revocations recorded after ``cursor``."""
+        return await self._run(self._revocations_since, cursor)
+
+    async def close(self) -> None:
+        self._writes.put(None)
+        await asyncio.get_running_loop().run_in_executor(None, self._writer.join)
+        self._executor.shutdown(wait=True)
+        while not self._pool.empty():
+            self._pool.get().close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {'backend': self.name, 'path': self.path, 'pending_writes': self._writes.qsize(),
+                'batches_written': self.batches_written, 'write_failures': self.write_failures,
+                'unwritten_analyses': len(self._pending)}
+
+
+def create_storage():
+    if config.STORAGE_BACKEND == 'sqlite':
+        logger.info(f"Using SQLite storage at {config.SQLITE_PATH}")
+        return SQLiteStorage(config.SQLITE_PATH, pool_size=config.SQLITE_POOL_SIZE,
+                             batch_size=config.ANALYSIS_BATCH_SIZE,
+                             flush_interval=config.ANALYSIS_FLUSH_MS / 1000)
+    return MemoryStorage(users_db, user_analyses)
+
+
+storage = create_storage()
+BACKGROUND_TASKS: List['asyncio.Task'] = []
+
+
+@app.on_event("shutdown")
+async def close_storage():
+    for task in BACKGROUND_TASKS:
+        task.cancel()
+    await asyncio.gather(*BACKGROUND_TASKS, return_exceptions=True)
+    await storage.close()
 
 # ============================================================================
 # COMPREHENSIVE COURSES DATABASE (50+ COURSES)
@@ -502,128 +1165,1324 @@ COURSES_DATABASE = [
 ]
 
 # ============================================================================
-# CAREER DOMAINS DATABASE (9 DOMAINS)
+# COLUMNAR COURSE CATALOG
 # ============================================================================
 
-CAREER_DOMAINS_MAP = {
-    'ai_engineering': {
-        'name': 'AI & Machine Learning Engineering',
-        'icon': '🤖',
-        'category': 'Technology',
-        'description': 'Build intelligent systems using deep learning and neural networks',
-        'skills': ['python', 'tensorflow', 'pytorch', 'deep learning', 'neural networks', 
-                   'nlp', 'computer vision', 'scikit-learn', 'keras', 'machine learning'],
-        'entry_level': '₹12-18 LPA',
-        'mid_level': '₹20-30 LPA',
-        'senior_level': '₹35-50+ LPA',
-        'demand_trend': '🚀 Exploding',
-        'growth': 85,
-        'job_market_size': 5000,
-        'competition': 'High',
-        'color': '#9b59b6',
-        'top_companies': ['Google', 'OpenAI', 'DeepMind', 'Meta', 'Tesla', 'NVIDIA'],
-        'avg_job_openings': 450,
-        'required_projects': ['Chatbot', 'Image Classification', 'NLP System', 'Time Series']
-    },
-    'data_science': {
-        'name': 'Data Science & Analytics',
-        'icon': '📊',
-        'category': 'Technology',
-        'description': 'Transform raw data into actionable insights',
-        'skills': ['python', 'machine learning', 'statistics', 'sql', 'data analysis', 
-                   'pandas', 'numpy', 'tableau', 'power bi', 'r'],
-        'entry_level': '₹8-12 LPA',
-        'mid_level': '₹16-24 LPA',
-        'senior_level': '₹28-40+ LPA',
-        'demand_trend': '📈 Rising',
-        'growth': 75,
-        'job_market_size': 8000,
-        'competition': 'Medium-High',
-        'color': '#3498db',
-        'top_companies': ['Flipkart', 'Amazon', 'Microsoft', 'Google', 'JPMorgan'],
-        'avg_job_openings': 520,
-        'required_projects': ['Sales Analysis', 'Customer Segmentation', 'Predictive Model', 'Dashboard']
-    },
-    'web_development': {
-        'name': 'Full Stack Web Development',
-        'icon': '💻',
-        'category': 'Technology',
-        'description': 'Build modern web applications from frontend to backend',
-        'skills': ['javascript', 'react', 'node.js', 'python', 'django', 'mongodb', 
-                   'express', 'html', 'css', 'rest api', 'docker'],
-        'entry_level': '₹5-8 LPA',
-        'mid_level': '₹12-18 LPA',
-        'senior_level': '₹22-35+ LPA',
-        'demand_trend': '📈 Steady',
-        'growth': 60,
-        'job_market_size': 15000,
-        'competition': 'Very High',
-        'color': '#e74c3c',
-        'top_companies': ['Paytm', 'Myntra', 'Uber', 'Netflix', 'Shopify'],
-        'avg_job_openings': 850,
-        'required_projects': ['E-commerce Site', 'Blog Platform', 'Chat App', 'Task Manager']
-    },
-    'cloud_devops': {
-        'name': 'Cloud & DevOps Engineering',
-        'icon': '☁️',
-        'category': 'Infrastructure',
-        'description': 'Architect and manage cloud infrastructure at scale',
-        'skills': ['aws', 'azure', 'google cloud', 'docker', 'kubernetes', 'devops', 
-                   'terraform', 'linux', 'jenkins', 'ci/cd'],
-        'entry_level': '₹10-15 LPA',
-        'mid_level': '₹18-26 LPA',
-        'senior_level': '₹30-45+ LPA',
-        'demand_trend': '📈 Rising',
-        'growth': 80,
-        'job_market_size': 6000,
-        'competition': 'Medium',
-        'color': '#f39c12',
-        'top_companies': ['Accenture', 'TCS', 'Infosys', 'IBM', 'AWS'],
-        'avg_job_openings': 380,
-        'required_projects': ['K8s Cluster', 'CI/CD Pipeline', 'Microservices', 'Infrastructure']
-    },
-    'cybersecurity': {
-        'name': 'Cybersecurity & Ethical Hacking',
-        'icon': '🔒',
-        'category': 'Security',
-        'description': 'Defend systems and protect against evolving threats',
-        'skills': ['network security', 'ethical hacking', 'cryptography', 'python', 
-                   'linux', 'penetration testing', 'threat analysis', 'compliance'],
-        'entry_level': '₹10-14 LPA',
-        'mid_level': '₹18-28 LPA',
-        'senior_level': '₹32-50+ LPA',
-        'demand_trend': '🚀 Critical',
-        'growth': 90,
-        'job_market_size': 3000,
-        'competition': 'Low-Medium',
-        'color': '#2ecc71',
-        'top_companies': ['Cisco', 'Kaspersky', 'CrowdStrike', 'Palo Alto', 'Fortinet'],
-        'avg_job_openings': 250,
-        'required_projects': ['Vulnerability Assessment', 'Penetration Test', 'Firewall Config', 'Incident Response']
-    },
-    'mobile_development': {
-        'name': 'Mobile App Development',
-        'icon': '📱',
-        'category': 'Technology',
-        'description': 'Create powerful applications for iOS and Android',
-        'skills': ['swift', 'kotlin', 'react native', 'flutter', 'javascript', 'java', 
-                   'firebase', 'rest api', 'git', 'mobile ui'],
-        'entry_level': '₹6-10 LPA',
-        'mid_level': '₹14-20 LPA',
-        'senior_level': '₹24-36+ LPA',
-        'demand_trend': '📈 High',
-        'growth': 70,
-        'job_market_size': 10000,
-        'competition': 'Medium-High',
-        'color': '#1abc9c',
-        'top_companies': ['Swiggy', 'Ola', 'Zomato', 'Instagram', 'Gojek'],
-        'avg_job_openings': 620,
-        'required_projects': ['E-commerce App', 'Social App', 'Fitness Tracker', 'Food Delivery']
-    },
-    'blockchain': {
-        'name': 'Blockchain & Web3 Development',
-        'icon': '⛓️',
-        'category': 'Emerging',
+def _parse_count(value: Any) -> int:
+    """Parse enrolment/review counts such as '450K+', '1M+', '700,909' or '1.4K'."""
+    text = str(value or '').strip().upper().rstrip('+').replace(',', '')
+    if not text:
+        return 0
+    scale = 1
+    if text[-1] in ('K', 'M'):
+        scale = 1000 if text[-1] == 'K' else 1000000
+        text = text[:-1]
+    try:
+        return int(round(float(text) * scale))
+    except ValueError:
+        return 0
+
+def _count_label(count: int) -> str:
+    """Format a count the way the catalog displays it ('450K+', '1M+')."""
+    if count >= 1000000:
+        return f"{count // 1000000}M+"
+    if count >= 1000:
+        return f"{count // 1000}K+"
+    return str(count)
+
+
+class StringTable:
+    """Append-only string column: one UTF-8 buffer plus an offsets array.
+
+    ``mapped()`` wraps read-only views of the same two buffers (from a catalog
+    snapshot) instead; such a table cannot be appended to.
+    """
+
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = array('Q', [0])
+
+    @classmethod
+    def mapped(cls, data: memoryview, offsets: memoryview) -> 'StringTable':
+        table = cls.__new__(cls)
+        table.data, table.offsets = data, offsets
+        return table
+
+    def append(self, value: str) -> None:
+        self.data += value.encode('utf-8')
+        self.offsets.append(len(self.data))
+
+    def __getitem__(self, i: int) -> str:
+        return str(self.data[self.offsets[i]:self.offsets[i + 1]], 'utf-8')
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.data) + self.offsets.itemsize * len(self.offsets)
+
+
+class InternTable:
+    """Maps repeated strings (organizations, levels, skills) to dense integer ids."""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def intern(self, value: str) -> int:
+        i = self.ids.get(value)
+        if i is None:
+            i = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return i
+
+    def __getitem__(self, i: int) -> str:
+        return self.values[i]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def nbytes(self) -> int:
+        return (sys.getsizeof(self.ids) + sys.getsizeof(self.values)
+                + sum(sys.getsizeof(v) for v in self.values))
+
+
+class PostingTable:
+    """Read-only ``key -> ids`` mapping over flat arrays, as stored in a catalog snapshot.
+
+    Keys are a StringTable sorted by UTF-8 bytes and found by binary search;
+    key i's ids are ``ids[offsets[i]:offsets[i + 1]]``, returned as a
+    memoryview slice, so lookups copy nothing. ``extra`` columns hold
+    ``width`` values per id (BM25 term counts); with extras a value is a
+    tuple of slices, the shape BM25Index.postings uses.
+    """
+
+    def __init__(self, keys: StringTable, offsets: memoryview, ids: memoryview, extra=()):
+        self.key_table = keys
+        self.offsets = offsets
+        self.ids = ids
+        self.extra = tuple(extra)
+        self._keys: Optional[List[str]] = None
+
+    def _find(self, key: str) -> int:
+        target = key.encode('utf-8')
+        data, offsets = self.key_table.data, self.key_table.offsets
+        lo, hi = 0, len(self.key_table)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if bytes(data[offsets[mid]:offsets[mid + 1]]) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self.key_table) and bytes(data[offsets[lo]:offsets[lo + 1]]) == target:
+            return lo
+        return -1
+
+    def _value(self, i: int):
+        start, end = self.offsets[i], self.offsets[i + 1]
+        ids = self.ids[start:end]
+        if not self.extra:
+            return ids
+        return (ids,) + tuple(column[start * width:end * width] for column, width in self.extra)
+
+    def get(self, key: str, default=None):
+        i = self._find(key)
+        return self._value(i) if i >= 0 else default
+
+    def __getitem__(self, key: str):
+        i = self._find(key)
+        if i < 0:
+            raise KeyError(key)
+        return self._value(i)
+
+    def __contains__(self, key: str) -> bool:
+        return self._find(key) >= 0
+
+    def __len__(self) -> int:
+        return len(self.key_table)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def keys(self) -> List[str]:
+        """Every key, decoded on first use (substring scans walk them all)."""
+        if self._keys is None:
+            self._keys = [self.key_table[i] for i in range(len(self.key_table))]
+        return self._keys
+
+    def items(self):
+        for i, key in enumerate(self.keys()):
+            yield key, self._value(i)
+
+    def values(self):
+        for i in range(len(self)):
+            yield self._value(i)
+
+    @property
+    def total(self) -> int:
+        """Ids across all keys."""
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        return (self.key_table.nbytes + self.offsets.nbytes + self.ids.nbytes
+                + sum(column.nbytes for column, _ in self.extra))
+
+
+# Monotonic stamps for catalog / domain-map contents; caches derived from them
+# compare stamps instead of hashing the data.
+_DATA_VERSIONS = itertools.count(1)
+
+
+class CourseCatalog:
+    """Array-backed course store.
+
+    Numeric fields live in typed arrays, free text in string tables and
+    repeated labels/skills as interned ids, so a row costs a few dozen bytes of
+    columns instead of a dict. ``course(cid)`` materializes the dict shape the
+    templates expect. ``from_snapshot()`` gives a read-only catalog whose
+    columns are views into a mapped CatalogSnapshot.
+    """
+
+    TEXT_COLUMNS = ('titles', 'urls', 'descriptions')
+    NUMERIC_COLUMNS = ('platform', 'instructor', 'level', 'course_type', 'duration', 'rating', 'price',
+                       'students', 'review_count', 'skill_offsets', 'skill_ids')
+
+    def __init__(self):
+        self.titles = StringTable()
+        self.urls = StringTable()
+        self.descriptions = StringTable()
+        # platform, instructor, level, type and duration labels share one table; id 0 is ''
+        self.labels = InternTable()
+        self.labels.intern('')
+        self.skills = InternTable()
+        self.platform = array('I')
+        self.instructor = array('I')
+        self.level = array('I')
+        self.course_type = array('I')
+        self.duration = array('I')
+        self.rating = array('H')        # rating * 100
+        self.price = array('I')
+        self.students = array('I')
+        self.review_count = array('I')
+        self.skill_offsets = array('I', [0])
+        self.skill_ids = array('I')
+        self.load_seconds = 0.0
+        self.snapshot: Optional['CatalogSnapshot'] = None
+        self.version = next(_DATA_VERSIONS)
+
+    @classmethod
+    def from_snapshot(cls, snapshot: 'CatalogSnapshot') -> 'CourseCatalog':
+        started = time.perf_counter()
+        catalog = cls()
+        for name in cls.TEXT_COLUMNS:
+            setattr(catalog, name, snapshot.strings(name))
+        for name in ('labels', 'skills'):
+            # a few hundred distinct values, decoded into a private InternTable
+            table, values = InternTable(), snapshot.strings(name)
+            for i in range(len(values)):
+                table.intern(values[i])
+            setattr(catalog, name, table)
+        for name in cls.NUMERIC_COLUMNS:
+            setattr(catalog, name, snapshot.column(name))
+        catalog.snapshot = snapshot
+        catalog.load_seconds = time.perf_counter() - started
+        return catalog
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def add(self, *, title: str, platform: str = '', instructor: str = '', price: int = 0,
+            rating: float = 0.0, duration: str = '', students: int = 0, skills: List[str] = (),
+            url: str = '', level: str = '', course_type: str = '', description: str = '',
+            review_count: int = 0) -> int:
+        if self.snapshot is not None:
+            raise ValueError("A snapshot-mapped catalog is read-only")
+        cid = len(self)
+        self.titles.append(title)
+        self.urls.append(url)
+        self.descriptions.append(description)
+        self.platform.append(self.labels.intern(platform))
+        self.instructor.append(self.labels.intern(instructor))
+        self.level.append(self.labels.intern(level))
+        self.course_type.append(self.labels.intern(course_type))
+        self.duration.append(self.labels.intern(duration))
+        self.rating.append(int(round(float(rating or 0) * 100)))
+        self.price.append(int(price or 0))
+        self.students.append(students)
+        self.review_count.append(review_count)
+        for skill in skills:
+            skill = (skill or '').strip().lower()
+            if skill:
+                self.skill_ids.append(self.skills.intern(skill))
+        self.skill_offsets.append(len(self.skill_ids))
+        self.version = next(_DATA_VERSIONS)
+        return cid
+
+    def add_course(self, course: Dict[str, Any]) -> int:
+        """Add a course given in the COURSES_DATABASE dict shape."""
+        return self.add(
+            title=course.get('title') or course.get('name') or '',
+            platform=course.get('platform', ''),
+            instructor=course.get('instructor', ''),
+            price=course.get('price', 0),
+            rating=course.get('rating', 0),
+            duration=course.get('duration', ''),
+            students=_parse_count(course.get('students')),
+            skills=course.get('skills', []),
+            url=course.get('url', ''),
+            level=course.get('level', ''),
+        )
+
+    def skill_names(self, cid: int) -> List[str]:
+        values = self.skills.values
+        return [values[sid] for sid in self.skill_ids[self.skill_offsets[cid]:self.skill_offsets[cid + 1]]]
+
+    def rating_of(self, cid: int) -> float:
+        return self.rating[cid] / 100
+
+    def course(self, cid: int) -> Dict[str, Any]:
+        """Materialize one row as a course dict."""
+        labels = self.labels.values
+        c = {
+            'platform': labels[self.platform[cid]],
+            'title': self.titles[cid],
+            'instructor': labels[self.instructor[cid]],
+            'price': self.price[cid],
+            'rating': self.rating_of(cid),
+            'duration': labels[self.duration[cid]],
+            'skills': self.skill_names(cid),
+            'url': self.urls[cid],
+        }
+        if self.students[cid]:
+            c['students'] = _count_label(self.students[cid])
+        if self.level[cid]:
+            c['level'] = labels[self.level[cid]]
+        if self.course_type[cid]:
+            c['type'] = labels[self.course_type[cid]]
+            c['certificate'] = 'certificate' in c['type'].lower()
+        if self.review_count[cid]:
+            c['review_count'] = self.review_count[cid]
+        description = self.descriptions[cid]
+        if description:
+            c['description'] = description
+        return c
+
+    def courses(self, ids) -> List[Dict[str, Any]]:
+        return [self.course(cid) for cid in ids]
+
+    def memory_report(self) -> Dict[str, Any]:
+        """Bytes held per column, for sizing against the per-dict representation."""
+        columns = {
+            'titles': self.titles.nbytes,
+            'urls': self.urls.nbytes,
+            'descriptions': self.descriptions.nbytes,
+            'labels': self.labels.nbytes,
+            'skill_vocabulary': self.skills.nbytes,
+            'skill_ids': self.skill_ids.itemsize * len(self.skill_ids)
+                         + self.skill_offsets.itemsize * len(self.skill_offsets),
+        }
+        for name in ('platform', 'instructor', 'level', 'course_type', 'duration',
+                     'rating', 'price', 'students', 'review_count'):
+            col = getattr(self, name)
+            columns[name] = col.itemsize * len(col)
+        total = sum(columns.values())
+        return {
+            'rows': len(self),
+            'mapped': self.snapshot is not None,
+            'distinct_skills': len(self.skills),
+            'load_seconds': round(self.load_seconds, 4),
+            'total_bytes': total,
+            'bytes_per_row': round(total / len(self), 1) if len(self) else 0,
+            'columns': columns,
+        }
+
+
+def load_coursera_rows(catalog: CourseCatalog, lines) -> int:
+    """Stream Coursera export lines into ``catalog``; returns rows added.
+
+    ``csv.reader`` handles the quoted multi-line descriptions, so only one row
+    is ever held in memory.
+    """
+    added = 0
+    reader = csv.reader(lines)
+    header = next(reader, None) or []
+    col = {name.strip(): i for i, name in enumerate(header)}
+
+    def field(row, name):
+        i = col.get(name)
+        return row[i].strip() if i is not None and i < len(row) else ''
+
+    for row in reader:
+        title = field(row, 'Title')
+        if not title:
+            continue
+        try:
+            rating = float(field(row, 'Ratings') or 0)
+        except ValueError:
+            rating = 0.0
+        catalog.add(
+            title=title,
+            platform='coursera',
+            instructor=field(row, 'Organization'),
+            rating=rating,
+            duration=field(row, 'Duration'),
+            students=_parse_count(field(row, 'course_students_enrolled')),
+            skills=field(row, 'Skills').split(','),
+            url=field(row, 'course_url'),
+            level=field(row, 'Difficulty'),
+            course_type=field(row, 'Type'),
+            description=field(row, 'course_description'),
+            review_count=_parse_count(field(row, 'Review Count')),
+        )
+        added += 1
+    return added
+
+def load_coursera_csv(catalog: CourseCatalog, path: Path) -> int:
+    """Load the Coursera CSV export from disk into ``catalog``."""
+    with open(path, newline='', encoding='utf-8') as f:
+        return load_coursera_rows(catalog, f)
+
+
+def build_course_catalog() -> CourseCatalog:
+    """Curated COURSES_DATABASE first, then the Coursera export when enabled."""
+    started = time.perf_counter()
+    catalog = CourseCatalog()
+    for course in COURSES_DATABASE:
+        catalog.add_course(course)
+    if config.LOAD_COURSERA_CATALOG:
+        csv_path = Path(config.COURSERA_CATALOG_CSV)
+        if csv_path.exists():
+            try:
+                added = load_coursera_csv(catalog, csv_path)
+                logger.info(f"Loaded {added} Coursera courses from {csv_path}")
+            except Exception as e:
+                logger.error(f"Failed to load Coursera catalog: {e}")
+        else:
+            logger.warning(f"Coursera catalog not found: {csv_path}")
+    catalog.load_seconds = time.perf_counter() - started
+    report = catalog.memory_report()
+    logger.info(f"Course catalog ready: {report['rows']} courses, {report['total_bytes']} bytes "
+                f"in {report['load_seconds']}s")
+    return catalog
+
+# ============================================================================
+# COURSE CATALOG INDEX
+# ============================================================================
+
+_WORD_RE = re.compile(r'\w+')
+
+class CourseIndex:
+    """Inverted index over the course catalog, built once at startup.
+
+    Course ids are catalog row numbers. Every lookup returns ids in catalog
+    order so callers see exactly what the old linear scans produced. Rows
+    appended with CourseCatalog.add() are indexed on the next lookup (their
+    skills are canonicalized against the existing SkillCanonicalizer;
+    reload_data() rebuilds both). For a snapshot-mapped catalog the skill
+    and title postings are PostingTables over the snapshot; only the
+    canonical lists, which depend on the canonicalizer, are derived at
+    startup.
+    """
+
+    MEMO_SIZE = 1024
+
+    def __init__(self, catalog: CourseCatalog, canonicalizer: 'SkillCanonicalizer'):
+        self.catalog = catalog
+        self.canon = canonicalizer
+        self.indexed = 0
+        self._memo: Dict[tuple, List[int]] = {}
+        # skill as written -> course ids (substring search), canonical skill id -> course ids
+        # (exact filters), title token -> course ids
+        if catalog.snapshot is not None:
+            self.skill_postings = catalog.snapshot.postings('index.skills')
+            self.title_postings = catalog.snapshot.postings('index.titles')
+            by_sid: Dict[int, list] = {}
+            for skill, ids in self.skill_postings.items():
+                sid = canonicalizer.canonical_id(skill)
+                if sid is not None:
+                    by_sid.setdefault(sid, []).append(ids)
+            self.canonical_postings = {sid: self._union(parts) for sid, parts in by_sid.items()}
+            self.indexed = len(catalog)  # a mapped catalog is read-only
+            return
+        self.skill_postings: Dict[str, List[int]] = {}
+        self.canonical_postings: Dict[int, List[int]] = {}
+        self.title_postings: Dict[str, List[int]] = {}
+        self.sync()
+
+    def sync(self) -> None:
+        """Index catalog rows added since the last call; new ids are larger, so postings stay sorted."""
+        catalog = self.catalog
+        if self.indexed == len(catalog):
+            return
+        for cid in range(self.indexed, len(catalog)):
+            names = set(catalog.skill_names(cid))
+            for skill in names:
+                self.skill_postings.setdefault(skill, []).append(cid)
+            for sid in {self.canon.canonical_id(skill) for skill in names} - {None}:
+                self.canonical_postings.setdefault(sid, []).append(cid)
+            for token in set(_WORD_RE.findall(catalog.titles[cid].lower())):
+                self.title_postings.setdefault(token, []).append(cid)
+        self.indexed = len(catalog)
+        self._memo.clear()
+
+    @property
+    def all_ids(self) -> range:
+        self.sync()
+        return range(self.indexed)
+
+    def _memoized(self, key: tuple, compute) -> List[int]:
+        ids = self._memo.get(key)
+        if ids is None:
+            ids = compute()
+            if len(self._memo) >= self.MEMO_SIZE:
+                self._memo.clear()
+            self._memo[key] = ids
+        return ids
+
+    def _union(self, postings: List[List[int]]) -> List[int]:
+        if not postings:
+            return []
+        if len(postings) == 1:
+            return postings[0]
+        merged = set()
+        for ids in postings:
+            merged.update(ids)
+        return sorted(merged)
+
+    def _canonical_ids(self, skill: str) -> List[int]:
+        sid = self.canon.canonical_id(skill)
+        return self.canonical_postings.get(sid, []) if sid is not None else []
+
+    def ids_with_any_skill(self, skills) -> List[int]:
+        """Courses sharing at least one skill, compared in canonical form."""
+        self.sync()
+        sids = {self.canon.canonical_id(x) for x in skills} - {None}
+        return self._union([self.canonical_postings[sid] for sid in sids if sid in self.canonical_postings])
+
+    def related_skill_keys(self, skill: str) -> List[str]:
+        """Skills as written that contain, or are contained in, ``skill``."""
+        self.sync()
+        s = skill.strip().lower()
+        return self._memoized(('related_keys', s), lambda: [ks for ks in self.skill_postings if s in ks or ks in s])
+
+    def ids_related_to_skill(self, skill: str) -> List[int]:
+        """Courses with the same canonical skill, or a skill containing/contained in ``skill``."""
+        self.sync()
+        s = skill.strip().lower()
+        return self._memoized(('related', s), lambda: self._union(
+            [ids for ks, ids in self.skill_postings.items() if s in ks or ks in s]
+            + [self._canonical_ids(s)]))
+
+    def ids_matching_text(self, query: str) -> List[int]:
+        """Courses where ``query`` is a substring of a skill or the title, or names the same skill."""
+        self.sync()
+        q = query.strip().lower()
+        if not q:
+            return self.all_ids
+        return self._memoized(('text', q), lambda: self._union(
+            [ids for ks, ids in self.skill_postings.items() if q in ks]
+            + [self._title_ids(q), self._canonical_ids(q)]))
+
+    def _title_ids(self, q: str) -> List[int]:
+        tokens = _WORD_RE.findall(q)
+        if not tokens:
+            candidates = self.all_ids
+        else:
+            # any title containing q contains q's longest word inside one of its tokens
+            longest = max(tokens, key=len)
+            candidates = self._union([ids for tok, ids in self.title_postings.items()
+                                      if longest in tok])
+        titles = self.catalog.titles
+        return [cid for cid in candidates if q in titles[cid].lower()]
+
+
+def score_ranking(rating_weight: float = 20.0, price_divisor: float = 100.0):
+    """Ranking by ``rating * rating_weight - price / price_divisor``, best first (the skill course order)."""
+    def keys(catalog: CourseCatalog) -> List[np.ndarray]:
+        rating = np.array(catalog.rating, dtype=np.float64) / 100
+        return [-(rating * rating_weight - np.array(catalog.price, dtype=np.float64) / price_divisor)]
+    return keys
+
+
+def rating_then_price(catalog: CourseCatalog) -> List[np.ndarray]:
+    """Ranking by rating desc, then price asc (the domain page order)."""
+    return [-np.array(catalog.rating, dtype=np.int64), np.array(catalog.price, dtype=np.int64)]
+
+
+class RankedCourses:
+    """Per-skill and per-domain course lists in one ranking order, for heap-merged top-k.
+
+    A ranking is a callable returning ascending sort keys (primary first) over
+    the catalog columns; ties fall back to course id, matching the stable
+    sorts this replaces. The global order and each course's rank in it are
+    computed once per (catalog version, ranking); a skill's or domain's list
+    is its course ranks, sorted, built the first time it is asked for. Top-k
+    is then a heapq.merge over a few sorted lists that stops after k ids.
+    set_ranking() only drops the lists; they rebuild lazily, and ``version``
+    moves so caches keyed on data_version() refresh too.
+    """
+
+    def __init__(self, catalog: CourseCatalog, index: CourseIndex, ranking):
+        self.catalog = catalog
+        self.index = index
+        self.ranking = ranking
+        self.version = next(_DATA_VERSIONS)
+        self._stamp = None
+        self._lists: Dict[tuple, np.ndarray] = {}
+        self.rebuilds = 0
+
+    def set_ranking(self, ranking) -> None:
+        self.ranking = ranking
+        self.version = next(_DATA_VERSIONS)
+
+    def _refresh(self) -> None:
+        self.index.sync()
+        stamp = (self.catalog.version, self.version)
+        if stamp != self._stamp:
+            keys = self.ranking(self.catalog)
+            ids = np.arange(len(self.catalog), dtype=np.int64)
+            self.order = np.lexsort([ids] + keys[::-1])
+            self.rank = np.empty(len(ids), dtype=np.int64)
+            self.rank[self.order] = ids
+            self._lists = {}
+            self._stamp = stamp
+            self.rebuilds += 1
+
+    def _ranked(self, key: tuple, ids) -> np.ndarray:
+        ranks = self._lists.get(key)
+        if ranks is None:
+            ranks = self._lists[key] = np.sort(self.rank[np.asarray(ids, dtype=np.int64)])
+        return ranks
+
+    def _top(self, lists: List[np.ndarray], k: int) -> List[int]:
+        if len(lists) == 1:
+            return self.order[lists[0][:k]].tolist()
+        top, last = [], -1
+        for r in heapq.merge(*lists):  # lazy: only the first k distinct ranks are read
+            if r != last:
+                top.append(r)
+                last = r
+                if len(top) == k:
+                    break
+        return self.order[top].tolist() if top else []
+
+    def for_skill(self, skill: str, k: int) -> List[int]:
+        """Best ``k`` courses with the same canonical skill or a skill containing/contained in ``skill``."""
+        self._refresh()
+        s = skill.strip().lower()
+        postings = self.index.skill_postings
+        lists = [self._ranked(('skill', ks), postings[ks]) for ks in self.index.related_skill_keys(s)]
+        sid = self.index.canon.canonical_id(s)
+        if sid in self.index.canonical_postings:
+            lists.append(self._ranked(('canonical', sid), self.index.canonical_postings[sid]))
+        return self._top(lists, k) if lists else []
+
+    def for_skills(self, skills, k: int) -> List[int]:
+        """Best ``k`` courses sharing any of ``skills`` (canonical match), from one precomputed list per skill set."""
+        self._refresh()
+        sids = tuple(sorted({self.index.canon.canonical_id(x) for x in skills} - {None}))
+        ranks = self._lists.get(('skills', sids))
+        if ranks is None:
+            postings = self.index.canonical_postings
+            parts = [self._ranked(('canonical', sid), postings[sid]) for sid in sids if sid in postings]
+            ranks = self._lists[('skills', sids)] = (np.unique(np.concatenate(parts)) if parts
+                                                     else np.empty(0, dtype=np.int64))
+        return self.order[ranks[:k]].tolist()
+
+    def stats(self) -> Dict[str, Any]:
+        return {'lists': len(self._lists), 'rebuilds': self.rebuilds}
+
+
+def top_courses_for_skill(skill_name: str, top_n: int = 3) -> List[Dict[str, Any]]:
+    """Best-scored courses teaching ``skill_name`` (rating-weighted, cheaper first)."""
+    return [{
+        'title': CATALOG.titles[cid],
+        'platform': CATALOG.labels[CATALOG.platform[cid]],
+        'price': CATALOG.price[cid],
+        'rating': CATALOG.rating_of(cid),
+        'url': CATALOG.urls[cid] or '#'
+    } for cid in SKILL_RANKING.for_skill(skill_name, top_n)]
+
+
+class CourseSearch:
+    """Filtered, sorted, cursor-paginated course listing over one catalog.
+
+    Each sort key gets a precomputed order (ids by key, ties by id) and its
+    inverse rank array, built on first use and again when the catalog
+    version moves. A cursor is the rank of the last course served, so the
+    next page resumes from that point in the order instead of re-sorting the
+    matches. Large match sets are walked in growing chunks until the page is
+    full; small candidate lists are ranked directly. Either way no course
+    dict is built for anything outside the page.
+    """
+
+    SORTS = ('id', 'rating', 'price', '-price', 'students', 'title', 'relevance')
+    CHUNK = 256
+
+    def __init__(self, catalog: CourseCatalog):
+        self.catalog = catalog
+        self._version = None
+        self._cols: Dict[str, np.ndarray] = {}
+        self._orders: Dict[str, tuple] = {}
+        self._labels: Dict[str, List[int]] = {}
+
+    def _columns(self) -> Dict[str, np.ndarray]:
+        c = self.catalog
+        if self._version != c.version:
+            # copies, not frombuffer views: a live view would stop the arrays from growing
+            self._cols = {name: np.array(getattr(c, name), dtype=np.int64)
+                          for name in ('rating', 'price', 'students', 'platform', 'level')}
+            self._orders = {}
+            self._labels = {}
+            for i, value in enumerate(c.labels.values):
+                self._labels.setdefault(value.lower(), []).append(i)
+            self._version = c.version
+        return self._cols
+
+    def order(self, sort: str) -> tuple:
+        """(ids in ``sort`` order, rank of each id in that order)."""
+        cols = self._columns()
+        entry = self._orders.get(sort)
+        if entry is None:
+            n = len(self.catalog)
+            ids = np.arange(n, dtype=np.int64)
+            if sort == 'id':
+                order = ids
+            elif sort == 'title':
+                titles = self.catalog.titles
+                order = np.array(sorted(range(n), key=lambda i: titles[i].lower()), dtype=np.int64)
+            else:
+                key = {'rating': -cols['rating'], 'price': cols['price'], '-price': -cols['price'],
+                       'students': -cols['students']}[sort]
+                order = np.lexsort((ids, key))
+            rank = np.empty(n, dtype=np.int64)
+            rank[order] = ids
+            entry = self._orders[sort] = (order, rank)
+        return entry
+
+    def _predicate(self, ids: np.ndarray, platform: Optional[str], level: Optional[str],
+                   min_rating: Optional[float], max_price: Optional[int]) -> Optional[np.ndarray]:
+        """Column filters over ``ids`` as a boolean array, or None when there are none."""
+        cols = self._columns()
+        keep = None
+        for column, label in (('platform', platform), ('level', level)):
+            if label:
+                hit = np.isin(cols[column][ids], self._labels.get(label.strip().lower(), []))
+                keep = hit if keep is None else keep & hit
+        if min_rating is not None:
+            hit = cols['rating'][ids] >= int(round(min_rating * 100))
+            keep = hit if keep is None else keep & hit
+        if max_price is not None:
+            hit = cols['price'][ids] <= max_price
+            keep = hit if keep is None else keep & hit
+        return keep
+
+    def encode_cursor(self, sort: str, rank: int) -> str:
+        raw = f"{sort}:{self._version}:{rank}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, cursor: str, sort: str) -> int:
+        """Rank to resume after; ValueError if the cursor is malformed, for another sort, or stale."""
+        try:
+            c_sort, c_version, c_rank = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode().split(':')
+            rank = int(c_rank)
+        except Exception:
+            raise ValueError("Invalid cursor")
+        self._columns()
+        if c_sort != sort:
+            raise ValueError("Cursor belongs to a different sort order")
+        if c_version != str(self._version):
+            raise ValueError("Cursor expired: the catalog changed, start again from the first page")
+        return rank
+
+    def page(self, candidates: Optional[List[int]] = None, sort: str = 'id', limit: int = 50,
+             cursor: Optional[str] = None, platform: Optional[str] = None, level: Optional[str] = None,
+             min_rating: Optional[float] = None, max_price: Optional[int] = None) -> tuple:
+        """(course ids for one page, total matches, next cursor or None).
+
+        ``candidates`` narrows the search (ids from COURSE_INDEX); None searches
+        the whole catalog. With sort='relevance' the candidates are already
+        ranked (COURSE_TEXT results) and the cursor is a position in them.
+        Raises ValueError for an unknown sort or bad cursor.
+        """
+        if sort not in self.SORTS:
+            raise ValueError(f"sort must be one of: {', '.join(self.SORTS)}")
+        after = self.decode_cursor(cursor, sort) if cursor else -1
+        filters = (platform, level, min_rating, max_price)
+
+        if sort == 'relevance':
+            if candidates is None:
+                raise ValueError("sort=relevance needs a text query")
+            ranked = np.asarray(candidates, dtype=np.int64)
+            keep = self._predicate(ranked, *filters)
+            if keep is not None:
+                ranked = ranked[keep]
+            hits = ranked[after + 1:after + limit + 2].tolist()
+            more = len(hits) > limit
+            return hits[:limit], len(ranked), self.encode_cursor(sort, after + limit) if more else None
+
+        order, rank = self.order(sort)
+        n = len(order)
+        if candidates is not None and len(candidates) * 8 < n:
+            # few candidates: filter and rank just those
+            cand = np.asarray(candidates, dtype=np.int64)
+            keep = self._predicate(cand, *filters)
+            if keep is not None:
+                cand = cand[keep]
+            ranks = np.sort(rank[cand])
+            total = len(ranks)
+            start = int(np.searchsorted(ranks, after, side='right'))
+            window = ranks[start:start + limit + 1]
+            hits = order[window].tolist()
+        else:
+            mask = None
+            if candidates is not None:
+                mask = np.zeros(n, dtype=bool)
+                mask[np.asarray(candidates, dtype=np.int64)] = True
+            keep = self._predicate(np.arange(n), *filters)
+            if keep is not None:
+                mask = keep if mask is None else mask & keep
+            total = n if mask is None else int(np.count_nonzero(mask))
+            hits = []
+            pos, step = after + 1, self.CHUNK
+            while pos < n and len(hits) <= limit:
+                chunk = order[pos:pos + step]
+                if mask is not None:
+                    chunk = chunk[mask[chunk]]
+                hits.extend(chunk[:limit + 1 - len(hits)].tolist())
+                pos += step
+                step *= 2  # sparse filters: widen the window instead of crawling
+
+        more = len(hits) > limit
+        hits = hits[:limit]
+        next_cursor = self.encode_cursor(sort, int(rank[hits[-1]])) if more else None
+        return hits, total, next_cursor
+
+
+# ============================================================================
+# FULL-TEXT SEARCH (BM25)
+# ============================================================================
+
+_STOPWORDS = frozenset('a an and are as at be by for from how in into is it its of on or that the this '
+                       'to what with you your'.split())
+
+
+def text_terms(text: str) -> List[str]:
+    return [t for t in _WORD_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+class BM25Index:
+    """BM25F ranking over a few weighted text fields, with in-place add/remove.
+
+    Each term's postings are an array('I') of doc ids kept in id order plus an
+    interleaved array('B') of per-field term counts (capped at 255), so a
+    posting costs 4 + len(fields) bytes. Field lengths are per-doc
+    array('H') columns. Per-field length norms are recomputed lazily on the
+    first search after a mutation; scoring is vectorized per query term.
+    remove() needs the same fields that were indexed, which keeps the index
+    free of a forward (doc -> terms) table. attach() serves an index from
+    read-only snapshot views (a PostingTable plus mapped columns); the first
+    add() or remove() after that copies it into private arrays.
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, field_weights: Dict[str, float]):
+        self.fields = tuple(field_weights)
+        self.weights = np.array([field_weights[f] for f in self.fields], dtype=np.float64)
+        self.postings: Dict[str, tuple] = {}
+        self.lengths = [array('H') for _ in self.fields]
+        self.live = bytearray()
+        self.total_length = [0] * len(self.fields)
+        self.docs = 0
+        self._mutations = 0
+        self._norms = None  # (mutation count, (size, n_fields) array)
+
+    def __len__(self) -> int:
+        return self.docs
+
+    def __contains__(self, doc_id: int) -> bool:
+        return doc_id < len(self.live) and self.live[doc_id] == 1
+
+    def attach(self, postings: PostingTable, lengths: List[memoryview], live: memoryview) -> None:
+        """Replace the contents with an index stored by write_catalog_snapshot()."""
+        self.postings, self.lengths, self.live = postings, lengths, live
+        self.total_length = [int(np.asarray(column).sum(dtype=np.int64)) for column in lengths]
+        self.docs = int(np.count_nonzero(np.asarray(live)))
+        self._mutations += 1
+
+    def _thaw(self) -> None:
+        if isinstance(self.postings, dict):
+            return
+        self.postings = {term: (array('I', docs.tobytes()), array('B', tfs.tobytes()))
+                         for term, (docs, tfs) in self.postings.items()}
+        self.lengths = [array('H', column.tobytes()) for column in self.lengths]
+        self.live = bytearray(self.live)
+
+    def _field_counts(self, fields: Dict[str, str]) -> tuple:
+        counts: Dict[str, List[int]] = {}
+        lengths = []
+        width = len(self.fields)
+        for i, name in enumerate(self.fields):
+            terms = text_terms(fields.get(name) or '')
+            lengths.append(min(len(terms), 0xFFFF))
+            for term, n in Counter(terms).items():
+                tf = counts.get(term)
+                if tf is None:
+                    tf = counts[term] = [0] * width
+                tf[i] = min(n, 255)
+        return counts, lengths
+
+    def add(self, doc_id: int, fields: Dict[str, str]) -> None:
+        """Index ``fields`` under ``doc_id``, which must not be indexed already."""
+        if doc_id in self:
+            raise ValueError(f"document {doc_id} is already indexed")
+        self._thaw()
+        counts, lengths = self._field_counts(fields)
+        width = len(self.fields)
+        for term, tf in counts.items():
+            entry = self.postings.get(term)
+            if entry is None:
+                entry = self.postings[term] = (array('I'), array('B'))
+            docs, tfs = entry
+            if not docs or docs[-1] < doc_id:
+                docs.append(doc_id)
+                tfs.extend(tf)
+            else:
+                i = bisect.bisect_left(docs, doc_id)
+                docs.insert(i, doc_id)
+                tfs[i * width:i * width] = array('B', tf)
+        while len(self.live) <= doc_id:
+            self.live.append(0)
+            for column in self.lengths:
+                column.append(0)
+        for column, length, i in zip(self.lengths, lengths, range(width)):
+            column[doc_id] = length
+            self.total_length[i] += length
+        self.live[doc_id] = 1
+        self.docs += 1
+        self._mutations += 1
+
+    def remove(self, doc_id: int, fields: Dict[str, str]) -> None:
+        """Drop ``doc_id``; ``fields`` must be what it was added with."""
+        if doc_id not in self:
+            raise KeyError(doc_id)
+        self._thaw()
+        counts, _ = self._field_counts(fields)
+        width = len(self.fields)
+        for term in counts:
+            docs, tfs = self.postings[term]
+            i = bisect.bisect_left(docs, doc_id)
+            del docs[i]
+            del tfs[i * width:(i + 1) * width]
+            if not docs:
+                del self.postings[term]
+        for i, column in enumerate(self.lengths):
+            self.total_length[i] -= column[doc_id]
+            column[doc_id] = 0
+        self.live[doc_id] = 0
+        self.docs -= 1
+        self._mutations += 1
+
+    def _length_norms(self) -> np.ndarray:
+        if self._norms is None or self._norms[0] != self._mutations:
+            lengths = np.array([np.array(column, dtype=np.float64) for column in self.lengths]).T
+            avg = np.array([total / self.docs if self.docs and total else 1.0 for total in self.total_length])
+            self._norms = (self._mutations, (1 - self.B) + self.B * lengths / avg)
+        return self._norms[1]
+
+    def search(self, query: str, k: Optional[int] = 10) -> List[tuple]:
+        """(doc_id, score) pairs, best first (ties by doc id); ``k=None`` returns every match."""
+        terms = set(text_terms(query))
+        if not terms or not self.docs:
+            return []
+        norms = self._length_norms()
+        width = len(self.fields)
+        doc_parts, score_parts = [], []
+        for term in terms:
+            entry = self.postings.get(term)
+            if entry is None:
+                continue
+            docs = np.array(entry[0], dtype=np.int64)
+            tf = np.array(entry[1], dtype=np.float64).reshape(-1, width)
+            weighted = (tf / norms[docs]) @ self.weights
+            idf = np.log(1 + (self.docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            doc_parts.append(docs)
+            score_parts.append(idf * weighted * (self.K1 + 1) / (self.K1 + weighted))
+        if not doc_parts:
+            return []
+        if len(doc_parts) == 1:
+            ids, scores = doc_parts[0], score_parts[0]
+        else:
+            ids, inverse = np.unique(np.concatenate(doc_parts), return_inverse=True)
+            scores = np.bincount(inverse, weights=np.concatenate(score_parts))
+        if k is not None and len(ids) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            ids, scores = ids[top], scores[top]
+        best = np.lexsort((ids, -scores))
+        return list(zip(ids[best].tolist(), scores[best].tolist()))
+
+    @property
+    def nbytes(self) -> int:
+        if isinstance(self.postings, PostingTable):  # mapped, shared with every process using the snapshot
+            return self.postings.nbytes + self.live.nbytes + sum(column.nbytes for column in self.lengths)
+        return (sys.getsizeof(self.postings) + sys.getsizeof(self.live)
+                + sum(sys.getsizeof(term) + sys.getsizeof(docs) + sys.getsizeof(tfs)
+                      for term, (docs, tfs) in self.postings.items())
+                + sum(sys.getsizeof(column) for column in self.lengths))
+
+    def stats(self) -> Dict[str, Any]:
+        mapped = isinstance(self.postings, PostingTable)
+        postings = self.postings.total if mapped else sum(len(docs) for docs, _ in self.postings.values())
+        return {'docs': self.docs, 'terms': len(self.postings), 'postings': postings, 'bytes': self.nbytes,
+                'mapped': mapped}
+
+
+# title matches count most, then the skills list, then who teaches it, then the blurb
+COURSE_TEXT_WEIGHTS = {'title': 3.0, 'skills': 2.0, 'organization': 1.5, 'description': 1.0}
+
+
+def course_text_fields(catalog: CourseCatalog, cid: int) -> Dict[str, str]:
+    return {
+        'title': catalog.titles[cid],
+        'skills': ', '.join(catalog.skill_names(cid)),
+        'organization': catalog.labels.values[catalog.instructor[cid]],
+        'description': catalog.descriptions[cid],
+    }
+
+
+class CourseTextIndex(BM25Index):
+    """BM25Index over a catalog; rows appended to the catalog are indexed on the next search.
+
+    A snapshot-mapped catalog brings its text index along, so nothing is built.
+    """
+
+    def __init__(self, catalog: CourseCatalog):
+        super().__init__(COURSE_TEXT_WEIGHTS)
+        self.catalog = catalog
+        self.indexed = 0
+        started = time.perf_counter()
+        snapshot = catalog.snapshot
+        if snapshot is not None:
+            self.attach(snapshot.postings('text', extra=(('tfs', len(self.fields)),)),
+                        [snapshot.column(f'text.length.{name}') for name in self.fields],
+                        snapshot.column('text.live'))
+            self.indexed = len(self.live)
+        self.sync()
+        self.build_seconds = time.perf_counter() - started
+
+    def sync(self) -> None:
+        for cid in range(self.indexed, len(self.catalog)):
+            self.add(cid, course_text_fields(self.catalog, cid))
+        self.indexed = len(self.catalog)
+
+    def remove_course(self, cid: int) -> None:
+        """Hide a course from text search (call before its catalog row changes)."""
+        self.remove(cid, course_text_fields(self.catalog, cid))
+
+    def search(self, query: str, k: Optional[int] = 10) -> List[tuple]:
+        self.sync()
+        return super().search(query, k)
+
+
+# ============================================================================
+# CATALOG SNAPSHOT (MMAP)
+# ============================================================================
+# tools/build_catalog_snapshot.py parses the catalog sources once and writes
+# the catalog columns, CourseIndex skill/title postings and the BM25 text index
+# as flat arrays. Every worker process then maps the file read-only: catalog
+# and indexes are views into the page cache, shared by all workers and ready
+# without parsing. The header carries a digest of the sources, so a stale
+# snapshot is ignored rather than served.
+#
+# Layout (little-endian):
+#   header | section table (name, typecode, offset, items) | sections, each 8-byte aligned
+# A string table is two sections, NAME.data (UTF-8 blob) and NAME.offsets (u64 x count+1);
+# a posting table is NAME.keys (a string table, sorted), NAME.offsets, NAME.ids and any extras.
+
+CATALOG_SNAPSHOT_MAGIC = b'CCCS'
+CATALOG_SNAPSHOT_VERSION = 1
+CATALOG_SNAPSHOT_HEADER = struct.Struct('<4sHHI16s4x')   # magic, version, sections, rows, source digest
+CATALOG_SNAPSHOT_SECTION = struct.Struct('<32sc7xQQ')    # name, array typecode, byte offset, items
+
+
+def catalog_source_fingerprint() -> bytes:
+    """Digest of everything a catalog snapshot is built from; a snapshot with another digest is stale."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((CATALOG_SNAPSHOT_VERSION, COURSES_DATABASE, COURSE_TEXT_WEIGHTS, sorted(_STOPWORDS),
+                        config.LOAD_COURSERA_CATALOG)).encode())
+    csv_path = Path(config.COURSERA_CATALOG_CSV)
+    if config.LOAD_COURSERA_CATALOG and csv_path.exists():
+        # size and content, not path or mtime: a copied or re-checked-out CSV keeps its snapshot
+        digest.update(f"{csv_path.stat().st_size}:".encode())
+        with open(csv_path, 'rb') as f:
+            for block in iter(functools.partial(f.read, 1 << 20), b''):
+                digest.update(block)
+    return digest.digest()
+
+
+def write_catalog_snapshot(path: Path, catalog: CourseCatalog, index: CourseIndex, text: BM25Index,
+                           fingerprint: bytes) -> int:
+    """Serialize a parsed catalog and its indexes; returns the file size in bytes."""
+    sections: List[tuple] = []  # (name, array)
+
+    def string_table(values) -> StringTable:
+        table = StringTable()
+        for value in values:
+            table.append(value)
+        return table
+
+    def strings(name: str, table: StringTable) -> None:
+        sections.append((f'{name}.data', array('B', table.data)))
+        sections.append((f'{name}.offsets', table.offsets))
+
+    def postings(name: str, mapping, with_tfs: bool = False) -> None:
+        keys = sorted(mapping, key=lambda k: k.encode('utf-8'))  # PostingTable binary-searches bytes
+        offsets, ids, tfs = array('Q', [0]), array('I'), array('B')
+        for key in keys:
+            value = mapping[key]
+            if with_tfs:
+                value, counts = value
+                tfs.extend(counts)
+            ids.extend(value)
+            offsets.append(len(ids))
+        strings(f'{name}.keys', string_table(keys))
+        sections.extend([(f'{name}.offsets', offsets), (f'{name}.ids', ids)])
+        if with_tfs:
+            sections.append((f'{name}.tfs', tfs))
+
+    for name in CourseCatalog.TEXT_COLUMNS:
+        strings(name, getattr(catalog, name))
+    strings('labels', string_table(catalog.labels.values))
+    strings('skills', string_table(catalog.skills.values))
+    for name in CourseCatalog.NUMERIC_COLUMNS:
+        sections.append((name, getattr(catalog, name)))
+    postings('index.skills', index.skill_postings)
+    postings('index.titles', index.title_postings)
+    postings('text', text.postings, with_tfs=True)
+    for name, column in zip(text.fields, text.lengths):
+        sections.append((f'text.length.{name}', column))
+    sections.append(('text.live', array('B', text.live)))
+
+    table = bytearray()
+    chunks = []
+    at = CATALOG_SNAPSHOT_HEADER.size + len(sections) * CATALOG_SNAPSHOT_SECTION.size
+    for name, values in sections:
+        if len(name) > 32:
+            raise ValueError(f"Section name too long for the snapshot table: {name}")
+        pad = -at % 8
+        chunks.append(b'\0' * pad)
+        at += pad
+        if sys.byteorder != 'little':
+            values = array(values.typecode, values)
+            values.byteswap()
+        table += CATALOG_SNAPSHOT_SECTION.pack(name.encode(), values.typecode.encode(), at, len(values))
+        chunks.append(values)
+        at += len(values) * values.itemsize
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(str(path) + '.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(CATALOG_SNAPSHOT_HEADER.pack(CATALOG_SNAPSHOT_MAGIC, CATALOG_SNAPSHOT_VERSION, len(sections),
+                                             len(catalog), fingerprint))
+        f.write(table)
+        for chunk in chunks:
+            f.write(chunk)
+    os.replace(tmp, path)  # a new inode: processes still mapping the old file keep their view
+    return at
+
+
+class CatalogSnapshot:
+    """Read-only, memory-mapped catalog snapshot; accessors return views, never copies."""
+
+    def __init__(self, path: Path):
+        if sys.byteorder != 'little':
+            raise ValueError("Catalog snapshots are little-endian")
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, n_sections, self.rows, self.fingerprint = CATALOG_SNAPSHOT_HEADER.unpack_from(self._mm, 0)
+        if magic != CATALOG_SNAPSHOT_MAGIC or version != CATALOG_SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported catalog snapshot: {magic!r} v{version}")
+        view = memoryview(self._mm)
+        self._sections: Dict[str, memoryview] = {}
+        for i in range(n_sections):
+            name, typecode, offset, count = CATALOG_SNAPSHOT_SECTION.unpack_from(
+                self._mm, CATALOG_SNAPSHOT_HEADER.size + i * CATALOG_SNAPSHOT_SECTION.size)
+            name, typecode = name.rstrip(b'\0').decode(), typecode.decode()
+            end = offset + count * struct.calcsize(typecode)
+            if end > len(self._mm):
+                raise ValueError(f"Catalog snapshot section {name} is truncated")
+            self._sections[name] = view[offset:end].cast(typecode)
+        self.size = len(self._mm)
+
+    def column(self, name: str) -> memoryview:
+        return self._sections[name]
+
+    def strings(self, name: str) -> StringTable:
+        return StringTable.mapped(self._sections[f'{name}.data'], self._sections[f'{name}.offsets'])
+
+    def postings(self, name: str, extra=()) -> PostingTable:
+        """PostingTable NAME; ``extra`` is (column suffix, values per id) pairs."""
+        return PostingTable(self.strings(f'{name}.keys'), self._sections[f'{name}.offsets'],
+                            self._sections[f'{name}.ids'],
+                            [(self._sections[f'{name}.{column}'], width) for column, width in extra])
+
+
+def open_catalog_snapshot(path: str) -> Optional[CatalogSnapshot]:
+    """Map the snapshot at ``path`` if it exists and matches the current sources, else None."""
+    if not path:
+        return None
+    path = Path(path)
+    if not path.exists():
+        logger.info(f"No catalog snapshot at {path}; parsing sources (tools/build_catalog_snapshot.py writes one)")
+        return None
+    try:
+        snapshot = CatalogSnapshot(path)
+    except Exception as e:
+        logger.error(f"Failed to map catalog snapshot {path}: {e}")
+        return None
+    if snapshot.fingerprint != catalog_source_fingerprint():
+        logger.warning(f"Catalog snapshot {path} is stale; parsing sources "
+                       f"(rebuild it with tools/build_catalog_snapshot.py)")
+        return None
+    logger.info(f"Catalog snapshot mapped: {snapshot.rows} courses, {snapshot.size} bytes from {path}")
+    return snapshot
+
+
+def load_course_catalog() -> CourseCatalog:
+    """The mapped snapshot when it is current, else the catalog parsed from its sources."""
+    snapshot = open_catalog_snapshot(config.CATALOG_SNAPSHOT)
+    return CourseCatalog.from_snapshot(snapshot) if snapshot is not None else build_course_catalog()
+
+
+# ============================================================================
+# CAREER DOMAINS DATABASE (9 DOMAINS)
+# ============================================================================
+
+CAREER_DOMAINS_MAP = {
+    'ai_engineering': {
+        'name': 'AI & Machine Learning Engineering',
+        'icon': '🤖',
+        'category': 'Technology',
+        'description': 'Build intelligent systems using deep learning and neural networks',
+        'skills': ['python', 'tensorflow', 'pytorch', 'deep learning', 'neural networks', 
+                   'nlp', 'computer vision', 'scikit-learn', 'keras', 'machine learning'],
+        'entry_level': '₹12-18 LPA',
+        'mid_level': '₹20-30 LPA',
+        'senior_level': '₹35-50+ LPA',
+        'demand_trend': '🚀 Exploding',
+        'growth': 85,
+        'job_market_size': 5000,
+        'competition': 'High',
+        'color': '#9b59b6',
+        'top_companies': ['Google', 'OpenAI', 'DeepMind', 'Meta', 'Tesla', 'NVIDIA'],
+        'avg_job_openings': 450,
+        'required_projects': ['Chatbot', 'Image Classification', 'NLP System', 'Time Series']
+    },
+    'data_science': {
+        'name': 'Data Science & Analytics',
+        'icon': '📊',
+        'category': 'Technology',
+        'description': 'Transform raw data into actionable insights',
+        'skills': ['python', 'machine learning', 'statistics', 'sql', 'data analysis', 
+                   'pandas', 'numpy', 'tableau', 'power bi', 'r'],
+        'entry_level': '₹8-12 LPA',
+        'mid_level': '₹16-24 LPA',
+        'senior_level': '₹28-40+ LPA',
+        'demand_trend': '📈 Rising',
+        'growth': 75,
+        'job_market_size': 8000,
+        'competition': 'Medium-High',
+        'color': '#3498db',
+        'top_companies': ['Flipkart', 'Amazon', 'Microsoft', 'Google', 'JPMorgan'],
+        'avg_job_openings': 520,
+        'required_projects': ['Sales Analysis', 'Customer Segmentation', 'Predictive Model', 'Dashboard']
+    },
+    'web_development': {
+        'name': 'Full Stack Web Development',
+        'icon': '💻',
+        'category': 'Technology',
+        'description': 'Build modern web applications from frontend to backend',
+        'skills': ['javascript', 'react', 'node.js', 'python', 'django', 'mongodb', 
+                   'express', 'html', 'css', 'rest api', 'docker'],
+        'entry_level': '₹5-8 LPA',
+        'mid_level': '₹12-18 LPA',
+        'senior_level': '₹22-35+ LPA',
+        'demand_trend': '📈 Steady',
+        'growth': 60,
+        'job_market_size': 15000,
+        'competition': 'Very High',
+        'color': '#e74c3c',
+        'top_companies': ['Paytm', 'Myntra', 'Uber', 'Netflix', 'Shopify'],
+        'avg_job_openings': 850,
+        'required_projects': ['E-commerce Site', 'Blog Platform', 'Chat App', 'Task Manager']
+    },
+    'cloud_devops': {
+        'name': 'Cloud & DevOps Engineering',
+        'icon': '☁️',
+        'category': 'Infrastructure',
+        'description': 'Architect and manage cloud infrastructure at scale',
+        'skills': ['aws', 'azure', 'google cloud', 'docker', 'kubernetes', 'devops', 
+                   'terraform', 'linux', 'jenkins', 'ci/cd'],
+        'entry_level': '₹10-15 LPA',
+        'mid_level': '₹18-26 LPA',
+        'senior_level': '₹30-45+ LPA',
+        'demand_trend': '📈 Rising',
+        'growth': 80,
+        'job_market_size': 6000,
+        'competition': 'Medium',
+        'color': '#f39c12',
+        'top_companies': ['Accenture', 'TCS', 'Infosys', 'IBM', 'AWS'],
+        'avg_job_openings': 380,
+        'required_projects': ['K8s Cluster', 'CI/CD Pipeline', 'Microservices', 'Infrastructure']
+    },
+    'cybersecurity': {
+        'name': 'Cybersecurity & Ethical Hacking',
+        'icon': '🔒',
+        'category': 'Security',
+        'description': 'Defend systems and protect against evolving threats',
+        'skills': ['network security', 'ethical hacking', 'cryptography', 'python', 
+                   'linux', 'penetration testing', 'threat analysis', 'compliance'],
+        'entry_level': '₹10-14 LPA',
+        'mid_level': '₹18-28 LPA',
+        'senior_level': '₹32-50+ LPA',
+        'demand_trend': '🚀 Critical',
+        'growth': 90,
+        'job_market_size': 3000,
+        'competition': 'Low-Medium',
+        'color': '#2ecc71',
+        'top_companies': ['Cisco', 'Kaspersky', 'CrowdStrike', 'Palo Alto', 'Fortinet'],
+        'avg_job_openings': 250,
+        'required_projects': ['Vulnerability Assessment', 'Penetration Test', 'Firewall Config', 'Incident Response']
+    },
+    'mobile_development': {
+        'name': 'Mobile App Development',
+        'icon': '📱',
+        'category': 'Technology',
+        'description': 'Create powerful applications for iOS and Android',
+        'skills': ['swift', 'kotlin', 'react native', 'flutter', 'javascript', 'java', 
+                   'firebase', 'rest api', 'git', 'mobile ui'],
+        'entry_level': '₹6-10 LPA',
+        'mid_level': '₹14-20 LPA',
+        'senior_level': '₹24-36+ LPA',
+        'demand_trend': '📈 High',
+        'growth': 70,
+        'job_market_size': 10000,
+        'competition': 'Medium-High',
+        'color': '#1abc9c',
+        'top_companies': ['Swiggy', 'Ola', 'Zomato', 'Instagram', 'Gojek'],
+        'avg_job_openings': 620,
+        'required_projects': ['E-commerce App', 'Social App', 'Fitness Tracker', 'Food Delivery']
+    },
+    'blockchain': {
+        'name': 'Blockchain & Web3 Development',
+        'icon': '⛓️',
+        'category': 'Emerging',
         'description': 'Build decentralized applications and smart contracts',
         'skills': ['solidity', 'ethereum', 'web3.js', 'smart contracts', 'blockchain', 
                    'cryptography', 'dapps', 'bitcoin', 'consensus'],
@@ -679,224 +2538,1761 @@ CAREER_DOMAINS_MAP = {
     },
 }
 
-DISPLAY_NAME_TO_KEY = {v['name'].lower(): k for k, v in CAREER_DOMAINS_MAP.items()}
+# ============================================================================
+# JOB MARKET DEMAND SNAPSHOT
+# ============================================================================
+# tools/ingest_job_data.py aggregates data/Job_data.xlsx offline into a small
+# binary file; the app only memory-maps that file, never the workbook.
+#
+# Layout (little-endian):
+#   header | domain records | skill records | company string ids |
+#   string offsets (u32 x count+1) | UTF-8 string blob
+
+JOB_DEMAND_MAGIC = b'CCJD'
+JOB_DEMAND_VERSION = 1
+JOB_DEMAND_HEADER = struct.Struct('<4sHHIIII')    # magic, version, domains, skills, company refs, strings, months
+JOB_DEMAND_DOMAIN = struct.Struct('<IIQIfII')     # key, postings, applicants, recent postings, growth %, companies start/count
+JOB_DEMAND_SKILL = struct.Struct('<IIQ')          # name, postings, applicants
+
+
+def write_job_demand_snapshot(path: Path, domains: Dict[str, Dict[str, Any]],
+                              skills: Dict[str, Dict[str, int]], months: int) -> int:
+    """Serialize aggregated demand statistics; returns the file size in bytes."""
+    strings: List[str] = []
+    string_ids: Dict[str, int] = {}
+
+    def sid(value: str) -> int:
+        if value not in string_ids:
+            string_ids[value] = len(strings)
+            strings.append(value)
+        return string_ids[value]
+
+    domain_blob = bytearray()
+    company_refs = array('I')
+    for key, d in domains.items():
+        start = len(company_refs)
+        company_refs.extend(sid(c) for c in d.get('top_companies', []))
+        domain_blob += JOB_DEMAND_DOMAIN.pack(sid(key), d['postings'], d['applicants'], d['recent_postings'],
+                                              d['growth'], start, len(company_refs) - start)
+    skill_blob = bytearray()
+    for name, sk in skills.items():
+        skill_blob += JOB_DEMAND_SKILL.pack(sid(name), sk['postings'], sk['applicants'])
+
+    encoded = [v.encode('utf-8') for v in strings]
+    offsets = array('I', [0])
+    for b in encoded:
+        offsets.append(offsets[-1] + len(b))
+    if sys.byteorder != 'little':
+        company_refs.byteswap()
+        offsets.byteswap()
+
+    payload = (JOB_DEMAND_HEADER.pack(JOB_DEMAND_MAGIC, JOB_DEMAND_VERSION, len(domains), len(skills),
+                                      len(company_refs), len(strings), months)
+               + bytes(domain_blob) + bytes(skill_blob) + company_refs.tobytes()
+               + offsets.tobytes() + b''.join(encoded))
+    tmp = Path(str(path) + '.tmp')
+    tmp.write_bytes(payload)
+    os.replace(tmp, path)
+    return len(payload)
+
+
+class JobDemandSnapshot:
+    """Read-only, memory-mapped view of a job demand snapshot."""
+
+    def __init__(self, path: Path):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, n_domains, n_skills, n_refs, n_strings, self.months = \
+            JOB_DEMAND_HEADER.unpack_from(self._mm, 0)
+        if magic != JOB_DEMAND_MAGIC or version != JOB_DEMAND_VERSION:
+            raise ValueError(f"Unsupported job demand snapshot: {magic!r} v{version}")
+        pos = JOB_DEMAND_HEADER.size
+        self._domains_at, pos = pos, pos + n_domains * JOB_DEMAND_DOMAIN.size
+        self._skills_at, pos = pos, pos + n_skills * JOB_DEMAND_SKILL.size
+        self._refs = struct.unpack_from(f'<{n_refs}I', self._mm, pos)
+        pos += 4 * n_refs
+        self._offsets = struct.unpack_from(f'<{n_strings + 1}I', self._mm, pos)
+        self._blob_at = pos + 4 * (n_strings + 1)
+        self.n_domains, self.n_skills = n_domains, n_skills
+
+    def _string(self, i: int) -> str:
+        return self._mm[self._blob_at + self._offsets[i]:self._blob_at + self._offsets[i + 1]].decode('utf-8')
+
+    def domains(self) -> Dict[str, Dict[str, Any]]:
+        out = {}
+        for i in range(self.n_domains):
+            key, postings, applicants, recent, growth, start, count = \
+                JOB_DEMAND_DOMAIN.unpack_from(self._mm, self._domains_at + i * JOB_DEMAND_DOMAIN.size)
+            out[self._string(key)] = {
+                'postings': postings,
+                'applicants': applicants,
+                'recent_postings': recent,
+                'growth': round(growth, 1),
+                'top_companies': [self._string(c) for c in self._refs[start:start + count]],
+            }
+        return out
+
+    def skills(self) -> Dict[str, Dict[str, int]]:
+        out = {}
+        for i in range(self.n_skills):
+            name, postings, applicants = \
+                JOB_DEMAND_SKILL.unpack_from(self._mm, self._skills_at + i * JOB_DEMAND_SKILL.size)
+            out[self._string(name)] = {'postings': postings, 'applicants': applicants}
+        return out
+
+
+def load_job_demand(path: Path) -> Dict[str, float]:
+    """Overlay snapshot statistics onto CAREER_DOMAINS_MAP; returns skill -> demand weight (0..1)."""
+    if not path.exists():
+        logger.warning(f"Job demand snapshot not found: {path} (run tools/ingest_job_data.py)")
+        return {}
+    try:
+        snapshot = JobDemandSnapshot(path)
+        months = max(1, snapshot.months)
+        for key, stats in snapshot.domains().items():
+            domain = CAREER_DOMAINS_MAP.get(key)
+            if not domain or not stats['postings']:
+                continue
+            domain['job_market_size'] = stats['postings']
+            domain['avg_job_openings'] = round(stats['postings'] / months)
+            if stats['top_companies']:
+                domain['top_companies'] = stats['top_companies']
+            if snapshot.months >= config.MIN_GROWTH_MONTHS:
+                domain['growth'] = round(stats['growth'])
+        skills = snapshot.skills()
+        top = max((sk['postings'] for sk in skills.values()), default=0)
+        logger.info(f"Job demand snapshot loaded: {snapshot.n_domains} domains, {snapshot.n_skills} skills")
+        return {name: sk['postings'] / top for name, sk in skills.items()} if top else {}
+    except Exception as e:
+        logger.error(f"Failed to load job demand snapshot {path}: {e}")
+        return {}
+
+
+SKILL_DEMAND: Dict[str, float] = load_job_demand(Path(config.JOB_DEMAND_SNAPSHOT))
+
+# ============================================================================
+# TYPO-TOLERANT LOOKUP (SYMSPELL)
+# ============================================================================
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Optimal-string-alignment distance (adjacent swaps cost 1); max_distance + 1 once exceeded.
+
+    Only the diagonal band |i - j| <= max_distance is computed, so the cost is
+    O(len * max_distance) rather than O(len(a) * len(b)).
+    """
+    if a == b:
+        return 0
+    n, m, k = len(a), len(b), max_distance
+    if abs(n - m) > k:
+        return k + 1
+    big = k + 1
+    prev2 = None
+    prev = [j if j <= k else big for j in range(m + 1)]
+    for i in range(1, n + 1):
+        lo, hi = max(1, i - k), min(m, i + k)
+        cur = [big] * (m + 1)
+        if i <= k:
+            cur[0] = i
+        row_min = cur[0]
+        ai = a[i - 1]
+        for j in range(lo, hi + 1):
+            v = prev[j - 1] + (ai != b[j - 1])
+            if prev[j] + 1 < v:
+                v = prev[j] + 1
+            if cur[j - 1] + 1 < v:
+                v = cur[j - 1] + 1
+            if prev2 is not None and j > 1 and ai == b[j - 2] and a[i - 2] == b[j - 1] and prev2[j - 2] + 1 < v:
+                v = prev2[j - 2] + 1
+            cur[j] = v
+            if v < row_min:
+                row_min = v
+        if row_min > k:
+            return big
+        prev2, prev = prev, cur
+    return prev[m] if prev[m] <= k else big
+
+
+class SymSpellIndex:
+    """SymSpell-style deletes dictionary for nearest-term lookup within a small edit distance.
+
+    Each term's prefix is indexed under every variant with up to
+    ``max_distance`` characters deleted. A query generates the same deletes of
+    its own prefix, so candidates come from a handful of dict probes whatever
+    the vocabulary size; only those candidates get a real distance check.
+    """
+
+    def __init__(self, max_distance: int = 2, prefix_length: int = 10):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.terms: List[str] = []
+        self.payloads: List[Any] = []
+        self.weights: List[float] = []
+        self.term_ids: Dict[str, int] = {}
+        self.deletes: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def _deletes(self, word: str) -> set:
+        out = {word}
+        frontier = {word}
+        for _ in range(self.max_distance):
+            frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))} - out
+            out |= frontier
+        return out
+
+    def add(self, term: str, payload: Any = None, weight: float = 0.0) -> None:
+        if not term or term in self.term_ids:
+            return
+        tid = self.term_ids[term] = len(self.terms)
+        self.terms.append(term)
+        self.payloads.append(payload if payload is not None else term)
+        self.weights.append(weight)
+        for d in self._deletes(term[:self.prefix_length]):
+            self.deletes.setdefault(d, []).append(tid)
+
+    def lookup(self, word: str, max_distance: Optional[int] = None):
+        """(term, payload, distance) of the closest term, preferring heavier then earlier terms; or None."""
+        if not word:
+            return None
+        limit = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        tid = self.term_ids.get(word)
+        if tid is not None:
+            return self.terms[tid], self.payloads[tid], 0
+        best = None
+        seen = set()
+        for d in self._deletes(word[:self.prefix_length]):
+            for tid in self.deletes.get(d, ()):
+                if tid in seen:
+                    continue
+                seen.add(tid)
+                term = self.terms[tid]
+                if abs(len(term) - len(word)) > limit:
+                    continue
+                dist = edit_distance(word, term, limit)
+                if dist > limit:
+                    continue
+                rank = (dist, -self.weights[tid], tid)
+                if best is None or rank < best:
+                    best = rank
+        if best is None:
+            return None
+        tid = best[2]
+        return self.terms[tid], self.payloads[tid], best[0]
+
+
+def typo_budget(word: str) -> int:
+    """Edits tolerated for a word: none for very short words, 1 for short ones, else 2."""
+    n = len(word)
+    return 0 if n < 4 else 1 if n < 8 else 2
+
+# ============================================================================
+# SKILL CANONICALIZATION
+# ============================================================================
+
+# Common spellings -> canonical skill (as written in CAREER_DOMAINS_MAP)
+SKILL_ALIASES = {
+    'py': 'python', 'python3': 'python', 'python 3': 'python', 'python2': 'python',
+    'js': 'javascript', 'ecmascript': 'javascript', 'es6': 'javascript',
+    'ts': 'typescript',
+    'node': 'node.js', 'node js': 'node.js',
+    'reactjs': 'react', 'react.js': 'react',
+    'react-native': 'react native',
+    'vuejs': 'vue', 'vue.js': 'vue', 'angularjs': 'angular',
+    'expressjs': 'express', 'express.js': 'express',
+    'k8s': 'kubernetes', 'kube': 'kubernetes',
+    'ml': 'machine learning', 'dl': 'deep learning', 'cv': 'computer vision',
+    'natural language processing': 'nlp', 'sklearn': 'scikit-learn', 'tf': 'tensorflow',
+    'torch': 'pytorch',
+    'go': 'golang', 'gcp': 'google cloud', 'google cloud platform': 'google cloud',
+    'amazon web services': 'aws', 'microsoft azure': 'azure',
+    'ci cd': 'ci/cd', 'continuous integration': 'ci/cd',
+    'rest': 'rest api', 'restful api': 'rest api', 'restful apis': 'rest api', 'rest apis': 'rest api',
+    'html5': 'html', 'css3': 'css', 'powerbi': 'power bi',
+    'mongo': 'mongodb',
+    'eth': 'ethereum', 'web3': 'web3.js', 'pentesting': 'penetration testing',
+    'pen testing': 'penetration testing',
+}
+
+# trailing words that don't change which skill is meant ("Python Programming")
+SKILL_SUFFIX_WORDS = ('programming', 'programming language', 'language', 'software')
+
+_SKILL_SPACE_RE = re.compile(r'\s+')
+_SKILL_COMPACT_RE = re.compile(r'[\s.\-_/]+')
+_SKILL_VERSION_RE = re.compile(r'^(.*?\D)[\s\-]*v?\d+(?:\.\d+)*$')
+
+
+class SkillCanonicalizer:
+    """Raw skill text -> canonical skill id.
+
+    Pipeline: lowercase/whitespace normalization, alias table, punctuation-free
+    key ('NodeJS' == 'node.js'), trailing version ('Python 3') and generic
+    suffixes ('Tableau Software'). Results are memoized in a bounded LRU, so a
+    token seen before costs one cache lookup.
+    """
+
+    def __init__(self, cache_size: int = 50000):
+        self.ids: Dict[str, int] = {}
+        self.names: List[str] = []
+        self.aliases: Dict[str, int] = {}
+        self.compact: Dict[str, int] = {}
+        self.typos: Optional[SymSpellIndex] = None
+        self._cached = functools.lru_cache(maxsize=cache_size)(self._resolve)
+
+    @staticmethod
+    def normalize(raw: str) -> str:
+        return _SKILL_SPACE_RE.sub(' ', str(raw or '').strip().lower())
+
+    def register(self, name: str) -> int:
+        """Add ``name`` as a canonical skill unless it already resolves to one."""
+        name = self.normalize(name)
+        existing = self._resolve(name)
+        if existing is not None:
+            return existing
+        sid = self.ids[name] = len(self.names)
+        self.names.append(name)
+        self.compact.setdefault(_SKILL_COMPACT_RE.sub('', name), sid)
+        if self.typos is not None:
+            self.typos.add(name, sid)
+        self._cached.cache_clear()
+        return sid
+
+    def enable_typo_tolerance(self, weights: Optional[Dict[str, float]] = None) -> None:
+        """Index the canonical vocabulary so unknown tokens resolve to a skill within 1-2 edits."""
+        self.typos = SymSpellIndex(max_distance=2)
+        for sid, name in enumerate(self.names):
+            self.typos.add(name, sid, (weights or {}).get(name, 0.0))
+        self._cached.cache_clear()
+
+    def add_alias(self, alias: str, canonical: str) -> None:
+        self.aliases[self.normalize(alias)] = self.register(canonical)
+        self._cached.cache_clear()
+
+    def seed(self, skills) -> int:
+        """Register skill names (e.g. the Coursera Skills column); returns how many became aliases."""
+        aliased = 0
+        for skill in skills:
+            before = len(self.names)
+            self.register(skill)
+            aliased += len(self.names) == before
+        return aliased
+
+    def _lookup(self, s: str) -> Optional[int]:
+        sid = self.ids.get(s)
+        if sid is None:
+            sid = self.aliases.get(s)
+        if sid is None:
+            sid = self.compact.get(_SKILL_COMPACT_RE.sub('', s))
+        return sid
+
+    def _resolve(self, raw: str) -> Optional[int]:
+        s = self.normalize(raw)
+        if not s:
+            return None
+        sid = self._lookup(s)
+        if sid is not None:
+            return sid
+        m = _SKILL_VERSION_RE.match(s)
+        if m:
+            sid = self._lookup(m.group(1).strip())
+            if sid is not None:
+                return sid
+        for suffix in SKILL_SUFFIX_WORDS:
+            if s.endswith(' ' + suffix):
+                sid = self._lookup(s[:-len(suffix) - 1])
+                if sid is not None:
+                    return sid
+        if self.typos is not None and len(s) >= 5:
+            hit = self.typos.lookup(s, typo_budget(s))
+            if hit:
+                return hit[1]
+        return None
+
+    def canonical_id(self, raw: str) -> Optional[int]:
+        return self._cached(raw)
+
+    def canonical(self, raw: str) -> str:
+        """Canonical name for ``raw``, or its normalized text if the skill is unknown."""
+        sid = self._cached(raw)
+        return self.names[sid] if sid is not None else self.normalize(raw)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        info = self._cached.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            'hits': info.hits,
+            'misses': info.misses,
+            'size': info.currsize,
+            'max_size': info.maxsize,
+            'hit_rate': round(info.hits / lookups, 4) if lookups else 0.0,
+            'canonical_skills': len(self.names),
+            'aliases': len(self.aliases),
+        }
+
+
+def build_skill_canonicalizer(catalog: CourseCatalog) -> SkillCanonicalizer:
+    """Domain skills are canonical first, then the alias table, then catalog skills."""
+    canon = SkillCanonicalizer(config.SKILL_CACHE_SIZE)
+    for domain in CAREER_DOMAINS_MAP.values():
+        for skill in domain.get('skills', []):
+            canon.register(skill)
+    for alias, target in SKILL_ALIASES.items():
+        canon.add_alias(alias, target)
+    aliased = canon.seed(catalog.skills.values)
+    # break near-ties toward skills more courses teach
+    course_counts: Dict[str, float] = {}
+    for sid in catalog.skill_ids:
+        name = canon.canonical(catalog.skills[sid])
+        course_counts[name] = course_counts.get(name, 0) + 1
+    canon.enable_typo_tolerance(course_counts)
+    logger.info(f"Skill canonicalizer ready: {len(canon.names)} canonical skills, "
+                f"{len(canon.aliases)} aliases, {aliased} catalog skills folded into existing ones")
+    return canon
+
+
+def canonical_skill_tokens(user_skills: str) -> List[str]:
+    """Comma-separated user skills as canonical skill names."""
+    return [SKILLS.canonical(t) for t in str(user_skills or '').split(',') if t.strip()]
+
+
+CATALOG = load_course_catalog()
+SKILLS = build_skill_canonicalizer(CATALOG)
+COURSE_INDEX = CourseIndex(CATALOG, SKILLS)
+COURSE_SEARCH = CourseSearch(CATALOG)
+COURSE_TEXT = CourseTextIndex(CATALOG)
+SKILL_RANKING = RankedCourses(CATALOG, COURSE_INDEX, score_ranking())
+DOMAIN_RANKING = RankedCourses(CATALOG, COURSE_INDEX, rating_then_price)
+logger.info(f"Course text index ready: {COURSE_TEXT.stats()} in {COURSE_TEXT.build_seconds:.3f}s")
+
+DISPLAY_NAME_TO_KEY = {v['name'].lower(): k for k, v in CAREER_DOMAINS_MAP.items()}
+
+_GOAL_PUNCT_RE = re.compile(r'[\-\.\/\&]')
+_GOAL_SPACE_RE = re.compile(r'\s+')
+_GOAL_COMPACT_RE = re.compile(r'[\W_]+')
+
+
+class GoalResolver:
+    """Career-goal text -> domain key, built once from CAREER_DOMAINS_MAP.
+
+    Resolution order (first hit wins): domain key, exact display name,
+    punctuation-normalized key, display-name substring either way, then the
+    largest display-name token overlap, and finally the nearest name/key
+    within two edits (SymSpell). Ties go to the earlier domain. The
+    substring and overlap steps use token indexes, so a lookup is linear in
+    the input length. Recent inputs are
+    memoized in a bounded LRU.
+    """
+
+    PATHS = ('key', 'display_name', 'normalized', 'substring', 'token_overlap', 'typo', 'unresolved')
+
+    def __init__(self, domains: Dict[str, Dict[str, Any]], memo_size: int = 4096):
+        self.keys = list(domains)
+        self.order = {key: i for i, key in enumerate(self.keys)}
+        self.display = {v['name'].lower(): k for k, v in domains.items()}
+        self.names = list(self.display.items())
+        # name token -> domains; every substring of a name token -> domains;
+        # a name's longest token -> domains (candidates for "name in input")
+        self.token_index: Dict[str, List[str]] = {}
+        self.infix_index: Dict[str, set] = {}
+        self.anchor_index: Dict[str, List[tuple]] = {}
+        self.tokenless: List[tuple] = []
+        for name, key in self.names:
+            tokens = _WORD_RE.findall(name)
+            for token in set(tokens):
+                self.token_index.setdefault(token, []).append(key)
+                for i in range(len(token)):
+                    for j in range(i + 1, len(token) + 1):
+                        self.infix_index.setdefault(token[i:j], set()).add((name, key))
+            if tokens:
+                self.anchor_index.setdefault(max(tokens, key=len), []).append((name, key))
+            else:
+                self.tokenless.append((name, key))
+        # misspelling fallback: compact display names/keys, and single name tokens
+        self.typo_names = SymSpellIndex(max_distance=2)
+        self.typo_tokens = SymSpellIndex(max_distance=2)
+        for name, key in self.names:
+            self.typo_names.add(_GOAL_COMPACT_RE.sub('', name), key)
+        for key in self.keys:
+            self.typo_names.add(_GOAL_COMPACT_RE.sub('', key.lower()), key)
+        for token in self.token_index:
+            if len(token) >= 4:
+                self.typo_tokens.add(token)
+        self.memo_size = memo_size
+        self._memo: 'OrderedDict[str, Optional[str]]' = OrderedDict()
+        self.counters = dict.fromkeys(self.PATHS + ('memo_hits', 'memo_misses'), 0)
+
+    def resolve(self, input_value: Optional[str]) -> Optional[str]:
+        if not input_value:
+            return None
+        raw = str(input_value)
+        if raw in self._memo:
+            self._memo.move_to_end(raw)
+            self.counters['memo_hits'] += 1
+            return self._memo[raw]
+        self.counters['memo_misses'] += 1
+        key, path = self._resolve(raw)
+        if path:
+            self.counters[path] += 1
+        self._memo[raw] = key
+        if len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+        return key
+
+    def _resolve(self, raw: str):
+        s = html.unescape(raw).strip()
+        if not s:
+            return None, None
+        if s in self.order:
+            return s, 'key'
+        lower_s = s.lower()
+        if lower_s in self.display:
+            return self.display[lower_s], 'display_name'
+        candidate = _GOAL_SPACE_RE.sub('_', _GOAL_PUNCT_RE.sub(' ', lower_s)).strip('_')
+        if candidate in self.order:
+            return candidate, 'normalized'
+
+        tokens = _WORD_RE.findall(lower_s)
+        key = self._substring_match(lower_s, tokens)
+        if key:
+            return key, 'substring'
+
+        best = self._token_overlap(tokens)
+        if best:
+            logger.info(f"Resolved career goal '{raw}' -> '{best[0]}' (score={best[1]})")
+            return best[0], 'token_overlap'
+
+        key = self._typo_match(lower_s, tokens)
+        if key:
+            logger.info(f"Resolved misspelled career goal '{raw}' -> '{key}'")
+            return key, 'typo'
+        logger.info(f"Could not resolve career goal: {raw}")
+        return None, 'unresolved'
+
+    def _token_overlap(self, tokens: List[str]):
+        counts: Dict[str, int] = {}
+        for token in set(tokens):
+            for k in self.token_index.get(token, ()):
+                counts[k] = counts.get(k, 0) + 1
+        if not counts:
+            return None
+        best_score = max(counts.values())
+        return min((k for k, c in counts.items() if c == best_score), key=self.order.get), best_score
+
+    def _typo_match(self, lower_s: str, tokens: List[str]) -> Optional[str]:
+        """Nearest display name/key within 2 edits, else overlap after correcting each word."""
+        compact = _GOAL_COMPACT_RE.sub('', lower_s)
+        hit = self.typo_names.lookup(compact, typo_budget(compact))
+        if hit:
+            return hit[1]
+        corrected = []
+        for token in tokens:
+            fixed = self.typo_tokens.lookup(token, typo_budget(token))
+            corrected.append(fixed[0] if fixed else token)
+        best = self._token_overlap(corrected)
+        return best[0] if best else None
+
+    def _substring_match(self, lower_s: str, tokens: List[str]) -> Optional[str]:
+        """First domain (in map order) whose display name contains, or is contained in, the input."""
+        if tokens:
+            # input inside a name: the input's longest word lies inside one of the name's tokens
+            candidates = set(self.infix_index.get(max(tokens, key=len), ()))
+            # name inside the input: the name's longest token lies inside one of the input's words
+            # (one containment test per anchor, so long inputs stay linear)
+            words = set(tokens)
+            for anchor, entries in self.anchor_index.items():
+                if any(anchor in word for word in words):
+                    candidates.update(entries)
+            candidates.update(self.tokenless)
+        else:
+            candidates = self.names
+        hits = [key for name, key in candidates if lower_s in name or name in lower_s]
+        return min(hits, key=self.order.get) if hits else None
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.counters['memo_hits'] + self.counters['memo_misses']
+        return {
+            **self.counters,
+            'memo_size': len(self._memo),
+            'hit_rate': round(self.counters['memo_hits'] / lookups, 4) if lookups else 0.0,
+        }
+
+
+GOAL_RESOLVER = GoalResolver(CAREER_DOMAINS_MAP)
+
+
+def resolve_career_goal(input_value: Optional[str]) -> Optional[str]:
+    """Robustly resolve career goal text to a domain key."""
+    return GOAL_RESOLVER.resolve(input_value)
+
+# accepted spellings of each /analyze input, in lookup order
+SKILLS_INPUT_KEYS = ('skills', 'user_skills', 'skills_input')
+CGPA_INPUT_KEYS = ('cgpa', 'score', 'cgpa_input')
+GOAL_QUERY_KEYS = ('career_goal', 'domain', 'career', 'selected_domain', 'domain_key')
+GOAL_MAX_LENGTH = 200  # longer goal text is cut before resolving; no domain name comes close
+GOAL_INPUT_KEYS = ('career_goal', 'career', 'domain', 'domain_key', 'selected_domain', 'careerGoal', 'career_domain',
+                   'career_goal_input')
+
+
+class RequestInput:
+    """Query string plus the request body, parsed once (JSON, urlencoded or multipart).
+
+    Handlers read inputs through first()/career_goal() instead of awaiting
+    request.json()/request.form() themselves.
+    """
+
+    __slots__ = ('query', 'body', 'is_form')
+
+    def __init__(self, query, body, is_form: bool = False):
+        self.query = query
+        self.body = body
+        self.is_form = is_form
+
+    def first(self, keys) -> Any:
+        """First body value among ``keys`` that is present and not empty."""
+        for key in keys:
+            value = self.body.get(key)
+            if value is not None and value != '':
+                return value
+        return None
+
+    def career_goal(self) -> Optional[str]:
+        """Goal text (at most GOAL_MAX_LENGTH chars): a form's career_goal field, then the query
+        string, then the body's aliases (a JSON career_goal does not override the query string)."""
+        goal = self._career_goal()
+        return goal[:GOAL_MAX_LENGTH] if goal else goal
+
+    def _career_goal(self) -> Optional[str]:
+        if self.is_form:
+            value = self.body.get('career_goal')
+            if value and str(value).strip():
+                return str(value).strip()
+        for key in GOAL_QUERY_KEYS:
+            value = self.query.get(key)
+            if value:
+                return value
+        for key in GOAL_INPUT_KEYS:
+            value = self.body.get(key)
+            if value and str(value).strip():
+                return str(value).strip()
+        return None
+
+
+async def request_input(request: Request) -> RequestInput:
+    """FastAPI dependency: parse the body once into a RequestInput."""
+    content_type = request.headers.get('content-type', '')
+    body, is_form = {}, False
+    try:
+        if 'application/json' in content_type:
+            parsed = await request.json()
+            body = parsed if isinstance(parsed, dict) else {}
+        elif 'multipart/form-data' in content_type or 'application/x-www-form-urlencoded' in content_type:
+            body, is_form = await request.form(), True
+    except Exception:
+        body = {}
+    return RequestInput(request.query_params, body, is_form)
+
+# ============================================================================
+# PYDANTIC MODELS
+# ============================================================================
+
+class UserCreate(BaseModel):
+    """User creation model"""
+    username: str
+    email: str
+    password: str
+    full_name: str
+
+class SkillAnalysisRequest(BaseModel):
+    """Skill analysis request model"""
+    skills: str
+    cgpa: float = Field(ge=0, le=10)
+    career_goal: str = ''
+
+# /api/v1 response models. Routes declare them as response_model for the
+# OpenAPI schema but return api_response() directly, so FastAPI's
+# jsonable_encoder pass is skipped and the body is encoded once.
+
+class SkillsCount(BaseModel):
+    total: int
+    have: int
+    need: int
+    percentage_have: float = 0.0
+
+class SalaryBands(BaseModel):
+    entry: str = ''
+    mid: str = ''
+    senior: str = ''
+
+class DomainInfo(BaseModel):
+    growth_potential: int = 0
+    competition: str = 'Medium'
+    avg_job_openings: int = 0
+    top_companies: List[str] = []
+    required_projects: List[str] = []
+    category: str = ''
+
+class CourseSummary(BaseModel):
+    title: str
+    platform: str
+    price: int
+    rating: float
+    url: str
+
+class CourseOut(CourseSummary):
+    id: int
+    score: Optional[float] = None
+    instructor: str = ''
+    duration: str = ''
+    skills: List[str] = []
+    students: Optional[str] = None
+    level: Optional[str] = None
+    type: Optional[str] = None
+    certificate: Optional[bool] = None
+    review_count: Optional[int] = None
+    description: Optional[str] = None
+
+class CourseListResponse(BaseModel):
+    total: int
+    courses: List[CourseOut]
+    next_cursor: Optional[str] = None
+
+class AnalysisResponseV1(BaseModel):
+    analysis_id: str
+    career_goal: str
+    domain: str
+    match_percentage: float
+    adjusted_match: float
+    cgpa_score: float
+    cgpa_adjustment: int
+    readiness_level: str
+    estimated_timeline: str
+    action_required: str
+    matched_skills: List[str]
+    missing_skills: List[str]
+    missing_skills_by_demand: List[str] = []
+    skills_count: SkillsCount
+    salary: SalaryBands
+    domain_info: DomainInfo
+    skill_course_map: Dict[str, List[CourseSummary]]
+    level_roadmap: Dict[str, List[str]]
+    suggested_domain: Optional[str] = None
+    suggested_domain_score: int = 0
+
+class DomainSummary(BaseModel):
+    key: str
+    name: str
+    icon: str = ''
+    category: str = ''
+    description: str = ''
+    skills: List[str] = []
+    salary: SalaryBands
+    growth: int = 0
+    demand_trend: str = ''
+    competition: str = 'Medium'
+    avg_job_openings: int = 0
+    top_companies: List[str] = []
+
+class DomainListResponse(BaseModel):
+    total: int
+    domains: List[DomainSummary]
+
+# ============================================================================
+# SECURITY UTILITIES
+# ============================================================================
+
+# Stored formats:
+#   scrypt$<n>$<r>$<p>$<salt b64>$<hash b64>
+#   pbkdf2_sha256$<iterations>$<salt b64>$<hash b64>
+#   <64 hex chars>   legacy unsalted SHA-256, verified and upgraded on login
+
+_LEGACY_SHA256_RE = re.compile(r'^[0-9a-f]{64}$')
+
+
+def _b64(raw: bytes) -> str:
+    return base64.b64encode(raw).decode('ascii')
+
+
+def _kdf(password: str, salt: bytes, scheme: str, params: List[int]) -> bytes:
+    if scheme == 'scrypt':
+        n, r, p = params
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=256 * r * n + 1024 * 1024, dklen=32)
+    if scheme == 'pbkdf2_sha256':
+        return hashlib.pbkdf2_hmac('sha256', password.encode(), salt, params[0])
+    raise ValueError(f"Unknown password scheme: {scheme}")
+
+
+def _current_kdf_params() -> tuple:
+    if config.PASSWORD_KDF == 'pbkdf2_sha256':
+        return 'pbkdf2_sha256', [config.PBKDF2_ITERATIONS]
+    return 'scrypt', [config.SCRYPT_N, config.SCRYPT_R, config.SCRYPT_P]
+
+
+def hash_password(password: str) -> str:
+    """Hash password with the configured KDF (blocking; use PASSWORDS.hash from handlers)"""
+    scheme, params = _current_kdf_params()
+    salt = os.urandom(16)
+    return '$'.join([scheme, *map(str, params), _b64(salt), _b64(_kdf(password, salt, scheme, params))])
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify hashed password (blocking; use PASSWORDS.verify from handlers)"""
+    if _LEGACY_SHA256_RE.match(hashed_password or ''):
+        return hmac.compare_digest(hashlib.sha256(plain_password.encode()).hexdigest(), hashed_password)
+    try:
+        scheme, *fields = hashed_password.split('$')
+        salt, expected = base64.b64decode(fields[-2]), base64.b64decode(fields[-1])
+        params = [int(f) for f in fields[:-2]]
+        return hmac.compare_digest(_kdf(plain_password, salt, scheme, params), expected)
+    except (ValueError, IndexError):
+        return False
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True for legacy SHA-256 hashes and hashes made with other KDF settings."""
+    scheme, params = _current_kdf_params()
+    return not (hashed_password or '').startswith('$'.join([scheme, *map(str, params)]) + '$')
+
+
+def dummy_password_hash() -> str:
+    """A well-formed hash in the current KDF settings that no password matches.
+
+    Logins for unknown usernames verify against it, so they pay the same KDF
+    cost as real accounts and response time does not reveal which names exist.
+    """
+    scheme, params = _current_kdf_params()
+    return '$'.join([scheme, *map(str, params), _b64(bytes(16)), _b64(bytes(32))])
+
+
+class HashingBusy(Exception):
+    """Too many password hashes queued; the caller should retry later."""
+
+
+class PasswordHasher:
+    """Runs KDF work on a bounded thread pool so logins never stall the event loop.
+
+    hashlib's scrypt/pbkdf2 release the GIL, so threads scale across cores.
+    At most ``max_pending`` jobs may be queued or running; beyond that
+    HashingBusy is raised instead of growing the queue. ``workers=0`` hashes
+    inline on the event loop (for benchmarks and debugging only).
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='kdf') if workers else None
+        self._pending = 0
+        self.hashed = self.verified = self.rehashed = self.rejected_busy = 0
+
+    async def _run(self, fn, *args):
+        if self._pending >= self.max_pending:
+            self.rejected_busy += 1
+            raise HashingBusy()
+        self._pending += 1
+        try:
+            if self._executor is None:
+                return fn(*args)
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        self.hashed += 1
+        return await self._run(hash_password, password)
+
+    async def verify(self, password: str, hashed_password: str) -> tuple:
+        """Returns (ok, new_hash); new_hash is set when the stored hash should be replaced."""
+        self.verified += 1
+        ok = await self._run(verify_password, password, hashed_password)
+        if ok and password_needs_rehash(hashed_password):
+            self.rehashed += 1
+            return True, await self.hash(password)
+        return ok, None
+
+    def stats(self) -> Dict[str, Any]:
+        return {'kdf': _current_kdf_params()[0], 'workers': self.workers, 'pending': self._pending,
+                'max_pending': self.max_pending, 'hashed': self.hashed, 'verified': self.verified,
+                'rehashed': self.rehashed, 'rejected_busy': self.rejected_busy}
+
+
+PASSWORDS = PasswordHasher(config.HASH_WORKERS, config.HASH_MAX_PENDING)
+
+def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
+    """Create JWT access token"""
+    to_encode = data.copy()
+    expire = datetime.utcnow() + (expires_delta or timedelta(minutes=config.ACCESS_TOKEN_EXPIRE_MINUTES))
+    to_encode.update({"exp": expire})
+    encoded_jwt = jwt.encode(to_encode, config.SECRET_KEY, algorithm=config.ALGORITHM)
+    return encoded_jwt
+
+class TokenCache:
+    """Verified JWT claims keyed by the SHA-256 digest of the token.
+
+    A hit skips the HMAC check and JSON decode; entries are evicted at the
+    token's own ``exp`` (and LRU beyond ``max_size``). Logged-out tokens are
+    remembered as revoked until they would have expired anyway, so a replayed
+    cookie is rejected whether or not it was cached.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._claims: 'OrderedDict[bytes, Dict[str, Any]]' = OrderedDict()
+        self._revoked: Dict[bytes, float] = {}
+        self.hits = self.misses = self.expired = self.invalidated = self.revoked_hits = 0
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
 
-def resolve_career_goal(input_value: Optional[str]) -> Optional[str]:
-    """Robustly resolve career goal text to a domain key."""
-    if not input_value:
-        return None
-    s = html.unescape(str(input_value)).strip()
-    if not s:
+    def _drop(self, key: bytes) -> None:
+        self._claims.pop(key, None)
+
+    def is_revoked(self, key: bytes, now: float) -> bool:
+        exp = self._revoked.get(key)
+        if exp is None:
+            return False
+        if exp <= now:
+            del self._revoked[key]
+            return False
+        self.revoked_hits += 1
+        return True
+
+    def get(self, key: bytes, now: float) -> Optional[Dict[str, Any]]:
+        claims = self._claims.get(key)
+        if claims is None:
+            self.misses += 1
+            return None
+        if claims['exp'] <= now:
+            self._drop(key)
+            self.expired += 1
+            self.misses += 1
+            return None
+        self._claims.move_to_end(key)
+        self.hits += 1
+        return claims
+
+    def put(self, key: bytes, claims: Dict[str, Any]) -> None:
+        if not self.max_size or 'exp' not in claims:
+            return
+        self._claims[key] = claims
+        while len(self._claims) > self.max_size:
+            self._drop(next(iter(self._claims)))
+
+    def invalidate(self, token: str) -> Optional[float]:
+        """Logout hook: forget the token and reject it until its expiry, which is returned."""
+        key = self.digest(token)
+        claims = self._claims.get(key)
+        exp = claims['exp'] if claims else None
+        if exp is None:
+            try:
+                exp = jwt.decode(token, config.SECRET_KEY, algorithms=[config.ALGORITHM]).get('exp')
+            except jwt.PyJWTError:
+                exp = None
+        self.invalidated += 1
+        self.revoke(key, exp)
+        return exp
+
+    def revoke(self, key: bytes, exp: Optional[float]) -> None:
+        """Reject the token with digest ``key`` until ``exp`` (also used for other workers' logouts)."""
+        self._drop(key)
+        if exp is not None:
+            now = time.time()
+            for old in [k for k, e in self._revoked.items() if e <= now]:
+                del self._revoked[old]
+            self._revoked[key] = exp
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {'size': len(self._claims), 'max_size': self.max_size, 'hits': self.hits, 'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0, 'expired': self.expired,
+                'invalidated': self.invalidated, 'revoked': len(self._revoked), 'revoked_hits': self.revoked_hits}
+
+
+TOKEN_CACHE = TokenCache(config.TOKEN_CACHE_SIZE)
+
+
+def decode_access_token(token: str) -> Optional[Dict[str, Any]]:
+    """Verified claims for ``token``, from TOKEN_CACHE when possible; None if revoked."""
+    key = TokenCache.digest(token)
+    now = time.time()
+    if TOKEN_CACHE.is_revoked(key, now):
         return None
-    # direct key
-    if s in CAREER_DOMAINS_MAP:
-        return s
-    lower_s = s.lower()
-    # exact display name
-    if lower_s in DISPLAY_NAME_TO_KEY:
-        return DISPLAY_NAME_TO_KEY[lower_s]
-    # normalize common punctuation
-    candidate = re.sub(r'[\-\.\/\&]', ' ', lower_s)
-    candidate = re.sub(r'\s+', '_', candidate).strip('_')
-    if candidate in CAREER_DOMAINS_MAP:
-        return candidate
-    # substring match
-    for name, key in DISPLAY_NAME_TO_KEY.items():
-        if lower_s in name or name in lower_s:
-            return key
-    # token overlap scoring
-    tokens = set(re.findall(r'\w+', lower_s))
-    best_key = None
-    best_score = 0
-    for key, v in CAREER_DOMAINS_MAP.items():
-        name_tokens = set(re.findall(r'\w+', v['name'].lower()))
-        score = len(tokens & name_tokens)
-        if score > best_score:
-            best_score = score
-            best_key = key
-    if best_score > 0:
-        logger.info(f"Resolved career goal '{input_value}' -> '{best_key}' (score={best_score})")
-        return best_key
-    logger.info(f"Could not resolve career goal: {input_value}")
-    return None
-
-async def extract_career_goal_from_request(request: Request, provided: Optional[str]) -> Optional[str]:
-    """Extract career goal from multiple places: provided, query, json, form."""
-    if provided:
-        v = str(provided).strip()
-        if v:
-            return v
-    # query params
-    for qk in ('career_goal', 'domain', 'career', 'selected_domain', 'domain_key'):
-        q = request.query_params.get(qk)
-        if q:
-            return q
-    # try JSON
+    claims = TOKEN_CACHE.get(key, now)
+    if claims is None:
+        claims = jwt.decode(token, config.SECRET_KEY, algorithms=[config.ALGORITHM])
+        TOKEN_CACHE.put(key, claims)
+    return claims
+
+
+async def sync_revocations() -> None:
+    """Apply logouts recorded by other worker processes to this process's TOKEN_CACHE."""
+    cursor = 0
+    while True:
+        try:
+            rows, cursor = await storage.revocations_since(cursor)
+            for digest, exp in rows:
+                TOKEN_CACHE.revoke(digest, exp)
+        except Exception as e:
+            logger.warning(f"Revocation sync failed: {e}")
+        await asyncio.sleep(config.REVOCATION_POLL_SECONDS)
+
+
+@app.on_event("startup")
+async def start_revocation_sync():
+    if storage.shared:
+        BACKGROUND_TASKS.append(asyncio.create_task(sync_revocations()))
+
+
+async def get_current_user(request: Request) -> Optional[Dict]:
+    """Get current authenticated user from token"""
     try:
-        ct = request.headers.get('content-type', '')
-        if 'application/json' in ct:
-            body = await request.json()
-            if isinstance(body, dict):
-                for key in ('career_goal', 'career', 'domain', 'domain_key', 'selected_domain', 'careerGoal', 'career_domain'):
-                    val = body.get(key)
-                    if val:
-                        return str(val)
-    except Exception:
-        pass
-    # try form
+        token = request.cookies.get("access_token")
+        if not token:
+            return None
+        
+        payload = decode_access_token(token)
+        username = payload.get("sub") if payload else None
+        
+        if not username:
+            return None
+        
+        return await storage.get_user(username)
+    except jwt.ExpiredSignatureError:
+        logger.warning("Token expired")
+        return None
+    except Exception as e:
+        logger.warning(f"Invalid token or error decoding: {e}")
+        return None
+
+# ============================================================================
+# SKILL ANALYSIS ENGINE
+# ============================================================================
+
+class SkillMatcher:
+    """Interned skill vocabulary with every domain's skills as a precomputed bitmask.
+
+    A user's skills become one integer mask, so matched/missing/overlap for a
+    domain is a single AND + popcount and scoring all domains is one pass over
+    (key, mask) pairs.
+    """
+
+    def __init__(self, domains: Dict[str, Dict[str, Any]], demand: Dict[str, float],
+                 canonicalizer: SkillCanonicalizer):
+        # bit positions are assigned to canonical skill names, so 'nodejs' and 'node.js' share one
+        self.skill_ids: Dict[str, int] = {}
+        self.skill_names: List[str] = []
+        self.domain_masks: List[tuple] = []
+        # per domain: [(skill as listed, bit)] in curated order and in market-demand order
+        self.domain_bits: Dict[str, List[tuple]] = {}
+        self.demand_bits: Dict[str, List[tuple]] = {}
+        canonical_demand = {canonicalizer.canonical(name): w for name, w in demand.items()}
+        for key, domain in domains.items():
+            canonical = [canonicalizer.canonical(s) for s in domain.get('skills', [])]
+            bits = [(s, 1 << self._intern(c)) for s, c in zip(domain.get('skills', []), canonical)]
+            mask = 0
+            for _, bit in bits:
+                mask |= bit
+            self.domain_bits[key] = bits
+            self.demand_bits[key] = [bits[i] for i in sorted(
+                range(len(bits)), key=lambda i: -canonical_demand.get(canonical[i], 0.0))]
+            self.domain_masks.append((key, mask))
+
+    def _intern(self, name: str) -> int:
+        sid = self.skill_ids.get(name)
+        if sid is None:
+            sid = self.skill_ids[name] = len(self.skill_names)
+            self.skill_names.append(name)
+        return sid
+
+    def mask_of(self, tokens) -> int:
+        """Bitmask of the known skills among canonical ``tokens``."""
+        mask = 0
+        ids = self.skill_ids
+        for token in tokens:
+            sid = ids.get(token)
+            if sid is not None:
+                mask |= 1 << sid
+        return mask
+
+    def split(self, key: str, user_mask: int, by_demand: bool = False):
+        """(matched, missing) skill names for one domain, in curated or demand order."""
+        matched, missing = [], []
+        for skill, bit in (self.demand_bits if by_demand else self.domain_bits).get(key, []):
+            (matched if user_mask & bit else missing).append(skill)
+        return matched, missing
+
+    def overlap_scores(self, user_mask: int) -> Dict[str, int]:
+        """Number of shared skills with every domain, in domain order."""
+        return {key: (mask & user_mask).bit_count() for key, mask in self.domain_masks}
+
+    def best_domain(self, user_mask: int):
+        """(domain key, overlap) of the first domain with the largest overlap; (None, 0) if none."""
+        best_key, best_score = None, 0
+        for key, mask in self.domain_masks:
+            score = (mask & user_mask).bit_count()
+            if score > best_score:
+                best_key, best_score = key, score
+        return best_key, best_score
+
+
+SKILL_MATCHER = SkillMatcher(CAREER_DOMAINS_MAP, SKILL_DEMAND, SKILLS)
+
+# (minimum CGPA, bonus points), highest band first
+CGPA_BONUS_BANDS = [(9.0, 15), (8.0, 10), (7.0, 5), (6.0, 2)]
+
+# (minimum adjusted score, readiness, timeline, action), highest band first
+READINESS_BANDS = [
+    (80, "High", "1-3 months", "Ready to apply now"),
+    (60, "Medium-High", "3-6 months", "Close to job-ready"),
+    (40, "Medium", "6-12 months", "Focused learning needed"),
+    (20, "Low-Medium", "12-18 months", "Significant upskilling required"),
+    (None, "Low", "18-24 months", "Start from fundamentals"),
+]
+
+def cgpa_bonus_for(cgpa: float) -> int:
+    """Bonus points added to the skill match for a CGPA."""
+    for minimum, bonus in CGPA_BONUS_BANDS:
+        if cgpa >= minimum:
+            return bonus
+    return 0
+
+def readiness_for(adjusted_score: float):
+    """(readiness, timeline, action) for an adjusted match score."""
+    for minimum, readiness, timeline, action in READINESS_BANDS:
+        if minimum is None or adjusted_score >= minimum:
+            return readiness, timeline, action
+
+def analyze_skills(user_skills: str, target_domain: str, cgpa: float) -> Dict[str, Any]:
+    """Advanced skill analysis with CGPA adjustment"""
     try:
-        form = await request.form()
-        for key in ('career_goal', 'career', 'domain', 'career_domain', 'selected_domain', 'careerGoal', 'career_goal_input', 'domain_key'):
-            if key in form:
-                val = form.get(key)
-                if val:
-                    return str(val)
-    except Exception:
-        pass
-    return None
+        if not user_skills or not target_domain:
+            return {}
+        
+        user_mask = SKILL_MATCHER.mask_of(canonical_skill_tokens(user_skills))
+        domain_info = CAREER_DOMAINS_MAP.get(target_domain, {})
+        domain_skills = domain_info.get('skills', [])
+        
+        if not domain_skills:
+            logger.error(f"Domain {target_domain} not found or has no skills")
+            return {}
+        
+        # Calculate matches
+        matched_skills, missing_skills = SKILL_MATCHER.split(target_domain, user_mask)
+        _, missing_by_demand = SKILL_MATCHER.split(target_domain, user_mask, by_demand=True)
+        match_percentage = (len(matched_skills) / len(domain_skills)) * 100 if domain_skills else 0
+        
+        # CGPA bonus
+        cgpa_bonus = cgpa_bonus_for(cgpa)
+        
+        adjusted_score = min(100, match_percentage + cgpa_bonus)
+        
+        # Readiness level
+        readiness, timeline, action = readiness_for(adjusted_score)
+        
+        logger.info(f"Analysis completed for domain: {target_domain}, Score: {adjusted_score}")
+        
+        return {
+            'domain': domain_info.get('name', ''),
+            'matched_skills': matched_skills,
+            'missing_skills': missing_skills,
+            'missing_skills_by_demand': missing_by_demand,
+            'skills_count': {
+                'total': len(domain_skills),
+                'have': len(matched_skills),
+                'need': len(missing_skills),
+                'percentage_have': round(match_percentage, 1)
+            },
+            'match_percentage': round(match_percentage, 1),
+            'adjusted_match': round(adjusted_score, 1),
+            'cgpa_adjustment': cgpa_bonus,
+            'cgpa_score': cgpa,
+            'readiness_level': readiness,
+            'estimated_timeline': timeline,
+            'action_required': action,
+            'salary_info': {
+                'entry_level': domain_info.get('entry_level', ''),
+                'mid_level': domain_info.get('mid_level', ''),
+                'senior_level': domain_info.get('senior_level', ''),
+            },
+            'domain_info': {
+                'growth_potential': domain_info.get('growth', 0),
+                'competition': domain_info.get('competition', 'Medium'),
+                'avg_job_openings': domain_info.get('avg_job_openings', 0),
+                'top_companies': domain_info.get('top_companies', []),
+                'required_projects': domain_info.get('required_projects', []),
+                'category': domain_info.get('category', 'Technology'),
+            }
+        }
+    except Exception as e:
+        logger.error(f"Error in skill analysis: {e}")
+        return {}
 
 # ============================================================================
-# PYDANTIC MODELS
+# ANALYSIS RESULT CACHE
 # ============================================================================
 
-class UserCreate(BaseModel):
-    """User creation model"""
-    username: str
-    email: str
-    password: str
-    full_name: str
+DOMAIN_MAP_VERSION = next(_DATA_VERSIONS)
+
+
+def domains_changed() -> None:
+    """Call after mutating CAREER_DOMAINS_MAP so cached analyses are dropped."""
+    global DOMAIN_MAP_VERSION
+    DOMAIN_MAP_VERSION = next(_DATA_VERSIONS)
+
+
+def data_version() -> tuple:
+    return CATALOG.version, DOMAIN_MAP_VERSION, SKILL_RANKING.version, DOMAIN_RANKING.version
+
+
+class AnalysisResultCache:
+    """Content-addressed LRU of /analyze payloads with a single-flight guard.
+
+    Keys are (user skill mask, CGPA bonus, domain key): the mask is the
+    canonical skill set as SKILL_MATCHER sees it, so skills outside every
+    domain (which cannot change the result) do not split the cache. The whole
+    cache is dropped when data_version() moves. Concurrent misses on one key
+    await the first computation instead of repeating it.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: 'OrderedDict[tuple, Dict[str, Any]]' = OrderedDict()
+        self._inflight: Dict[tuple, 'asyncio.Future'] = {}
+        self._version = data_version()
+        self.hits = self.misses = self.coalesced = self.invalidations = 0
+
+    def _check_version(self) -> None:
+        version = data_version()
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+            self.invalidations += 1
+
+    async def get_or_compute(self, key: tuple, compute) -> Dict[str, Any]:
+        """Cached payload for ``key``; ``compute`` is a sync or async zero-arg callable."""
+        if not self.max_size:
+            result = compute()
+            return await result if asyncio.iscoroutine(result) else result
+        self._check_version()
+        payload = self._entries.get(key)
+        if payload is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return payload
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        version = self._version
+        try:
+            result = compute()
+            payload = await result if asyncio.iscoroutine(result) else result
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        finally:
+            del self._inflight[key]
+        future.set_result(payload)
+        if version == data_version():
+            self._entries[key] = payload
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return payload
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {'size': len(self._entries), 'max_size': self.max_size, 'hits': self.hits, 'misses': self.misses,
+                'coalesced': self.coalesced, 'hit_rate': round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+                'invalidations': self.invalidations}
+
+
+ANALYSIS_CACHE = AnalysisResultCache(config.ANALYSIS_CACHE_SIZE)
+
+
+def build_analysis_payload(skills: str, career_goal_key: str, cgpa: float,
+                           best_domain: Optional[str], best_score: int) -> Dict[str, Any]:
+    """Everything /analyze renders except per-user fields; shared through ANALYSIS_CACHE, so never mutate it."""
+    clock = StageClock()
+    # run analysis (may return {} on edge cases)
+    skill_analysis = analyze_skills(skills, career_goal_key, cgpa)
+    clock.mark('analyze_skills')
+
+    # Ensure skill_analysis has safe defaults so templates never throw attribute errors
+    domain_info = CAREER_DOMAINS_MAP.get(career_goal_key, {})
+    safe_defaults = {
+        'domain': domain_info.get('name', ''),
+        'matched_skills': skill_analysis.get('matched_skills', []) if isinstance(skill_analysis, dict) else [],
+        'missing_skills': skill_analysis.get('missing_skills', []) if isinstance(skill_analysis, dict) else domain_info.get('skills', [])[:],
+        'skills_count': skill_analysis.get('skills_count', {'total': len(domain_info.get('skills', [])),
+                                                           'have': len(skill_analysis.get('matched_skills', [])) if isinstance(skill_analysis, dict) else 0,
+                                                           'need': len(skill_analysis.get('missing_skills', [])) if isinstance(skill_analysis, dict) else len(domain_info.get('skills', []))}),
+        'match_percentage': skill_analysis.get('match_percentage', 0) if isinstance(skill_analysis, dict) else 0,
+        'adjusted_match': skill_analysis.get('adjusted_match', 0) if isinstance(skill_analysis, dict) else 0,
+        'cgpa_adjustment': skill_analysis.get('cgpa_adjustment', 0) if isinstance(skill_analysis, dict) else 0,
+        'cgpa_score': skill_analysis.get('cgpa_score', cgpa) if isinstance(skill_analysis, dict) else cgpa,
+        'readiness_level': skill_analysis.get('readiness_level', 'Unknown') if isinstance(skill_analysis, dict) else 'Unknown',
+        'estimated_timeline': skill_analysis.get('estimated_timeline', 'N/A') if isinstance(skill_analysis, dict) else 'N/A',
+        'action_required': skill_analysis.get('action_required', '') if isinstance(skill_analysis, dict) else '',
+        'salary_info': skill_analysis.get('salary_info', {
+            'entry_level': domain_info.get('entry_level', ''),
+            'mid_level': domain_info.get('mid_level', ''),
+            'senior_level': domain_info.get('senior_level', '')
+        }),
+        'domain_info': skill_analysis.get('domain_info', {
+            'growth_potential': domain_info.get('growth', 0),
+            'competition': domain_info.get('competition', 'Medium'),
+            'avg_job_openings': domain_info.get('avg_job_openings', 0),
+            'top_companies': domain_info.get('top_companies', []),
+            'required_projects': domain_info.get('required_projects', []),
+            'category': domain_info.get('category', '')
+        })
+    }
+
+    # If analyze_skills returned a dict, merge any extra keys
+    if isinstance(skill_analysis, dict):
+        for k, v in skill_analysis.items():
+            if k not in safe_defaults:
+                safe_defaults[k] = v
+
+    skill_analysis = safe_defaults
+
+    # Provide "salary" key (templates expect analysis.salary.entry etc.)
+    # keep both keys for compatibility: 'salary_info' and 'salary'
+    salary_info = skill_analysis.get('salary_info', {})
+    skill_analysis['salary'] = {
+        'entry': salary_info.get('entry_level') or salary_info.get('entry') or domain_info.get('entry_level', ''),
+        'mid': salary_info.get('mid_level') or salary_info.get('mid') or domain_info.get('mid_level', ''),
+        'senior': salary_info.get('senior_level') or salary_info.get('senior') or domain_info.get('senior_level', '')
+    }
+
+    # --------------------------
+    # map missing skills -> recommended courses
+    # --------------------------
+    skill_course_map = {}
+    for ms in skill_analysis.get('missing_skills', []) or []:
+        skill_course_map[ms] = top_courses_for_skill(ms, top_n=3)
+    clock.mark('course_map')
+
+    # --------------------------
+    # simple level roadmap grouping
+    # --------------------------
+    missing = skill_analysis.get('missing_skills', []) or []
+    n = len(missing)
+    level_roadmap = {'Foundation': [], 'Core': [], 'Advanced': []}
+    if n > 0:
+        f_cut = ceil(n * 0.3)
+        c_cut = ceil(n * 0.7)
+        for idx, sname in enumerate(missing):
+            if idx < f_cut:
+                level_roadmap['Foundation'].append(sname)
+            elif idx < c_cut:
+                level_roadmap['Core'].append(sname)
+            else:
+                level_roadmap['Advanced'].append(sname)
+
+    # --------------------------
+    # suggest best domain based on user's current skills (overlap)
+    # --------------------------
+    suggested_domain_name = CAREER_DOMAINS_MAP.get(best_domain, {}).get('name') if best_domain else None
+
+    return {
+        'skill_analysis': skill_analysis,
+        'skill_course_map': skill_course_map,
+        'level_roadmap': level_roadmap,
+        'suggested_domain_name': suggested_domain_name,
+        'suggested_domain_score': best_score,
+    }
+
+# ============================================================================
+# DOMAIN PAGE CACHE
+# ============================================================================
+
+# user fields resusts_advanced.html may print; everything else on the page is per-domain
+DOMAIN_PAGE_USER_FIELDS = ('username', 'full_name', 'email')
+_USER_SLOT_RE = re.compile('\x00(' + '|'.join(DOMAIN_PAGE_USER_FIELDS) + ')\x00')
+
+
+def build_domain_view(domain: Dict[str, Any]) -> Dict[str, Any]:
+    """The /domain/{key} template context minus request/user."""
+    # Build a simple "analysis" (roadmap-ready) structure expected by template
+    skills = domain.get('skills', [])
+    matched_skills = []  # user-specific matched skills would come from user profile/analysis
+    missing_skills = skills.copy()
+
+    analysis = {
+        'adjusted_match': 0,
+        'matched_skills': matched_skills,
+        'missing_skills': missing_skills,
+        'readiness_level': "Not started",
+        'timeline': "Depends on learning plan",
+        'growth': domain.get('growth', 0),
+        'job_openings': domain.get('avg_job_openings', 0),
+        'salary': {
+            'entry': domain.get('entry_level', ''),
+            'mid': domain.get('mid_level', ''),
+            'senior': domain.get('senior_level', '')
+        },
+        'top_companies': domain.get('top_companies', []),
+        'required_projects': domain.get('required_projects', []),
+        'domain': domain.get('name', '')
+    }
+
+    # Jobs: create helpful external search links (LinkedIn, Indeed, Google Jobs)
+    jobs = []
+    # General domain job search
+    q = f"{domain.get('name')} jobs"
+    jobs.append({
+        'title': f"{domain.get('name')} roles (Search)",
+        'company': 'Various',
+        'location': 'Remote / Multiple locations',
+        'experience': 'Entry - Senior',
+        'salary': domain.get('entry_level', ''),
+        'skills': skills[:5],
+        'description': f"Search live job openings for {domain.get('name')}",
+        'posting_url': f"https://www.linkedin.com/jobs/search/?keywords={quote_plus(q)}"
+    })
+    # per top company quick searches
+    for comp in domain.get('top_companies', [])[:6]:
+        comp_q = f"{domain.get('name')} {comp} jobs"
+        jobs.append({
+            'title': f"Jobs at {comp}",
+            'company': comp,
+            'location': 'See postings',
+            'experience': 'Varies',
+            'salary': '',
+            'skills': skills[:4],
+            'description': f"Openings at {comp} for {domain.get('name')}",
+            'posting_url': f"https://www.linkedin.com/jobs/search/?keywords={quote_plus(comp_q)}"
+        })
+
+    # Courses: a short list of top courses matching the domain skills,
+    # by rating desc then price asc (better rating, cheaper first)
+    courses = CATALOG.courses(DOMAIN_RANKING.for_skills(skills, 8))
+
+    return {'analysis': analysis, 'courses': courses, 'jobs': jobs}
+
+
+class DomainPageCache:
+    """Pre-rendered /domain/{key} pages, split around the user fields.
+
+    Each page is rendered once with placeholder user fields and stored as
+    alternating static chunks and field names; serving a request only escapes
+    and splices the viewer's own fields. Everything is rebuilt when
+    data_version() moves (catalog reload/add or domains_changed()).
+    """
+
+    def __init__(self, template_name: str):
+        self.template_name = template_name
+        self._pages: Dict[str, tuple] = {}   # key -> (parts, n_courses, n_jobs)
+        self._version = None
+        self.hits = self.rebuilds = 0
+
+    def rebuild(self) -> None:
+        started = time.perf_counter()
+        template = templates.get_template(self.template_name)
+        placeholder = {f: f"\x00{f}\x00" for f in DOMAIN_PAGE_USER_FIELDS}
+        pages = {}
+        for key, domain in CAREER_DOMAINS_MAP.items():
+            view = build_domain_view(domain)
+            rendered = template.render(user=placeholder, **view)
+            pages[key] = (_USER_SLOT_RE.split(rendered), len(view['courses']), len(view['jobs']))
+        self._pages = pages
+        self._version = data_version()
+        self.rebuilds += 1
+        logger.info(f"Domain pages rendered: {len(pages)} in {time.perf_counter() - started:.3f}s")
+
+    def render(self, domain_key: str, user: Dict[str, Any]) -> Optional[tuple]:
+        """(html, n_courses, n_jobs) for ``user``, or None for an unknown domain."""
+        if self._version != data_version():
+            self.rebuild()
+        page = self._pages.get(domain_key)
+        if page is None:
+            return None
+        parts, n_courses, n_jobs = page
+        self.hits += 1
+        # odd-indexed parts are field names captured by the split
+        return ''.join(part if i % 2 == 0 else str(escape(user.get(part) or ''))
+                       for i, part in enumerate(parts)), n_courses, n_jobs
+
+    def stats(self) -> Dict[str, Any]:
+        return {'pages': len(self._pages), 'hits': self.hits, 'rebuilds': self.rebuilds}
+
+
+DOMAIN_PAGES = DomainPageCache("resusts_advanced.html")
+DOMAIN_PAGES.rebuild()
+
+# ============================================================================
+# BATCH COHORT ANALYSIS
+# ============================================================================
+
+BATCH_CHUNK_ROWS = 10000
+BATCH_GOAL_KEYS = ('career_goal', 'career', 'domain', 'domain_key', 'selected_domain', 'careerGoal', 'career_domain')
+BATCH_FIELDS = ['row', 'career_goal', 'domain', 'matched', 'total', 'match_percentage', 'cgpa_adjustment',
+                'adjusted_match', 'readiness_level', 'estimated_timeline', 'action_required',
+                'best_fit_domain', 'best_fit_score', 'error']
+
+
+def iter_batch_rows(lines, fmt: str):
+    """Yield {'skills', 'cgpa', 'career_goal'} dicts from CSV or JSONL lines."""
+    if fmt == 'csv':
+        for row in csv.DictReader(lines):
+            row = {(k or '').strip(): v for k, v in row.items()}
+            yield {
+                'skills': row.get('skills') or row.get('user_skills') or row.get('skills_input') or '',
+                'cgpa': row.get('cgpa') or row.get('score') or '',
+                'career_goal': next((row[k] for k in BATCH_GOAL_KEYS if row.get(k)), ''),
+            }
+        return
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            obj = json.loads(line)
+        except ValueError:
+            obj = None
+        if not isinstance(obj, dict):
+            yield {'error': 'Invalid JSON row'}
+            continue
+        yield {
+            'skills': obj.get('skills') or obj.get('user_skills') or obj.get('skills_input') or '',
+            'cgpa': obj.get('cgpa') if obj.get('cgpa') is not None else obj.get('score'),
+            'career_goal': next((obj[k] for k in BATCH_GOAL_KEYS if obj.get(k)), ''),
+        }
+
+
+class BatchAnalyzer:
+    """Cohort-scale analyze_skills + goal inference as NumPy array operations.
+
+    Students become a (rows x skills) 0/1 matrix and domains a (skills x
+    domains) matrix, so one matrix product yields every student's overlap with
+    every domain. Percentages, CGPA-adjusted scores and readiness bands are
+    gathered from per-domain lookup tables built with analyze_skills' own
+    helpers, so the numbers are identical to the single-student path.
+    """
+
+    def __init__(self, matcher: SkillMatcher, domains: Dict[str, Dict[str, Any]]):
+        self.matcher = matcher
+        self.keys = [key for key, _ in matcher.domain_masks]
+        self.key_index = {key: i for i, key in enumerate(self.keys)}
+        self.names = [domains[key].get('name', '') for key in self.keys]
+        n_skills, n_domains = len(matcher.skill_names), len(self.keys)
+
+        # multiplicity counts give analyze_skills' list semantics, 0/1 gives inference's set semantics
+        counts = np.zeros((n_skills, n_domains), dtype=np.int32)
+        for d, key in enumerate(self.keys):
+            for _, bit in matcher.domain_bits[key]:
+                counts[bit.bit_length() - 1, d] += 1
+        self.domain_counts = counts
+        self.domain_sets = (counts > 0).astype(np.int32)
+        self.has_duplicates = bool((counts > 1).any())
+        self.totals = counts.sum(axis=0)
+
+        # lookup tables indexed [domain, matched, cgpa band]
+        width = int(self.totals.max(initial=0)) + 1
+        bands = [0] + sorted(bonus for _, bonus in CGPA_BONUS_BANDS)
+        self.band_bonus = np.array(bands, dtype=np.int32)
+        self.band_edges = np.array(sorted(minimum for minimum, _ in CGPA_BONUS_BANDS), dtype=np.float64)
+        self.readiness_labels = [band[1:] for band in READINESS_BANDS]
+        self.pct_table = np.zeros((n_domains, width), dtype=np.float64)
+        self.adj_table = np.zeros((n_domains, width, len(bands)), dtype=np.float64)
+        self.ready_table = np.zeros((n_domains, width, len(bands)), dtype=np.int8)
+        for d in range(n_domains):
+            total = int(self.totals[d])
+            for k in range(total + 1):
+                pct = (k / total) * 100 if total else 0
+                self.pct_table[d, k] = round(pct, 1)
+                for b, bonus in enumerate(bands):
+                    adjusted = min(100, pct + bonus)
+                    self.adj_table[d, k, b] = round(adjusted, 1)
+                    self.ready_table[d, k, b] = self.readiness_labels.index(readiness_for(adjusted))
+
+    @staticmethod
+    def resolve_goals(rows: List[Dict[str, Any]]) -> Dict[str, Optional[str]]:
+        """Distinct career goals of one chunk -> domain key (GoalResolver is not thread-safe)."""
+        goals: Dict[str, Optional[str]] = {}
+        for row in rows:
+            raw = str(row.get('career_goal') or '').strip()
+            if raw and raw not in goals:
+                goals[raw] = resolve_career_goal(raw)
+        return goals
+
+    def analyze(self, rows: List[Dict[str, Any]], start: int = 0,
+                goals: Optional[Dict[str, Optional[str]]] = None) -> List[Dict[str, Any]]:
+        """Analyze one chunk of parsed rows; ``start`` numbers the output rows.
+
+        ``goals`` is the chunk's resolve_goals() result; pass it when running
+        off the event loop so this method never touches the goal resolver.
+        """
+        if goals is None:
+            goals = self.resolve_goals(rows)
+        n = len(rows)
+        skill_ids = self.matcher.skill_ids
+        member_rows, member_cols = [], []
+        cgpa = np.zeros(n, dtype=np.float64)
+        goal_idx = np.full(n, -1, dtype=np.int64)
+        errors: List[Optional[str]] = [None] * n
+
+        for i, row in enumerate(rows):
+            if row.get('error'):
+                errors[i] = row['error']
+                continue
+            if not str(row.get('skills') or '').strip():
+                errors[i] = 'Please provide your skills'
+                continue
+            try:
+                value = float(row.get('cgpa'))
+            except (TypeError, ValueError):
+                errors[i] = 'CGPA must be a number between 0 and 10'
+                continue
+            if not (0 <= value <= 10):
+                errors[i] = 'CGPA must be between 0 and 10'
+                continue
+            cgpa[i] = value
+            for sid in {skill_ids[t] for t in canonical_skill_tokens(row['skills']) if t in skill_ids}:
+                member_rows.append(i)
+                member_cols.append(sid)
+            key = goals.get(str(row.get('career_goal') or '').strip())
+            if key is not None:
+                goal_idx[i] = self.key_index[key]
+
+        students = np.zeros((n, len(self.matcher.skill_names)), dtype=np.int32)
+        students[member_rows, member_cols] = 1
+        overlap = students @ self.domain_sets
+        best = overlap.argmax(axis=1) if self.keys else np.zeros(n, dtype=np.int64)
+        best_score = overlap[np.arange(n), best] if self.keys else np.zeros(n, dtype=np.int32)
+
+        # explicit goal wins; otherwise the best-overlapping domain if it shares any skill
+        target = np.where(goal_idx >= 0, goal_idx, np.where(best_score > 0, best, -1))
+        valid = (target >= 0) & np.array([e is None for e in errors], dtype=bool)
+        safe_target = np.where(valid, target, 0)
+        matched_counts = students @ self.domain_counts if self.has_duplicates else overlap
+        matched = matched_counts[np.arange(n), safe_target]
+        band = np.searchsorted(self.band_edges, cgpa, side='right')
+        pct = self.pct_table[safe_target, matched]
+        adj = self.adj_table[safe_target, matched, band]
+        ready = self.ready_table[safe_target, matched, band]
+
+        out = []
+        for i in range(n):
+            result = dict.fromkeys(BATCH_FIELDS)
+            result['row'] = start + i
+            if best_score[i] > 0:
+                result['best_fit_domain'] = self.keys[best[i]]
+                result['best_fit_score'] = int(best_score[i])
+            else:
+                result['best_fit_score'] = 0
+            if errors[i] is None and not valid[i]:
+                errors[i] = 'Invalid career goal - please select a domain or type its name'
+            if errors[i] is not None:
+                result['error'] = errors[i]
+                out.append(result)
+                continue
+            t = int(target[i])
+            readiness, timeline, action = self.readiness_labels[ready[i]]
+            result.update({
+                'career_goal': self.keys[t],
+                'domain': self.names[t],
+                'matched': int(matched[i]),
+                'total': int(self.totals[t]),
+                'match_percentage': float(pct[i]),
+                'cgpa_adjustment': int(self.band_bonus[band[i]]),
+                'adjusted_match': float(adj[i]),
+                'readiness_level': readiness,
+                'estimated_timeline': timeline,
+                'action_required': action,
+            })
+            out.append(result)
+        return out
 
-class SkillAnalysisRequest(BaseModel):
-    """Skill analysis request model"""
-    skills: str
-    cgpa: float
-    career_goal: str
+    def stream(self, rows, chunk_rows: int = BATCH_CHUNK_ROWS):
+        """Analyze an iterable of rows chunk by chunk, yielding result dicts."""
+        chunk, start = [], 0
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_rows:
+                yield from self.analyze(chunk, start)
+                start += len(chunk)
+                chunk = []
+        if chunk:
+            yield from self.analyze(chunk, start)
 
-# ============================================================================
-# SECURITY UTILITIES
-# ============================================================================
 
-def hash_password(password: str) -> str:
-    """Hash password using SHA-256"""
-    return hashlib.sha256(password.encode()).hexdigest()
+def format_batch_results(results, fmt: str, header: bool = True):
+    """Serialize batch results as NDJSON lines or CSV text, chunk by chunk."""
+    if fmt == 'csv':
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, fieldnames=BATCH_FIELDS)
+        if header:
+            writer.writeheader()
+        for i, result in enumerate(results, 1):
+            writer.writerow(result)
+            if i % 1000 == 0:
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+        yield buf.getvalue()
+        return
+    for result in results:
+        yield json.dumps(result) + '\n'
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify hashed password"""
-    return hash_password(plain_password) == hashed_password
 
-def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
-    """Create JWT access token"""
-    to_encode = data.copy()
-    expire = datetime.utcnow() + (expires_delta or timedelta(minutes=config.ACCESS_TOKEN_EXPIRE_MINUTES))
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, config.SECRET_KEY, algorithm=config.ALGORITHM)
-    return encoded_jwt
+async def stream_batch_results(analyzer: BatchAnalyzer, rows, fmt: str, chunk_rows: int = BATCH_CHUNK_ROWS):
+    """Async BatchAnalyzer.stream + format_batch_results for the API.
+
+    Parsing, the matrix work and serialization run in the default executor one
+    chunk at a time; goals are resolved here on the event loop, the only
+    thread that uses the shared GOAL_RESOLVER.
+    """
+    loop = asyncio.get_running_loop()
+    start = 0
+    while True:
+        chunk = await loop.run_in_executor(None, list, itertools.islice(rows, chunk_rows))
+        if not chunk:
+            break
+        goals = analyzer.resolve_goals(chunk)
+        yield await loop.run_in_executor(
+            None, lambda: ''.join(format_batch_results(analyzer.analyze(chunk, start, goals), fmt, start == 0)))
+        start += len(chunk)
+    if start == 0:
+        yield ''.join(format_batch_results([], fmt))
 
-async def get_current_user(request: Request) -> Optional[Dict]:
-    """Get current authenticated user from token"""
-    try:
-        token = request.cookies.get("access_token")
-        if not token:
-            return None
-        
-        payload = jwt.decode(token, config.SECRET_KEY, algorithms=[config.ALGORITHM])
-        username = payload.get("sub")
-        
-        if not username or username not in users_db:
-            return None
-        
-        return users_db[username]
-    except jwt.ExpiredSignatureError:
-        logger.warning("Token expired")
-        return None
-    except Exception as e:
-        logger.warning(f"Invalid token or error decoding: {e}")
-        return None
+
+BATCH_ANALYZER = BatchAnalyzer(SKILL_MATCHER, CAREER_DOMAINS_MAP)
 
 # ============================================================================
-# SKILL ANALYSIS ENGINE
+# DATA RELOAD
 # ============================================================================
 
-def analyze_skills(user_skills: str, target_domain: str, cgpa: float) -> Dict[str, Any]:
-    """Advanced skill analysis with CGPA adjustment"""
-    try:
-        if not user_skills or not target_domain:
-            return {}
-        
-        user_skills_list = [skill.strip().lower() for skill in user_skills.split(',') if skill.strip()]
-        domain_info = CAREER_DOMAINS_MAP.get(target_domain, {})
-        domain_skills = domain_info.get('skills', [])
-        
-        if not domain_skills:
-            logger.error(f"Domain {target_domain} not found or has no skills")
-            return {}
-        
-        # Calculate matches
-        matched_skills = [s for s in domain_skills if s in user_skills_list]
-        missing_skills = [s for s in domain_skills if s not in user_skills_list]
-        match_percentage = (len(matched_skills) / len(domain_skills)) * 100 if domain_skills else 0
-        
-        # CGPA bonus
-        cgpa_bonus = 0
-        if cgpa >= 9.0:
-            cgpa_bonus = 15
-        elif cgpa >= 8.0:
-            cgpa_bonus = 10
-        elif cgpa >= 7.0:
-            cgpa_bonus = 5
-        elif cgpa >= 6.0:
-            cgpa_bonus = 2
-        
-        adjusted_score = min(100, match_percentage + cgpa_bonus)
-        
-        # Readiness level
-        if adjusted_score >= 80:
-            readiness, timeline, action = "High", "1-3 months", "Ready to apply now"
-        elif adjusted_score >= 60:
-            readiness, timeline, action = "Medium-High", "3-6 months", "Close to job-ready"
-        elif adjusted_score >= 40:
-            readiness, timeline, action = "Medium", "6-12 months", "Focused learning needed"
-        elif adjusted_score >= 20:
-            readiness, timeline, action = "Low-Medium", "12-18 months", "Significant upskilling required"
-        else:
-            readiness, timeline, action = "Low", "18-24 months", "Start from fundamentals"
-        
-        logger.info(f"Analysis completed for domain: {target_domain}, Score: {adjusted_score}")
-        
-        return {
-            'domain': domain_info.get('name', ''),
-            'matched_skills': matched_skills,
-            'missing_skills': missing_skills,
-            'skills_count': {
-                'total': len(domain_skills),
-                'have': len(matched_skills),
-                'need': len(missing_skills),
-                'percentage_have': round(match_percentage, 1)
-            },
-            'match_percentage': round(match_percentage, 1),
-            'adjusted_match': round(adjusted_score, 1),
-            'cgpa_adjustment': cgpa_bonus,
-            'cgpa_score': cgpa,
-            'readiness_level': readiness,
-            'estimated_timeline': timeline,
-            'action_required': action,
-            'salary_info': {
-                'entry_level': domain_info.get('entry_level', ''),
-                'mid_level': domain_info.get('mid_level', ''),
-                'senior_level': domain_info.get('senior_level', ''),
-            },
-            'domain_info': {
-                'growth_potential': domain_info.get('growth', 0),
-                'competition': domain_info.get('competition', 'Medium'),
-                'avg_job_openings': domain_info.get('avg_job_openings', 0),
-                'top_companies': domain_info.get('top_companies', []),
-                'required_projects': domain_info.get('required_projects', []),
-                'category': domain_info.get('category', 'Technology'),
-            }
-        }
-    except Exception as e:
-        logger.error(f"Error in skill analysis: {e}")
-        return {}
+def reload_data(catalog: Optional[CourseCatalog] = None, domains: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+    """Swap in a course catalog and/or domain map and rebuild everything derived from them.
+
+    Result and page caches key on data_version() and refresh themselves.
+    """
+    global CATALOG, SKILLS, COURSE_INDEX, COURSE_SEARCH, COURSE_TEXT, CAREER_DOMAINS_MAP, DISPLAY_NAME_TO_KEY
+    global SKILL_RANKING, DOMAIN_RANKING
+    global GOAL_RESOLVER, SKILL_MATCHER, BATCH_ANALYZER
+    started = time.perf_counter()
+    if catalog is not None:
+        CATALOG = catalog
+    if domains is not None:
+        CAREER_DOMAINS_MAP = domains
+    SKILLS = build_skill_canonicalizer(CATALOG)
+    COURSE_INDEX = CourseIndex(CATALOG, SKILLS)
+    COURSE_SEARCH = CourseSearch(CATALOG)
+    COURSE_TEXT = CourseTextIndex(CATALOG)
+    SKILL_RANKING = RankedCourses(CATALOG, COURSE_INDEX, SKILL_RANKING.ranking)
+    DOMAIN_RANKING = RankedCourses(CATALOG, COURSE_INDEX, DOMAIN_RANKING.ranking)
+    DISPLAY_NAME_TO_KEY = {v['name'].lower(): k for k, v in CAREER_DOMAINS_MAP.items()}
+    GOAL_RESOLVER = GoalResolver(CAREER_DOMAINS_MAP)
+    SKILL_MATCHER = SkillMatcher(CAREER_DOMAINS_MAP, SKILL_DEMAND, SKILLS)
+    BATCH_ANALYZER = BatchAnalyzer(SKILL_MATCHER, CAREER_DOMAINS_MAP)
+    domains_changed()
+    logger.info(f"Data reloaded: {len(CATALOG)} courses, {len(CAREER_DOMAINS_MAP)} domains "
+                f"in {time.perf_counter() - started:.2f}s")
 
 # ============================================================================
 # ROUTES - AUTHENTICATION
@@ -922,11 +4318,17 @@ async def login_page(request: Request):
 async def login(username: str = Form(...), password: str = Form(...)):
 	"""Handle login - return JSONResponse with cookie set"""
 	try:
-		user = users_db.get(username)
+		user = await storage.get_user(username)
 		
-		if not user or not verify_password(password, user.get('hashed_password', '')):
+		# unknown names still run the KDF once (see dummy_password_hash)
+		stored = (user.get('hashed_password') if user else None) or dummy_password_hash()
+		ok, new_hash = await PASSWORDS.verify(password, stored)
+		if not ok or not user:
 			logger.warning(f"Failed login attempt for user: {username}")
 			raise HTTPException(status_code=401, detail="Invalid username or password")
+		if new_hash:
+			await storage.update_user(username, {'hashed_password': new_hash})
+			logger.info(f"Upgraded password hash for user: {username}")
 		
 		access_token = create_access_token(data={"sub": username})
 		resp = JSONResponse({"success": True, "message": "Login successful"})
@@ -943,6 +4345,8 @@ async def login(username: str = Form(...), password: str = Form(...)):
 		return resp
 	except HTTPException:
 		raise
+	except HashingBusy:
+		raise HTTPException(status_code=503, detail="Server busy, please retry", headers={"Retry-After": "1"})
 	except Exception as e:
 		logger.error(f"Login error: {e}")
 		raise HTTPException(status_code=500, detail="Server error")
@@ -960,7 +4364,7 @@ async def signup(username: str = Form(...), email: str = Form(...),
 				password: str = Form(...), full_name: str = Form(...)):
 	"""Handle signup - return JSONResponse with cookie set"""
 	try:
-		if username in users_db:
+		if await storage.get_user(username):
 			logger.warning(f"Signup attempt with existing username: {username}")
 			raise HTTPException(status_code=400, detail="Username already registered")
 		
@@ -968,13 +4372,15 @@ async def signup(username: str = Form(...), email: str = Form(...),
 			raise HTTPException(status_code=400, detail="Password must be at least 6 characters")
 		
 		# Create user
-		users_db[username] = {
+		created = await storage.create_user({
 			'username': username,
 			'email': email,
 			'full_name': full_name,
-			'hashed_password': hash_password(password),
+			'hashed_password': await PASSWORDS.hash(password),
 			'joined_date': datetime.now().isoformat()
-		}
+		})
+		if not created:
+			raise HTTPException(status_code=400, detail="Username already registered")
 		
 		access_token = create_access_token(data={"sub": username})
 		resp = JSONResponse({"success": True, "message": "Account created successfully"})
@@ -991,13 +4397,20 @@ async def signup(username: str = Form(...), email: str = Form(...),
 		return resp
 	except HTTPException:
 		raise
+	except HashingBusy:
+		raise HTTPException(status_code=503, detail="Server busy, please retry", headers={"Retry-After": "1"})
 	except Exception as e:
 		logger.error(f"Signup error: {e}")
 		raise HTTPException(status_code=500, detail="Server error")
 
 @app.get("/logout")
-async def logout(response: Response):
+async def logout(request: Request):
     """Logout user"""
+    token = request.cookies.get("access_token")
+    if token:
+        exp = TOKEN_CACHE.invalidate(token)
+        if exp is not None:
+            await storage.revoke_token(TokenCache.digest(token), exp)
     response = RedirectResponse(url="/login", status_code=302)
     response.delete_cookie(key="access_token")
     logger.info("User logged out")
@@ -1025,43 +4438,99 @@ async def dashboard(request: Request):
         logger.error(f"Dashboard error: {e}")
         raise HTTPException(status_code=500, detail="Dashboard error")
 
+def render_analysis(request: Request, user: Dict[str, Any], analysis_id: str, record: Dict[str, Any]):
+    """Render a stored analysis record with results.html (defensively)."""
+    skill_analysis = record['skill_analysis']
+    try:
+        return templates.TemplateResponse("results.html", {
+            "request": request,
+            "user": user,
+            "analysis_id": analysis_id,
+            "skills": record['skills'],
+            "cgpa": record['cgpa'],
+            "career_goal": record['career_goal'],
+            "skill_analysis": skill_analysis,
+            "career_domain": CAREER_DOMAINS_MAP.get(record['career_goal'], {}),
+            "missing_skills": skill_analysis.get('missing_skills', []),
+            "skill_course_map": record.get('skill_course_map', {}),
+            "level_roadmap": record.get('level_roadmap', {'Foundation': [], 'Core': [], 'Advanced': []}),
+            "suggested_domain_name": record.get('suggested_domain_name'),
+            "suggested_domain_score": record.get('suggested_domain_score', 0)
+        })
+    except Exception as tpl_err:
+        # log and fallback to the robust advanced results page with safe minimal context
+        logger.error(f"Template render error in results.html: {tpl_err}", exc_info=True)
+        try:
+            return templates.TemplateResponse("resusts_advanced.html", {
+                "request": request,
+                "user": user,
+                "analysis": skill_analysis,
+                "courses": [], 
+                "jobs": []
+            })
+        except Exception as fallback_err:
+            logger.error(f"Fallback render also failed: {fallback_err}", exc_info=True)
+            raise HTTPException(status_code=500, detail="Analysis error")
+
+async def run_analysis(user: Dict[str, Any], skills: str, cgpa: float, raw_goal: Optional[str],
+                       clock: StageClock) -> tuple:
+    """Resolve the goal, analyze and persist; shared by /analyze and /api/v1/analyze. Returns (analysis_id, record)."""
+    career_goal_key = resolve_career_goal(raw_goal) if raw_goal else None
+    clock.mark('resolve_goal')
+
+    # one overlap pass serves both goal inference and the suggested domain
+    user_mask = SKILL_MATCHER.mask_of(canonical_skill_tokens(skills))
+    best_domain, best_score = SKILL_MATCHER.best_domain(user_mask)
+    clock.mark('skill_mask')
+
+    if not career_goal_key:
+        # infer from skills
+        best_key, best_overlap = best_domain, best_score
+        if best_key and best_overlap > 0:
+            career_goal_key = best_key
+            logger.info(f"Inferred career goal from skills -> {career_goal_key} (overlap={best_overlap})")
+
+    if not career_goal_key:
+        raise HTTPException(status_code=400, detail="Invalid career goal - please select a domain or type its name")
+
+    # analysis, course map, roadmap and suggestion depend only on the cache key;
+    # cgpa_score is the one per-user value inside skill_analysis
+    cache_key = (user_mask, cgpa_bonus_for(cgpa), career_goal_key)
+    payload = await ANALYSIS_CACHE.get_or_compute(
+        cache_key, lambda: build_analysis_payload(skills, career_goal_key, cgpa, best_domain, best_score))
+    skill_analysis = dict(payload['skill_analysis'], cgpa_score=cgpa)
+    clock.mark('analysis')
+
+    # persist analysis with everything results.html needs, so it can be re-rendered
+    analysis_id = str(uuid.uuid4())[:8]
+    record = {
+        'user': user['username'],
+        'skills': skills,
+        'cgpa': cgpa,
+        'career_goal': career_goal_key,
+        'skill_analysis': skill_analysis,
+        'skill_course_map': payload['skill_course_map'],
+        'level_roadmap': payload['level_roadmap'],
+        'suggested_domain_name': payload['suggested_domain_name'],
+        'suggested_domain_score': payload['suggested_domain_score'],
+        'timestamp': datetime.now().isoformat()
+    }
+    await storage.save_analysis(analysis_id, record)
+    clock.mark('persist')
+    return analysis_id, record
+
 @app.post("/analyze", response_class=HTMLResponse)
-async def analyze_career(request: Request, skills: Optional[str] = Form(None), cgpa: Optional[float] = Form(None),
-                         career_goal: Optional[str] = Form(None)):
-    """Analyze career skills (accepts form or JSON) - defensive implementation to avoid template errors."""
+async def analyze_career(request: Request, inp: RequestInput = Depends(request_input)):
+    """Analyze career skills (accepts form, multipart or JSON) - defensive implementation to avoid template errors."""
+    clock = StageClock()
     user = await get_current_user(request)
     if not user:
         raise HTTPException(status_code=401, detail="Please login first")
+    clock.mark('auth')
 
     try:
-        # --- gather inputs from JSON/form/query robustly ---
-        body_json = None
-        try:
-            if 'application/json' in request.headers.get('content-type', ''):
-                body_json = await request.json()
-        except Exception:
-            body_json = None
-
-        if not skills or not str(skills).strip():
-            if body_json and isinstance(body_json, dict):
-                skills = body_json.get('skills') or body_json.get('user_skills') or body_json.get('skills_input')
-            if not skills:
-                try:
-                    form = await request.form()
-                    skills = form.get('skills') or form.get('user_skills') or form.get('skills_input')
-                except Exception:
-                    pass
-
-        if cgpa is None:
-            if body_json and isinstance(body_json, dict):
-                cgpa = body_json.get('cgpa')
-            if cgpa is None:
-                try:
-                    form = await request.form()
-                    cgpa = form.get('cgpa') or form.get('score') or form.get('cgpa_input')
-                except Exception:
-                    pass
-
+        skills = inp.first(SKILLS_INPUT_KEYS)
+        cgpa = inp.first(CGPA_INPUT_KEYS)
         try:
             if cgpa is not None and not isinstance(cgpa, float):
                 cgpa = float(cgpa)
@@ -1072,189 +4541,16 @@ async def analyze_career(request: Request, skills: Optional[str] = Form(None), c
             raise HTTPException(status_code=400, detail="Please provide your skills")
         if not (0 <= cgpa <= 10):
             raise HTTPException(status_code=400, detail="CGPA must be between 0 and 10")
+        clock.mark('parse_body')
 
-        # resolve career goal (from many possible inputs)
-        raw_goal = await extract_career_goal_from_request(request, career_goal)
-        if not raw_goal and body_json and isinstance(body_json, dict):
-            for key in ('career_goal', 'career', 'domain', 'domain_key', 'selected_domain', 'careerGoal', 'career_domain'):
-                if key in body_json and body_json.get(key):
-                    raw_goal = str(body_json.get(key))
-                    break
-
-        career_goal_key = resolve_career_goal(raw_goal) if raw_goal else None
-
-        if not career_goal_key:
-            # infer from skills
-            user_tokens = set([s.strip().lower() for s in str(skills).split(",") if s.strip()])
-            best_key = None
-            best_overlap = 0
-            for key, domain in CAREER_DOMAINS_MAP.items():
-                domain_skills = set([s.lower() for s in domain.get('skills', [])])
-                overlap = len(domain_skills & user_tokens)
-                if overlap > best_overlap:
-                    best_overlap = overlap
-                    best_key = key
-            if best_key and best_overlap > 0:
-                career_goal_key = best_key
-                logger.info(f"Inferred career goal from skills -> {career_goal_key} (overlap={best_overlap})")
-            else:
-                if raw_goal:
-                    career_goal_key = resolve_career_goal(raw_goal)
-
-        if not career_goal_key:
-            raise HTTPException(status_code=400, detail="Invalid career goal - please select a domain or type its name")
-
-        # run analysis (may return {} on edge cases)
-        skill_analysis = analyze_skills(skills, career_goal_key, cgpa)
-
-        # Ensure skill_analysis has safe defaults so templates never throw attribute errors
-        domain_info = CAREER_DOMAINS_MAP.get(career_goal_key, {})
-        safe_defaults = {
-            'domain': domain_info.get('name', ''),
-            'matched_skills': skill_analysis.get('matched_skills', []) if isinstance(skill_analysis, dict) else [],
-            'missing_skills': skill_analysis.get('missing_skills', []) if isinstance(skill_analysis, dict) else domain_info.get('skills', [])[:],
-            'skills_count': skill_analysis.get('skills_count', {'total': len(domain_info.get('skills', [])),
-                                                               'have': len(skill_analysis.get('matched_skills', [])) if isinstance(skill_analysis, dict) else 0,
-                                                               'need': len(skill_analysis.get('missing_skills', [])) if isinstance(skill_analysis, dict) else len(domain_info.get('skills', []))}),
-            'match_percentage': skill_analysis.get('match_percentage', 0) if isinstance(skill_analysis, dict) else 0,
-            'adjusted_match': skill_analysis.get('adjusted_match', 0) if isinstance(skill_analysis, dict) else 0,
-            'cgpa_adjustment': skill_analysis.get('cgpa_adjustment', 0) if isinstance(skill_analysis, dict) else 0,
-            'cgpa_score': skill_analysis.get('cgpa_score', cgpa) if isinstance(skill_analysis, dict) else cgpa,
-            'readiness_level': skill_analysis.get('readiness_level', 'Unknown') if isinstance(skill_analysis, dict) else 'Unknown',
-            'estimated_timeline': skill_analysis.get('estimated_timeline', 'N/A') if isinstance(skill_analysis, dict) else 'N/A',
-            'action_required': skill_analysis.get('action_required', '') if isinstance(skill_analysis, dict) else '',
-            'salary_info': skill_analysis.get('salary_info', {
-                'entry_level': domain_info.get('entry_level', ''),
-                'mid_level': domain_info.get('mid_level', ''),
-                'senior_level': domain_info.get('senior_level', '')
-            }),
-            'domain_info': skill_analysis.get('domain_info', {
-                'growth_potential': domain_info.get('growth', 0),
-                'competition': domain_info.get('competition', 'Medium'),
-                'avg_job_openings': domain_info.get('avg_job_openings', 0),
-                'top_companies': domain_info.get('top_companies', []),
-                'required_projects': domain_info.get('required_projects', []),
-                'category': domain_info.get('category', '')
-            })
-        }
-
-        # If analyze_skills returned a dict, merge any extra keys
-        if isinstance(skill_analysis, dict):
-            for k, v in skill_analysis.items():
-                if k not in safe_defaults:
-                    safe_defaults[k] = v
-
-        skill_analysis = safe_defaults
-
-        # Provide "salary" key (templates expect analysis.salary.entry etc.)
-        # keep both keys for compatibility: 'salary_info' and 'salary'
-        salary_info = skill_analysis.get('salary_info', {})
-        skill_analysis['salary'] = {
-            'entry': salary_info.get('entry_level') or salary_info.get('entry') or domain_info.get('entry_level', ''),
-            'mid': salary_info.get('mid_level') or salary_info.get('mid') or domain_info.get('mid_level', ''),
-            'senior': salary_info.get('senior_level') or salary_info.get('senior') or domain_info.get('senior_level', '')
-        }
+        raw_goal = inp.career_goal()
+        clock.mark('extract_goal')
 
-        # --------------------------
-        # map missing skills -> recommended courses
-        # --------------------------
-        def top_courses_for_skill(skill_name, top_n=3):
-            s = skill_name.strip().lower()
-            matches = []
-            for c in COURSES_DATABASE:
-                c_skills = [x.lower() for x in c.get('skills', [])]
-                if any(s in ks or ks in s for ks in c_skills):
-                    # scoring heuristic
-                    rating = float(c.get('rating', 0) or 0)
-                    price = int(c.get('price', 0) or 0)
-                    score = rating * 20 - (price / 100.0)
-                    matches.append((score, {
-                        'title': c.get('title') or c.get('name') or '',
-                        'platform': c.get('platform', ''),
-                        'price': c.get('price', 0),
-                        'rating': rating,
-                        'url': c.get('url', '#')
-                    }))
-            matches.sort(key=lambda x: x[0], reverse=True)
-            return [m[1] for m in matches[:top_n]]
-
-        skill_course_map = {}
-        for ms in skill_analysis.get('missing_skills', []) or []:
-            skill_course_map[ms] = top_courses_for_skill(ms, top_n=3)
-
-        # --------------------------
-        # simple level roadmap grouping
-        # --------------------------
-        missing = skill_analysis.get('missing_skills', []) or []
-        n = len(missing)
-        level_roadmap = {'Foundation': [], 'Core': [], 'Advanced': []}
-        if n > 0:
-            f_cut = ceil(n * 0.3)
-            c_cut = ceil(n * 0.7)
-            for idx, sname in enumerate(missing):
-                if idx < f_cut:
-                    level_roadmap['Foundation'].append(sname)
-                elif idx < c_cut:
-                    level_roadmap['Core'].append(sname)
-                else:
-                    level_roadmap['Advanced'].append(sname)
-
-        # --------------------------
-        # suggest best domain based on user's current skills (overlap)
-        # --------------------------
-        user_tokens = set([t.strip().lower() for t in skills.split(',') if t.strip()])
-        best_domain = None
-        best_score = 0
-        for key, domain in CAREER_DOMAINS_MAP.items():
-            domain_sk = set([s.lower() for s in domain.get('skills', [])])
-            score = len(user_tokens & domain_sk)
-            if score > best_score:
-                best_score = score
-                best_domain = key
-        suggested_domain_name = CAREER_DOMAINS_MAP.get(best_domain, {}).get('name') if best_domain else None
-
-        # persist analysis
-        analysis_id = str(uuid.uuid4())[:8]
-        user_analyses[analysis_id] = {
-            'user': user['username'],
-            'skills': skills,
-            'cgpa': cgpa,
-            'career_goal': career_goal_key,
-            'skill_analysis': skill_analysis,
-            'timestamp': datetime.now().isoformat()
-        }
+        analysis_id, record = await run_analysis(user, skills, cgpa, raw_goal, clock)
 
-        # --- render template defensively ---
-        try:
-            return templates.TemplateResponse("results.html", {
-                "request": request,
-                "user": user,
-                "analysis_id": analysis_id,
-                "skills": skills,
-                "cgpa": cgpa,
-                "career_goal": career_goal_key,
-                "skill_analysis": skill_analysis,
-                "career_domain": CAREER_DOMAINS_MAP.get(career_goal_key, {}),
-                "missing_skills": skill_analysis.get('missing_skills', []),
-                "skill_course_map": skill_course_map,
-                "level_roadmap": level_roadmap,
-                "suggested_domain_name": suggested_domain_name,
-                "suggested_domain_score": best_score
-            })
-        except Exception as tpl_err:
-            # log and fallback to the robust advanced results page with safe minimal context
-            logger.error(f"Template render error in results.html: {tpl_err}", exc_info=True)
-            try:
-                return templates.TemplateResponse("resusts_advanced.html", {
-                    "request": request,
-                    "user": user,
-                    "analysis": skill_analysis,
-                    "courses": [], 
-                    "jobs": []
-                })
-            except Exception as fallback_err:
-                logger.error(f"Fallback render also failed: {fallback_err}", exc_info=True)
-                raise HTTPException(status_code=500, detail="Analysis error")
+        response = render_analysis(request, user, analysis_id, record)
+        clock.mark('render')
+        return response
 
     except HTTPException:
         raise
@@ -1262,6 +4558,21 @@ async def analyze_career(request: Request, skills: Optional[str] = Form(None), c
         logger.error(f"Analysis error: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Analysis error")
 
+@app.get("/analysis/{analysis_id}")
+async def get_analysis(request: Request, analysis_id: str, format: Optional[str] = None):
+    """Re-render a stored analysis (or return it as JSON with ?format=json) without recomputing it."""
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(status_code=401, detail="Please login first")
+
+    record = await storage.get_analysis(analysis_id)
+    if not record or record.get('user') != user['username']:
+        raise HTTPException(status_code=404, detail="Analysis not found or expired")
+
+    if format == 'json' or 'application/json' in request.headers.get('accept', ''):
+        return JSONResponse(dict(record, analysis_id=analysis_id))
+    return render_analysis(request, user, analysis_id, record)
+
 @app.get("/courses", response_class=HTMLResponse)
 async def courses_page(request: Request, career_goal: Optional[str] = None):
     """Render courses page. Accepts optional ?skill=... or career_goal to pre-filter courses.
@@ -1272,8 +4583,7 @@ async def courses_page(request: Request, career_goal: Optional[str] = None):
         return RedirectResponse("/login", status_code=302)
 
     try:
-        # start with full list
-        selected_courses = list(COURSES_DATABASE)
+        candidates = None
         selected_domain = None
 
         # prefer explicit 'skill' query param, else use career_goal
@@ -1284,19 +4594,21 @@ async def courses_page(request: Request, career_goal: Optional[str] = None):
             domain_key = resolve_career_goal(skill_query)
             if domain_key:
                 selected_domain = CAREER_DOMAINS_MAP.get(domain_key)
-                domain_skills = set([s.lower() for s in selected_domain.get('skills', [])])
-                selected_courses = [
-                    c for c in COURSES_DATABASE
-                    if domain_skills & set([s.lower() for s in c.get('skills', [])])
-                ]
+                candidates = COURSE_INDEX.ids_with_any_skill(selected_domain.get('skills', []))
             else:
                 # fallback: treat skill_query as skill text and match courses that mention it
-                q = str(skill_query).strip().lower()
-                selected_courses = [
-                    c for c in COURSES_DATABASE
-                    if any(q in (s or '').lower() for s in c.get('skills', []))
-                    or q in (c.get('title') or '').lower()
-                ]
+                candidates = COURSE_INDEX.ids_matching_text(str(skill_query))
+
+        # only one page of cards is materialized; a stale or foreign cursor restarts at page one
+        cursor = request.query_params.get('cursor')
+        try:
+            page_ids, total, next_cursor = COURSE_SEARCH.page(candidates, 'id', config.COURSES_PAGE_SIZE, cursor)
+        except ValueError:
+            page_ids, total, next_cursor = COURSE_SEARCH.page(candidates, 'id', config.COURSES_PAGE_SIZE)
+        selected_courses = CATALOG.courses(page_ids)
+        next_page_url = None
+        if next_cursor:
+            next_page_url = '/courses?' + urlencode(dict(request.query_params, cursor=next_cursor))
 
         # Normalize course dicts so templates won't crash if keys are missing
         processed = []
@@ -1325,7 +4637,8 @@ async def courses_page(request: Request, career_goal: Optional[str] = None):
             "request": request,
             "user": user,
             "courses": processed,
-            "total_courses": len(processed),
+            "total_courses": total,
+            "next_page_url": next_page_url,
             "missing_skills": []
         })
     except Exception as e:
@@ -1348,91 +4661,277 @@ async def domain_page(request: Request, domain_key: str):
     if not user:
         return RedirectResponse("/login", status_code=302)
 
-    domain = CAREER_DOMAINS_MAP.get(domain_key)
-    if not domain:
+    page = DOMAIN_PAGES.render(domain_key, user)
+    if page is None:
         raise HTTPException(status_code=404, detail="Domain not found")
+    content, n_courses, n_jobs = page
 
-    # Build a simple "analysis" (roadmap-ready) structure expected by template
-    skills = domain.get('skills', [])
-    matched_skills = []  # user-specific matched skills would come from user profile/analysis
-    missing_skills = skills.copy()
+    logger.info(f"Domain page served: {domain_key} for user: {user['username']} (courses={n_courses}, jobs={n_jobs})")
+    return HTMLResponse(content)
 
-    analysis = {
-        'adjusted_match': 0,
-        'matched_skills': matched_skills,
-        'missing_skills': missing_skills,
-        'readiness_level': "Not started",
-        'timeline': "Depends on learning plan",
-        'growth': domain.get('growth', 0),
-        'job_openings': domain.get('avg_job_openings', 0),
-        'salary': {
-            'entry': domain.get('entry_level', ''),
-            'mid': domain.get('mid_level', ''),
-            'senior': domain.get('senior_level', '')
-        },
-        'top_companies': domain.get('top_companies', []),
-        'required_projects': domain.get('required_projects', []),
-        'domain': domain.get('name', '')
-    }
+# ============================================================================
+# ROUTES - JSON API (v1)
+# ============================================================================
 
-    # Jobs: create helpful external search links (LinkedIn, Indeed, Google Jobs)
-    jobs = []
-    # General domain job search
-    q = f"{domain.get('name')} jobs"
-    jobs.append({
-        'title': f"{domain.get('name')} roles (Search)",
-        'company': 'Various',
-        'location': 'Remote / Multiple locations',
-        'experience': 'Entry - Senior',
-        'salary': domain.get('entry_level', ''),
-        'skills': skills[:5],
-        'description': f"Search live job openings for {domain.get('name')}",
-        'posting_url': f"https://www.linkedin.com/jobs/search/?keywords={quote_plus(q)}"
-    })
-    # per top company quick searches
-    for comp in domain.get('top_companies', [])[:6]:
-        comp_q = f"{domain.get('name')} {comp} jobs"
-        jobs.append({
-            'title': f"Jobs at {comp}",
-            'company': comp,
-            'location': 'See postings',
-            'experience': 'Varies',
-            'salary': '',
-            'skills': skills[:4],
-            'description': f"Openings at {comp} for {domain.get('name')}",
-            'posting_url': f"https://www.linkedin.com/jobs/search/?keywords={quote_plus(comp_q)}"
-        })
+API_COURSES_LIMIT = 200
+API_EXPORT_CHUNK = 1000  # courses per NDJSON chunk
+
+
+def json_line(obj: Any) -> bytes:
+    """One NDJSON line."""
+    if orjson is None:
+        return json.dumps(obj).encode() + b'\n'
+    return orjson.dumps(obj) + b'\n'
+
+
+def encode_response(content: Any, status_code: int = 200) -> Response:
+    """Encode plain data once with orjson (stdlib json when it is not installed)."""
+    if orjson is None:
+        return JSONResponse(content, status_code=status_code)
+    return ORJSONResponse(content, status_code=status_code)
+
+
+def api_response(model: BaseModel, include=None, exclude=None, status_code: int = 200) -> Response:
+    return encode_response(model.model_dump(include=include, exclude=exclude), status_code)
+
+
+def parse_fields(fields: Optional[str], model: type) -> tuple:
+    """``fields=a,b`` keeps only those top-level fields and ``fields=-a,-b`` drops them; returns (include, exclude)."""
+    if not fields:
+        return None, None
+    names = [f.strip() for f in fields.split(',') if f.strip()]
+    exclude = {n[1:] for n in names if n.startswith('-')}
+    include = {n for n in names if not n.startswith('-')}
+    unknown = (include | exclude) - model.model_fields.keys()
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return include or None, exclude or None
+
+
+def analysis_response(analysis_id: str, record: Dict[str, Any]) -> AnalysisResponseV1:
+    analysis = record['skill_analysis']
+    return AnalysisResponseV1(
+        analysis_id=analysis_id,
+        career_goal=record['career_goal'],
+        domain=analysis.get('domain', ''),
+        match_percentage=analysis.get('match_percentage', 0),
+        adjusted_match=analysis.get('adjusted_match', 0),
+        cgpa_score=analysis.get('cgpa_score', record['cgpa']),
+        cgpa_adjustment=analysis.get('cgpa_adjustment', 0),
+        readiness_level=analysis.get('readiness_level', 'Unknown'),
+        estimated_timeline=analysis.get('estimated_timeline', 'N/A'),
+        action_required=analysis.get('action_required', ''),
+        matched_skills=analysis.get('matched_skills', []),
+        missing_skills=analysis.get('missing_skills', []),
+        missing_skills_by_demand=analysis.get('missing_skills_by_demand', []),
+        skills_count=analysis['skills_count'],
+        salary=analysis['salary'],
+        domain_info=analysis['domain_info'],
+        skill_course_map=record['skill_course_map'],
+        level_roadmap=record['level_roadmap'],
+        suggested_domain=record['suggested_domain_name'],
+        suggested_domain_score=record['suggested_domain_score'],
+    )
+
+
+_DOMAIN_LIST: Dict[str, Any] = {'version': None, 'response': None}
+
+
+def domain_list_response() -> DomainListResponse:
+    """All domains as DomainSummary models, rebuilt only when the domain map changes."""
+    if _DOMAIN_LIST['version'] != DOMAIN_MAP_VERSION:
+        domains = [DomainSummary(
+            key=key,
+            name=d.get('name', key),
+            icon=d.get('icon', ''),
+            category=d.get('category', ''),
+            description=d.get('description', ''),
+            skills=d.get('skills', []),
+            salary=SalaryBands(entry=d.get('entry_level', ''), mid=d.get('mid_level', ''),
+                               senior=d.get('senior_level', '')),
+            growth=d.get('growth', 0),
+            demand_trend=d.get('demand_trend', ''),
+            competition=d.get('competition', 'Medium'),
+            avg_job_openings=d.get('avg_job_openings', 0),
+            top_companies=d.get('top_companies', []),
+        ) for key, d in CAREER_DOMAINS_MAP.items()]
+        _DOMAIN_LIST.update(version=DOMAIN_MAP_VERSION,
+                            response=DomainListResponse(total=len(domains), domains=domains))
+    return _DOMAIN_LIST['response']
+
+
+def item_projection(fields: Optional[str], model: type, envelope: type, items_key: str) -> tuple:
+    """parse_fields() for list envelopes: the projection applies to every item under ``items_key``."""
+    include, exclude = parse_fields(fields, model)
+    if include:
+        include = dict({name: True for name in envelope.model_fields}, **{items_key: {'__all__': include}})
+    if exclude:
+        exclude = {items_key: {'__all__': exclude}}
+    return include, exclude
+
+
+@app.post("/api/v1/analyze", response_model=AnalysisResponseV1)
+async def api_analyze(request: Request, body: SkillAnalysisRequest, fields: Optional[str] = None):
+    """Same analysis as /analyze as typed JSON; ``fields`` trims the body (e.g. ``fields=-domain_info``)."""
+    clock = StageClock()
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(status_code=401, detail="Please login first")
+    include, exclude = parse_fields(fields, AnalysisResponseV1)
+    if not body.skills.strip():
+        raise HTTPException(status_code=400, detail="Please provide your skills")
+    clock.mark('auth')
+
+    try:
+        analysis_id, record = await run_analysis(user, body.skills, body.cgpa, body.career_goal.strip() or None, clock)
+        response = api_response(analysis_response(analysis_id, record), include, exclude)
+        clock.mark('serialize')
+        return response
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"API analysis error: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Analysis error")
+
+@app.get("/api/v1/domains", response_model=DomainListResponse)
+async def api_domains(request: Request, fields: Optional[str] = None):
+    """Every career domain with salary bands and demand figures; ``fields`` applies to each domain."""
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(status_code=401, detail="Please login first")
+    include, exclude = item_projection(fields, DomainSummary, DomainListResponse, 'domains')
+    return api_response(domain_list_response(), include, exclude)
+
+def course_out(cid: int, scores: Optional[Dict[int, float]] = None) -> CourseOut:
+    score = scores.get(cid) if scores else None
+    return CourseOut(id=cid, score=round(score, 4) if score is not None else None, **CATALOG.course(cid))
+
+
+def iter_course_export(search: CourseSearch, candidates, sort: str, cursor: Optional[str],
+                       filters: Dict[str, Any], include, exclude, scores: Optional[Dict[int, float]] = None):
+    """NDJSON for every match from ``cursor`` on, one page of API_EXPORT_CHUNK courses at a time."""
+    while True:
+        try:
+            ids, _, cursor = search.page(candidates, sort, API_EXPORT_CHUNK, cursor, **filters)
+        except ValueError as e:  # the catalog was reloaded mid-export
+            logger.warning(f"Course export stopped: {e}")
+            return
+        yield b''.join(json_line(course_out(cid, scores).model_dump(include=include, exclude=exclude,
+                                                                     exclude_none=True))
+                       for cid in ids)
+        if not cursor:
+            return
+
+
+@app.get("/api/v1/courses", response_model=CourseListResponse)
+async def api_courses(request: Request, q: Optional[str] = None, skill: Optional[str] = None,
+                      domain: Optional[str] = None, platform: Optional[str] = None, level: Optional[str] = None,
+                      min_rating: Optional[float] = None, max_price: Optional[int] = None,
+                      sort: Optional[str] = None, cursor: Optional[str] = None, limit: int = 50,
+                      fields: Optional[str] = None, format: str = 'json'):
+    """Course search: BM25 text search (``q``), a domain's courses (any of its skills) or skill/title
+    text matches, filtered and sorted. ``q`` results default to sort=relevance and carry a score.
+
+    Pages are cursor-based: pass back ``next_cursor`` for the next one.
+    ``format=ndjson`` streams every match (from ``cursor`` on) as one course per line.
+    """
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(status_code=401, detail="Please login first")
+    if not 1 <= limit <= API_COURSES_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {API_COURSES_LIMIT}")
+    if format not in ('json', 'ndjson'):
+        raise HTTPException(status_code=400, detail="format must be 'json' or 'ndjson'")
+
+    scores = None
+    if q:
+        ranked = COURSE_TEXT.search(q, k=None)
+        scores = dict(ranked)
+        candidates = [cid for cid, _ in ranked]
+        sort = sort or 'relevance'
+    elif domain:
+        domain_key = resolve_career_goal(domain)
+        if not domain_key:
+            raise HTTPException(status_code=404, detail="Domain not found")
+        candidates = COURSE_INDEX.ids_with_any_skill(CAREER_DOMAINS_MAP[domain_key].get('skills', []))
+    elif skill:
+        candidates = COURSE_INDEX.ids_matching_text(skill)
+    else:
+        candidates = None
+    sort = sort or 'id'
+    filters = {'platform': platform, 'level': level, 'min_rating': min_rating, 'max_price': max_price}
+
+    search = COURSE_SEARCH
+    try:
+        ids, total, next_cursor = search.page(candidates, sort, limit, cursor, **filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if format == 'ndjson':
+        include, exclude = parse_fields(fields, CourseOut)
+        return StreamingResponse(iter_course_export(search, candidates, sort, cursor, filters, include, exclude,
+                                                    scores),
+                                 media_type='application/x-ndjson')
+    include, exclude = item_projection(fields, CourseOut, CourseListResponse, 'courses')
+    courses = [course_out(cid, scores) for cid in ids]
+    # optional catalog columns are left out rather than sent as null; next_cursor stays, null on the last page
+    content = CourseListResponse(total=total, courses=courses, next_cursor=next_cursor).model_dump(
+        include=include, exclude=exclude, exclude_none=True)
+    content.setdefault('next_cursor', None)
+    return encode_response(content)
+
+@app.post("/api/batch/analyze")
+async def batch_analyze(request: Request, format: str = "ndjson"):
+    """Analyze a whole cohort: CSV or JSONL rows of (skills, cgpa, career_goal) in, NDJSON or CSV out."""
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(status_code=401, detail="Please login first")
+    if format not in ('ndjson', 'csv'):
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'csv'")
+
+    content_type = request.headers.get('content-type', '')
+    filename = ''
+    if 'multipart/form-data' in content_type:
+        form = await request.form()
+        upload = form.get('file')
+        if upload is None or not hasattr(upload, 'read'):
+            raise HTTPException(status_code=400, detail="Upload a CSV or JSONL file in the 'file' field")
+        filename = upload.filename or ''
+        raw = await upload.read()
+    else:
+        raw = await request.body()
+    text = raw.decode('utf-8-sig', errors='replace')
+    input_fmt = 'csv' if ('csv' in content_type or filename.lower().endswith('.csv')) else 'jsonl'
+
+    rows = iter_batch_rows(io.StringIO(text, newline=''), input_fmt)
+    logger.info(f"Batch analysis requested by {user['username']} ({input_fmt} -> {format}, {len(raw)} bytes)")
+    media_type = 'text/csv' if format == 'csv' else 'application/x-ndjson'
+    return StreamingResponse(stream_batch_results(BATCH_ANALYZER, rows, format), media_type=media_type)
 
-    # Courses: provide a short list of top courses matching the domain skills
-    domain_skills = set([s.lower() for s in domain.get('skills', [])])
-    matched_courses = []
-    for c in COURSES_DATABASE:
-        c_sk = set([s.lower() for s in c.get('skills', [])])
-        if domain_skills & c_sk:
-            matched_courses.append(c)
-    # sort by rating desc then price asc (better rating, cheaper first)
-    matched_courses.sort(key=lambda x: (-(float(x.get('rating', 0) or 0)), int(x.get('price', 0) or 0)))
-    # limit results to a reasonable number for the UI
-    courses = matched_courses[:8]
-
-    logger.info(f"Domain page served: {domain_key} for user: {user['username']} (courses={len(courses)}, jobs={len(jobs)})")
- 
-    return templates.TemplateResponse("resusts_advanced.html", {
-         "request": request,
-         "user": user,
-         "analysis": analysis,
-         "courses": courses,
-         "jobs": jobs
-     })
+@app.get("/api/metrics")
+async def metrics():
+    """Prometheus text exposition of route/stage latency, in-flight gauges and cache counters."""
+    lines = REQUEST_LATENCY.expose() + STAGE_LATENCY.expose()
+    lines += ["# TYPE careercompass_requests_in_flight gauge", f"careercompass_requests_in_flight {IN_FLIGHT['requests']}"]
+    for component, stats in (('skill_cache', SKILLS.cache_stats()), ('goal_resolver', GOAL_RESOLVER.stats()),
+                             ('storage', storage.stats()), ('passwords', PASSWORDS.stats()),
+                             ('token_cache', TOKEN_CACHE.stats()), ('analysis_cache', ANALYSIS_CACHE.stats()),
+                             ('domain_pages', DOMAIN_PAGES.stats()), ('logging', LOG_HANDLER.stats())):
+        expose_stats(component, stats, lines)
+    return Response('\n'.join(lines) + '\n', media_type="text/plain; version=0.0.4; charset=utf-8")
 
 @app.get("/api/health")
 async def health_check():
-    return {"status":"healthy","app":config.APP_NAME,"version":config.APP_VERSION,"timestamp":datetime.now().isoformat()}
+    return {"status":"healthy","app":config.APP_NAME,"version":config.APP_VERSION,"timestamp":datetime.now().isoformat(),
+            "skill_cache":SKILLS.cache_stats(),"goal_resolver":GOAL_RESOLVER.stats(),
+            "storage":storage.stats(),"passwords":PASSWORDS.stats(),
+            "token_cache":TOKEN_CACHE.stats(),"analysis_cache":ANALYSIS_CACHE.stats(),
+            "domain_pages":DOMAIN_PAGES.stats(),"course_text":COURSE_TEXT.stats(),"logging":LOG_HANDLER.stats()}
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     logger.error(f"HTTP Exception: {exc.status_code} - {exc.detail}")
-    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
+    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail}, headers=exc.headers)
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
@@ -1450,13 +4949,9 @@ async def course_comparision(request: Request, skill: Optional[str] = None):
     skill_q = skill or request.query_params.get('skill') or ''
     q = str(skill_q).strip().lower()
 
-    # Filter courses by skill token match (safe)
-    matched = []
-    for c in COURSES_DATABASE:
-        c_sk = [s.lower() for s in c.get('skills', [])]
-        title = (c.get('title') or c.get('name') or '').lower()
-        if q and (any(q in s for s in c_sk) or q in title):
-            matched.append(c)
+    # Filter courses by skill token match (safe); the page is bounded like /courses
+    page_size = config.COURSES_PAGE_SIZE
+    matched = CATALOG.courses(COURSE_INDEX.ids_matching_text(q)[:page_size]) if q else []
 
     # Provide minimal safe context for template
     try:
@@ -1465,7 +4960,7 @@ async def course_comparision(request: Request, skill: Optional[str] = None):
             "user": user,
             "missing_skills": [skill_q] if skill_q else [],
             "skill_analysis": {},  # kept empty safe object
-            "courses": matched if matched else COURSES_DATABASE  # fallback to full list
+            "courses": matched if matched else CATALOG.courses(COURSE_INDEX.all_ids[:page_size])  # fallback to first page
         })
     except Exception as e:
         logger.error(f"course_comparision render error: {e}", exc_info=True)
@@ -1481,6 +4976,6 @@ async def course_comparison_alias(request: Request):
     return RedirectResponse(url=target, status_code=302)
 
 if __name__ == "__main__":
-    import uvicorn
+    import serve
     logger.info("Starting Uvicorn server...")
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    serve.main_cli(app)
\ No newline at end of file
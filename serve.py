@@ -0,0 +1,97 @@
+# ============================================================================
+# CAREERCOMPASS PRO - PRODUCTION LAUNCHER
+# Runs main:app under uvicorn with one worker process per usable CPU, uvloop
+# and httptools when they are installed, and a bounded graceful shutdown.
+# More than one worker needs shared state, so the SQLite storage backend is
+# selected unless CAREERCOMPASS_STORAGE says otherwise (memory is refused),
+# each worker writes its own log file, and the catalog snapshot is refreshed
+# first so workers map one shared copy instead of each parsing the catalog.
+#
+#   python serve.py                              # WEB_CONCURRENCY or CPU count workers
+#   python serve.py --workers 4 --port 8080
+#   python serve.py --reload                     # development: one worker, auto-reload
+# ============================================================================
+
+import argparse
+import importlib.util
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+
+
+def default_workers() -> int:
+    if os.getenv("WEB_CONCURRENCY"):
+        return int(os.environ["WEB_CONCURRENCY"])
+    try:
+        return len(os.sched_getaffinity(0))  # respects taskset / container CPU pinning
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def prepare_environment(workers: int) -> None:
+    """Environment every worker inherits; must run before main is imported anywhere."""
+    if workers <= 1:
+        return
+    backend = os.environ.setdefault("CAREERCOMPASS_STORAGE", "sqlite")
+    if backend == "memory":
+        sys.exit("CAREERCOMPASS_STORAGE=memory keeps users and analyses per process; "
+                 "use sqlite or --workers 1")
+    os.environ.setdefault("LOG_FILE", "careercompass-{pid}.log")  # RotatingFileHandler is single-process
+
+
+def prebuild_catalog_snapshot() -> None:
+    """Write the catalog snapshot if it is missing or stale (tools/build_catalog_snapshot.py)."""
+    if os.getenv("CATALOG_SNAPSHOT") == "":
+        return
+    result = subprocess.run([sys.executable, str(ROOT / 'tools' / 'build_catalog_snapshot.py'), '--if-stale'])
+    if result.returncode:
+        print("Catalog snapshot build failed; each worker will parse the catalog itself")
+
+
+def main_cli(app=None):
+    """Parse the command line and run uvicorn; ``app`` is used as-is only for a single plain worker."""
+    parser = argparse.ArgumentParser(description="Run CareerCompass Pro under uvicorn")
+    parser.add_argument('--host', default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument('--port', type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument('--workers', type=int, default=default_workers(),
+                        help="worker processes (default: WEB_CONCURRENCY or usable CPUs)")
+    parser.add_argument('--graceful-timeout', type=int, default=int(os.getenv("GRACEFUL_TIMEOUT", "30")),
+                        help="seconds to let in-flight requests finish on shutdown")
+    parser.add_argument('--keep-alive', type=int, default=int(os.getenv("KEEP_ALIVE", "5")))
+    parser.add_argument('--reload', action='store_true', help="development auto-reload (forces one worker)")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    workers = 1 if args.reload else max(1, args.workers)
+    prepare_environment(workers)
+    if workers > 1:
+        prebuild_catalog_snapshot()
+    loop = "uvloop" if available("uvloop") else "asyncio"
+    http = "httptools" if available("httptools") else "h11"
+    print(f"Starting {workers} worker(s) on {args.host}:{args.port} (loop={loop}, http={http}, "
+          f"storage={os.getenv('CAREERCOMPASS_STORAGE', 'memory')})")
+    os.chdir(ROOT)
+    uvicorn.run(
+        app if app is not None and workers == 1 and not args.reload else "main:app",
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        reload=args.reload,
+        loop=loop,
+        http=http,
+        timeout_keep_alive=args.keep_alive,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        app_dir=str(ROOT),
+    )
+
+
+if __name__ == '__main__':
+    main_cli()
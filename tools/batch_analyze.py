@@ -0,0 +1,103 @@
+# ============================================================================
+# CAREERCOMPASS PRO - COHORT BATCH ANALYSIS (CLI)
+# Same engine as POST /api/batch/analyze, without the HTTP round trip.
+#
+#   python tools/batch_analyze.py students.csv -o results.ndjson
+#   python tools/batch_analyze.py students.jsonl --format csv -o results.csv
+#   python tools/batch_analyze.py --synthetic 100000 --verify 2000
+# ============================================================================
+
+import argparse
+import io
+import logging
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+import main  # noqa: E402
+
+# per-row INFO lines would dominate a cohort run
+main.logger.setLevel(logging.WARNING)
+
+
+def synthetic_rows(count: int, seed: int = 7):
+    """Random students drawn from the domain skill vocabulary plus some noise tokens."""
+    rng = random.Random(seed)
+    vocab = main.SKILL_MATCHER.skill_names + ['excel', 'communication', 'c++', 'photoshop']
+    goals = [''] * 4 + list(main.CAREER_DOMAINS_MAP) + [d['name'] for d in main.CAREER_DOMAINS_MAP.values()]
+    for _ in range(count):
+        yield {
+            'skills': ', '.join(rng.sample(vocab, rng.randint(1, 8))),
+            'cgpa': round(rng.uniform(4.0, 10.0), 2),
+            'career_goal': rng.choice(goals),
+        }
+
+
+def verify(rows, results) -> int:
+    """Compare batch output against analyze_skills + analyze_career's inference; returns mismatches."""
+    mismatches = 0
+    for row, result in zip(rows, results):
+        if result['error']:
+            continue
+        expected = main.analyze_skills(row['skills'], result['career_goal'], float(row['cgpa']))
+        mask = main.SKILL_MATCHER.mask_of(main.canonical_skill_tokens(row['skills']))
+        best_key, best_score = main.SKILL_MATCHER.best_domain(mask)
+        same = (expected['match_percentage'] == result['match_percentage']
+                and expected['adjusted_match'] == result['adjusted_match']
+                and expected['cgpa_adjustment'] == result['cgpa_adjustment']
+                and expected['readiness_level'] == result['readiness_level']
+                and expected['skills_count']['have'] == result['matched']
+                and best_key == result['best_fit_domain'] and best_score == result['best_fit_score'])
+        if not same:
+            mismatches += 1
+            print(f"MISMATCH row {result['row']}: {row} -> {result}", file=sys.stderr)
+    return mismatches
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Analyze a cohort of students in one pass")
+    parser.add_argument('input', nargs='?', help="CSV or JSONL file of skills,cgpa,career_goal rows")
+    parser.add_argument('-o', '--output', help="output file (default: stdout)")
+    parser.add_argument('--format', choices=['ndjson', 'csv'], default='ndjson')
+    parser.add_argument('--synthetic', type=int, help="generate N random students instead of reading input")
+    parser.add_argument('--verify', type=int, default=0,
+                        help="re-check the first N rows against the single-student analysis")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        rows = list(synthetic_rows(args.synthetic))
+    elif args.input:
+        fmt = 'csv' if args.input.lower().endswith('.csv') else 'jsonl'
+        with open(args.input, newline='', encoding='utf-8-sig') as f:
+            rows = list(main.iter_batch_rows(f, fmt))
+    else:
+        parser.error("give an input file or --synthetic N")
+
+    started = time.perf_counter()
+    results = list(main.BATCH_ANALYZER.stream(rows))
+    elapsed = time.perf_counter() - started
+
+    out = open(args.output, 'w', newline='', encoding='utf-8') if args.output else io.TextIOWrapper(
+        sys.stdout.buffer, encoding='utf-8', newline='')
+    with out:
+        for chunk in main.format_batch_results(results, args.format):
+            out.write(chunk)
+
+    rate = len(results) / elapsed * 60 if elapsed else float('inf')
+    print(f"Analyzed {len(results)} students in {elapsed:.2f}s ({rate:,.0f} students/minute)", file=sys.stderr)
+    if args.verify:
+        mismatches = verify(rows[:args.verify], results[:args.verify])
+        print(f"Verified {min(args.verify, len(rows))} rows against analyze_skills: {mismatches} mismatches",
+              file=sys.stderr)
+        if mismatches:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main_cli()
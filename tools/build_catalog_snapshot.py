@@ -0,0 +1,51 @@
+# ============================================================================
+# CAREERCOMPASS PRO - CATALOG SNAPSHOT BUILDER (OFFLINE)
+# Parses the course catalog sources (COURSES_DATABASE plus the Coursera CSV)
+# once, builds the skill/title postings and the BM25 text index, and writes
+# the binary snapshot every worker process memory-maps at startup. serve.py
+# runs it with --if-stale before starting more than one worker.
+#
+#   python tools/build_catalog_snapshot.py [--output data/catalog.snap]
+#   python tools/build_catalog_snapshot.py --if-stale      # no-op when the snapshot is current
+# ============================================================================
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+import main  # noqa: E402
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Write the memory-mapped catalog snapshot")
+    parser.add_argument('--output', default=main.config.CATALOG_SNAPSHOT or 'data/catalog.snap')
+    parser.add_argument('--if-stale', action='store_true',
+                        help="do nothing when the snapshot already matches the sources")
+    args = parser.parse_args()
+
+    if args.if_stale and main.open_catalog_snapshot(args.output) is not None:
+        print(f"{args.output} is up to date")
+        return
+
+    started = time.perf_counter()
+    if main.CATALOG.snapshot is None:
+        # main parsed the sources at import; reuse that work
+        catalog, index, text = main.CATALOG, main.COURSE_INDEX, main.COURSE_TEXT
+    else:
+        catalog = main.build_course_catalog()
+        index = main.CourseIndex(catalog, main.build_skill_canonicalizer(catalog))
+        text = main.CourseTextIndex(catalog)
+    size = main.write_catalog_snapshot(Path(args.output), catalog, index, text, main.catalog_source_fingerprint())
+    print(f"Wrote {args.output}: {len(catalog)} courses, {len(index.skill_postings)} skills, "
+          f"{len(index.title_postings)} title tokens, {len(text.postings)} text terms, "
+          f"{size / 1e6:.1f} MB in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main_cli()
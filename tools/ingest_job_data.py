@@ -0,0 +1,123 @@
+# ============================================================================
+# CAREERCOMPASS PRO - JOB MARKET INGESTION (OFFLINE)
+# Parses data/Job_data.xlsx once and writes the binary demand snapshot that
+# main.py memory-maps at startup. Needs openpyxl (not a runtime dependency).
+#
+#   pip install openpyxl
+#   python tools/ingest_job_data.py [--input data/Job_data.xlsx] [--output data/job_demand.bin]
+# ============================================================================
+
+import argparse
+import os
+import sys
+from collections import Counter, defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+import main  # noqa: E402
+
+SHEET_HEADER = 'Job Title'
+TOP_COMPANIES = 5
+
+# Job titles that name a domain outright; every other posting is attributed
+# through its required skills.
+TITLE_DOMAINS = {
+    'cyber security analyst': ['cybersecurity'],
+    'data scientist': ['data_science', 'ai_engineering'],
+    'software engineer': ['backend_development', 'web_development'],
+}
+
+
+def find_job_sheet(workbook):
+    for ws in workbook.worksheets:
+        first = next(ws.iter_rows(max_row=1, values_only=True), ())
+        if SHEET_HEADER in first:
+            return ws
+    raise SystemExit(f"No worksheet with a '{SHEET_HEADER}' header column")
+
+
+def aggregate(rows, header):
+    col = {name: i for i, name in enumerate(header)}
+    domain_skills = {key: {s.lower() for s in d.get('skills', [])}
+                     for key, d in main.CAREER_DOMAINS_MAP.items()}
+
+    domain_postings = Counter()
+    domain_applicants = Counter()
+    domain_months = defaultdict(Counter)
+    domain_companies = defaultdict(Counter)
+    skill_postings = Counter()
+    skill_applicants = Counter()
+    months = set()
+
+    for row in rows:
+        title = str(row[col['Job Title']] or '').strip().lower()
+        if not title:
+            continue
+        applicants = int(row[col['Number of Applicants']] or 0)
+        company = str(row[col['Company Name']] or '').strip()
+        posted = row[col['Posted Date']]
+        month = posted.strftime('%Y-%m') if hasattr(posted, 'strftime') else ''
+        if month:
+            months.add(month)
+        skills = {s.strip().lower() for s in str(row[col['Skills Required']] or '').split(',') if s.strip()}
+        for skill in skills:
+            skill_postings[skill] += 1
+            skill_applicants[skill] += applicants
+
+        domains = set(TITLE_DOMAINS.get(title, []))
+        domains.update(key for key, dsk in domain_skills.items() if dsk & skills)
+        for key in domains:
+            domain_postings[key] += 1
+            domain_applicants[key] += applicants
+            domain_months[key][month] += 1
+            if company:
+                domain_companies[key][company] += 1
+
+    ordered_months = sorted(m for m in months if m)
+    domains = {}
+    for key in main.CAREER_DOMAINS_MAP:
+        per_month = domain_months.get(key, Counter())
+        recent = per_month.get(ordered_months[-1], 0) if ordered_months else 0
+        earlier = [per_month.get(m, 0) for m in ordered_months[:-1]]
+        baseline = sum(earlier) / len(earlier) if earlier else 0
+        domains[key] = {
+            'postings': domain_postings.get(key, 0),
+            'applicants': domain_applicants.get(key, 0),
+            'recent_postings': recent,
+            'growth': (recent - baseline) / baseline * 100 if baseline else 0.0,
+            'top_companies': [c for c, _ in domain_companies[key].most_common(TOP_COMPANIES)],
+        }
+    skills = {name: {'postings': n, 'applicants': skill_applicants[name]}
+              for name, n in skill_postings.most_common()}
+    return domains, skills, len(ordered_months)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Aggregate Job_data.xlsx into a demand snapshot")
+    parser.add_argument('--input', default='data/Job_data.xlsx')
+    parser.add_argument('--output', default=main.config.JOB_DEMAND_SNAPSHOT)
+    args = parser.parse_args()
+
+    try:
+        import openpyxl
+    except ImportError:
+        raise SystemExit("openpyxl is required for ingestion: pip install openpyxl")
+
+    workbook = openpyxl.load_workbook(args.input, read_only=True, data_only=True)
+    ws = find_job_sheet(workbook)
+    rows = ws.iter_rows(values_only=True)
+    header = next(rows)
+    domains, skills, months = aggregate(rows, header)
+    size = main.write_job_demand_snapshot(Path(args.output), domains, skills, months)
+
+    print(f"Wrote {args.output}: {size} bytes, {len(domains)} domains, {len(skills)} skills, {months} months")
+    for key, d in sorted(domains.items(), key=lambda kv: -kv[1]['postings']):
+        print(f"  {key:<22} postings={d['postings']:>6}  applicants={d['applicants']:>8}  "
+              f"companies={', '.join(d['top_companies'])}")
+
+
+if __name__ == '__main__':
+    main_cli()
@@ -0,0 +1,295 @@
+# ============================================================================
+# CAREERCOMPASS PRO - TRAFFIC REPLAY (OPEN LOOP)
+# Rebuilds a request mix from the application log (signup/login ratio,
+# per-domain analyze distribution and scores, inter-arrival gaps) and replays
+# it against the app at a chosen speed-up. Arrivals are scheduled up front and
+# never wait for earlier responses, so latency includes queueing.
+#
+#   python tools/replay_traffic.py                                   # in-process, 1000x
+#   python tools/replay_traffic.py --speedup 5000 --requests 2000
+#   python tools/replay_traffic.py --url http://127.0.0.1:8000 --duration 60
+#   python tools/replay_traffic.py --mix-only                        # print the mix and exit
+# ============================================================================
+
+import argparse
+import asyncio
+import bisect
+import json
+import logging
+import os
+import random
+import re
+import statistics
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+import main  # noqa: E402
+
+LOG_LINE_RE = re.compile(r'^(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d,\d{3}) - \S+ - [A-Z]+ - (.*)$')
+
+# log message -> replayed request type; the first matching pattern wins
+EVENT_PATTERNS = [
+    ('analyze', re.compile(r'^Analysis completed for domain: (\w+), Score: ([\d.]+)')),
+    ('analyze_error', re.compile(r'^(Analysis error|Could not resolve career goal|HTTP Exception: 400 - Invalid career goal)')),
+    ('signup', re.compile(r'^New user registered: ')),
+    ('signup_taken', re.compile(r'^Signup attempt with existing username: ')),
+    ('login', re.compile(r'^User logged in: ')),
+    ('login_failed', re.compile(r'^Failed login attempt for user: ')),
+    ('logout', re.compile(r'^User logged out')),
+    ('domain_page', re.compile(r'^Domain page served: (\w+) ')),
+    ('courses', re.compile(r'^Courses page error')),
+    ('dashboard', re.compile(r'^Dashboard error')),
+]
+SERVER_START_RE = re.compile(r'^Starting CareerCompass')
+PASSWORD = 'replay-password'
+
+
+class TrafficMix:
+    """Empirical request mix: type weights, per-domain analyze scores, inter-arrival gaps."""
+
+    def __init__(self):
+        self.types = Counter()
+        self.analyze_scores = defaultdict(list)   # domain key -> observed scores
+        self.domain_pages = Counter()
+        self.gaps = []                            # seconds between consecutive requests
+        self.log_lines = 0
+        self.capture_lines = 0
+        self.skipped_capture_lines = 0
+
+    def add_log(self, lines, max_gap: float) -> None:
+        last = None
+        for line in lines:
+            self.log_lines += 1
+            m = LOG_LINE_RE.match(line.rstrip('\n'))
+            if not m:
+                continue
+            ts = datetime.strptime(m.group(1), '%Y-%m-%d %H:%M:%S,%f')
+            message = m.group(2)
+            if SERVER_START_RE.match(message):
+                last = None  # restarts split sessions; the downtime is not an arrival gap
+                continue
+            for kind, pattern in EVENT_PATTERNS:
+                em = pattern.match(message)
+                if not em:
+                    continue
+                self.types[kind] += 1
+                if kind == 'analyze':
+                    self.analyze_scores[em.group(1)].append(float(em.group(2)))
+                elif kind == 'domain_page':
+                    self.domain_pages[em.group(1)] += 1
+                if last is not None:
+                    gap = (ts - last).total_seconds()
+                    if 0 <= gap <= max_gap:
+                        self.gaps.append(gap)
+                last = ts
+                break
+
+    def add_capture(self, lines) -> None:
+        """Request captures: one JSON object per line with at least method and path.
+
+        Other JSON lines (e.g. a backlog file that shares the .jsonl name) are
+        counted and skipped.
+        """
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                obj = json.loads(line)
+            except ValueError:
+                obj = None
+            if not (isinstance(obj, dict) and obj.get('method') and obj.get('path')):
+                self.skipped_capture_lines += 1
+                continue
+            self.capture_lines += 1
+            path = obj['path']
+            if path.startswith('/analyze'):
+                self.types['analyze'] += 1
+            elif path.startswith('/domain/'):
+                self.types['domain_page'] += 1
+                self.domain_pages[path.rsplit('/', 1)[-1]] += 1
+            elif path.rstrip('/') in ('/login', '/signup') and obj['method'].upper() == 'POST':
+                self.types[path.strip('/')] += 1
+            elif path.rstrip('/') in ('/logout', '/courses', '/dashboard'):
+                self.types[path.strip('/')] += 1
+
+    def describe(self) -> str:
+        total = sum(self.types.values())
+        out = [f"{total} requests reconstructed from {self.log_lines} log lines and {self.capture_lines} "
+               f"captured requests ({self.skipped_capture_lines} non-request capture lines skipped)"]
+        for kind, n in self.types.most_common():
+            out.append(f"  {kind:<14} {n:>5}  {n / total:6.1%}")
+        for key, scores in sorted(self.analyze_scores.items(), key=lambda kv: -len(kv[1])):
+            out.append(f"  analyze {key:<24} {len(scores):>4}x  mean score {statistics.mean(scores):5.1f}")
+        if self.gaps:
+            gaps = sorted(self.gaps)
+            out.append(f"  inter-arrival: {len(gaps)} gaps, median {statistics.median(gaps):.1f}s, "
+                       f"p90 {gaps[int(len(gaps) * 0.9)]:.1f}s")
+        return '\n'.join(out)
+
+
+class RequestFactory:
+    """Turns a sampled request type into a concrete HTTP request against the app."""
+
+    def __init__(self, mix: TrafficMix, users, rng: random.Random):
+        self.mix = mix
+        self.users = users
+        self.rng = rng
+        kinds = [k for k in mix.types if k != 'logout']
+        self.kinds = kinds
+        self.cumulative = []
+        running = 0
+        for k in kinds:
+            running += mix.types[k]
+            self.cumulative.append(running)
+        self.analyze_domains = [k for k in mix.analyze_scores if k in main.CAREER_DOMAINS_MAP] or \
+            list(main.CAREER_DOMAINS_MAP)
+        self.signups = 0
+
+    def sample_kind(self) -> str:
+        return self.kinds[bisect.bisect_right(self.cumulative, self.rng.random() * self.cumulative[-1])]
+
+    def analyze_form(self, goal_text: bool = True):
+        domain_key = self.rng.choice(self.analyze_domains)
+        domain = main.CAREER_DOMAINS_MAP[domain_key]
+        scores = self.mix.analyze_scores.get(domain_key) or [40.0]
+        # CGPA below every bonus band, so the match percentage alone reproduces the logged score
+        have = min(len(domain['skills']), round(self.rng.choice(scores) / 100 * len(domain['skills'])))
+        skills = self.rng.sample(domain['skills'], have) + ['communication']
+        return {'skills': ', '.join(skills), 'cgpa': '5.5', 'career_goal': domain['name'] if goal_text else ''}
+
+    def build(self, kind: str):
+        """(method, path, form data, use session cookie)"""
+        user = self.rng.choice(self.users)
+        if kind == 'analyze':
+            return 'POST', '/analyze', self.analyze_form(), True
+        if kind == 'analyze_error':
+            return 'POST', '/analyze', dict(self.analyze_form(), career_goal='python devolper xyz'), True
+        if kind == 'signup':
+            self.signups += 1
+            return 'POST', '/signup', {'username': f'replay_{os.getpid()}_{self.signups}', 'email': 'r@example.com',
+                                       'password': PASSWORD, 'full_name': 'Replay'}, False
+        if kind == 'signup_taken':
+            return 'POST', '/signup', {'username': user, 'email': 'r@example.com', 'password': PASSWORD,
+                                       'full_name': 'Replay'}, False
+        if kind == 'login':
+            return 'POST', '/login', {'username': user, 'password': PASSWORD}, False
+        if kind == 'login_failed':
+            return 'POST', '/login', {'username': user, 'password': 'wrong-password'}, False
+        if kind == 'domain_page':
+            keys = [k for k in self.mix.domain_pages if k in main.CAREER_DOMAINS_MAP] or list(main.CAREER_DOMAINS_MAP)
+            return 'GET', f'/domain/{self.rng.choice(keys)}', None, True
+        if kind == 'courses':
+            return 'GET', '/courses', None, True
+        return 'GET', '/dashboard', None, True
+
+
+async def replay(args, mix: TrafficMix):
+    rng = random.Random(args.seed)
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=60)
+    else:
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url='http://replay', timeout=60)
+
+    async with client:
+        users, cookies = [], {}
+        for i in range(args.users):
+            name = f'replay_user_{os.getpid()}_{i}'
+            resp = await client.post('/signup', data={'username': name, 'email': 'r@example.com',
+                                                      'password': PASSWORD, 'full_name': 'Replay'})
+            resp.raise_for_status()
+            users.append(name)
+            cookies[name] = resp.cookies['access_token']
+        client.cookies.clear()
+        factory = RequestFactory(mix, users, rng)
+
+        # open-loop schedule: offsets (s) from start, from the empirical gaps scaled by the speed-up
+        gaps = mix.gaps or [1.0]
+        schedule, t = [], 0.0
+        while len(schedule) < args.requests and (not args.duration or t < args.duration):
+            t += rng.choice(gaps) / args.speedup
+            kind = factory.sample_kind()
+            schedule.append((t, kind, factory.build(kind)))
+
+        results = defaultdict(list)    # kind -> [(latency from schedule ms, service ms, status)]
+
+        async def fire(offset, kind, request, start):
+            delay = start + offset - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            method, path, data, authed = request
+            sent = time.perf_counter()
+            headers = {'cookie': f"access_token={cookies[rng.choice(users)]}"} if authed else {}
+            try:
+                resp = await client.request(method, path, data=data, headers=headers)
+                status = resp.status_code
+            except httpx.HTTPError:
+                status = 0
+            done = time.perf_counter()
+            results[kind].append(((done - (start + offset)) * 1000, (done - sent) * 1000, status))
+
+        print(f"Replaying {len(schedule)} requests over {schedule[-1][0] if schedule else 0:.1f}s "
+              f"(speed-up {args.speedup:g}x, {len(schedule) / max(schedule[-1][0], 1e-9) if schedule else 0:.1f} req/s offered)")
+        start = time.perf_counter()
+        await asyncio.gather(*(fire(offset, kind, request, start) for offset, kind, request in schedule))
+        elapsed = time.perf_counter() - start
+    return results, elapsed
+
+
+def report(results, elapsed):
+    total = sum(len(v) for v in results.values())
+    print(f"Completed {total} requests in {elapsed:.1f}s ({total / elapsed:.1f} req/s achieved)")
+    print(f"{'type':<14} {'count':>6} {'errors':>6} | {'latency p50/p95/p99 ms (incl. queueing)':>40} | "
+          f"{'service p50 ms':>14}")
+    for kind, samples in sorted(results.items(), key=lambda kv: -len(kv[1])):
+        latency = sorted(s[0] for s in samples)
+        service = sorted(s[1] for s in samples)
+        # 4xx are part of the mix (failed logins, taken usernames, bad goals); count 5xx and transport errors
+        errors = sum(1 for s in samples if s[2] == 0 or s[2] >= 500)
+        pick = lambda xs, q: xs[min(len(xs) - 1, int(len(xs) * q))]
+        print(f"{kind:<14} {len(samples):>6} {errors:>6} | {pick(latency, .5):12.2f} {pick(latency, .95):12.2f} "
+              f"{pick(latency, .99):12.2f}   | {statistics.median(service):14.2f}")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Replay the logged traffic mix against the app (open loop)")
+    parser.add_argument('--log', default='careercompass.log')
+    parser.add_argument('--capture', default='requests.jsonl',
+                        help="JSONL request capture (lines without method/path are skipped)")
+    parser.add_argument('--url', help="replay against a running server instead of in-process")
+    parser.add_argument('--speedup', type=float, default=1000.0, help="divide logged inter-arrival gaps by this")
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--duration', type=float, default=0, help="stop scheduling after this many seconds")
+    parser.add_argument('--users', type=int, default=20, help="pre-registered users the mix logs in as")
+    parser.add_argument('--max-gap', type=float, default=1800.0,
+                        help="ignore logged gaps longer than this (idle periods), in seconds")
+    parser.add_argument('--seed', type=int, default=3)
+    parser.add_argument('--mix-only', action='store_true')
+    args = parser.parse_args()
+
+    mix = TrafficMix()
+    with open(args.log, encoding='utf-8', errors='replace') as f:
+        mix.add_log(f, args.max_gap)
+    if args.capture and Path(args.capture).exists():
+        with open(args.capture, encoding='utf-8', errors='replace') as f:
+            mix.add_capture(f)
+    print(mix.describe())
+    if args.mix_only or not mix.types:
+        return
+
+    logging.getLogger().setLevel(logging.WARNING)
+    results, elapsed = asyncio.run(replay(args, mix))
+    report(results, elapsed)
+
+
+if __name__ == '__main__':
+    main_cli()